@@ -1,4 +1,4 @@
-import socket
+import os
 import ssl
 import json
 import sys
@@ -6,50 +6,45 @@ import hashlib
 import argparse
 from typing import Any, Dict
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'web-dashboard'))
+from electrum_stream import ElectrumStream  # noqa: E402
+
 class ElectrumClient:
     def __init__(self, host: str, port: int):
         self.host = host
         self.port = port
         self.use_ssl = port in [50002, 50004, 443] or (port >= 50002 and port % 2 == 0)
-        self.socket = None
+        self.stream = None
 
     def connect(self) -> None:
         try:
-            raw_sock = socket.create_connection((self.host, self.port), 10)
+            context = None
             if self.use_ssl:
                 context = ssl.create_default_context()
                 context.check_hostname = False
                 context.verify_mode = ssl.CERT_NONE
-                self.socket = context.wrap_socket(raw_sock)
-            else:
-                self.socket = raw_sock
+            self.stream = ElectrumStream.connect(self.host, self.port, timeout=10, ssl_context=context)
             print(f"Connected to {self.host}:{self.port} (SSL={self.use_ssl})")
         except Exception as e:
             print(f"Connection failed: {e}")
             sys.exit(1)
 
     def close(self) -> None:
-        if self.socket:
-            self.socket.close()
+        if self.stream:
+            self.stream.close()
 
     def request(self, method: str, params: list = None, msg_id: int = 0) -> Dict[str, Any]:
-        if not self.socket:
+        if not self.stream:
             raise ConnectionError("Not connected")
         
         req = {"id": msg_id, "method": method, "params": params or []}
-        payload = (json.dumps(req) + "\n").encode()
-        self.socket.sendall(payload)
-        
-        # Receive response
-        data = b""
-        while b"\n" not in data:
-            chunk = self.socket.recv(4096)
-            if not chunk:
-                break
-            data += chunk
+        self.stream.send(req)
         
-        line = data.split(b"\n", 1)[0].decode()
-        return json.loads(line) if line else {}
+        # Receive the reply to this id, skipping any notifications
+        while True:
+            reply = self.stream.read_message()
+            if isinstance(reply, dict) and reply.get('id') == msg_id:
+                return reply
 
 def parse_address(address: str) -> tuple[str, int]:
     if ':' not in address:
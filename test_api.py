@@ -8,12 +8,21 @@ Loads API_KEY from .env and verifies:
   - Cache-Control headers on API responses
 
 Run:
-    pip install pytest flask flask-cors requests psutil python-dateutil
+    pip install pytest flask flask-cors requests psutil python-dateutil pyzmq
     pytest test_api.py -v
 """
 
+import json
 import os
+import shutil
+import socket
+import socketserver
+import ssl
+import subprocess
 import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch
 
 import pytest
@@ -44,6 +53,8 @@ API_KEY: str = os.getenv('API_KEY', '').strip()
 # ── 2. Import the Flask app ───────────────────────────────────────────────────
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'web-dashboard'))
+import app as dashboard  # noqa: E402
+from electrum_stream import ElectrumStream, LineTooLong  # noqa: E402
 from app import app as flask_app  # noqa: E402
 
 # ── 3. Fixtures ───────────────────────────────────────────────────────────────
@@ -59,6 +70,18 @@ def client():
         yield c
 
 
+@pytest.fixture(autouse=True)
+def _fresh_node_state():
+    """Node state and payload snapshots are module-global; make every test start from a cold read."""
+    dashboard.invalidate_node_state()
+    for entry in dashboard._node_state.values():
+        entry['failed'] = False
+    dashboard._payload_snapshots.clear()
+    yield
+    dashboard.invalidate_node_state()
+    dashboard._payload_snapshots.clear()
+
+
 def _ext(**extra_headers):
     """Return kwargs that simulate an external client with optional extra headers."""
     return dict(environ_base={'REMOTE_ADDR': EXTERNAL_IP}, headers=extra_headers)
@@ -104,6 +127,14 @@ def _rpc(method, params=None):
     return _RPC_DISPATCH.get(method)
 
 
+def _rpc_batch(calls):
+    replies = []
+    for call in calls:
+        method = call if isinstance(call, str) else call[0]
+        replies.append({'result': _RPC_DISPATCH.get(method), 'error': None})
+    return replies
+
+
 _ELECTRUMX_STATS = {
     'server_version':       'ElectrumX 1.16.0',
     'protocol_min':         '1.4',
@@ -175,6 +206,12 @@ class TestApiKeyAuth:
             '/api/electrumx/stats',
             '/api/electrumx/servers',
             '/api/system/resources',
+            '/api/stream',
+            '/api/history/block_height',
+            '/api/debug/profile?seconds=1',
+            '/api/dashboard',
+            '/api/health/live',
+            '/api/health/ready',
         ]
         for route in routes:
             r = client.get(route, **_ext())
@@ -210,7 +247,7 @@ class TestApiEndpoints:
 
     # /api/palladium/* --------------------------------------------------------
 
-    @patch('app.palladium_rpc_call', side_effect=_rpc)
+    @patch('app.palladium_rpc_batch', side_effect=_rpc_batch)
     def test_palladium_info(self, _mock, client):
         r = self._get(client, '/api/palladium/info')
         assert r.status_code == 200
@@ -222,6 +259,13 @@ class TestApiEndpoints:
         assert 'mempool'    in data
         assert 'timestamp'  in data
 
+    @patch('app.palladium_rpc_batch', side_effect=_rpc_batch)
+    def test_palladium_info_uses_single_batch(self, batch_mock, client):
+        r = self._get(client, '/api/palladium/info')
+        assert r.status_code == 200
+        assert batch_mock.call_count == 1
+        assert r.get_json()['peers'] == len(_PEER_INFO)
+
     @patch('app.palladium_rpc_call', side_effect=_rpc)
     def test_block_height(self, _mock, client):
         r = self._get(client, '/api/palladium/block-height')
@@ -266,8 +310,9 @@ class TestApiEndpoints:
         assert 'addr' in peer
         assert 'inbound' in peer
 
+    @patch('app.palladium_rpc_batch', side_effect=_rpc_batch)
     @patch('app.palladium_rpc_call', side_effect=_rpc)
-    def test_recent_blocks(self, _mock, client):
+    def test_recent_blocks(self, _mock, _batch_mock, client):
         r = self._get(client, '/api/palladium/blocks/recent')
         assert r.status_code == 200
         data = r.get_json()
@@ -325,8 +370,1639 @@ class TestCacheHeaders:
         assert 'no-store' in cc
         assert 'no-cache' in cc
 
-    @patch('app.palladium_rpc_call', side_effect=_rpc)
+    @patch('app.palladium_rpc_batch', side_effect=_rpc_batch)
     def test_pragma_no_cache(self, _mock, client):
         r = client.get('/api/palladium/info',
                        environ_base={'REMOTE_ADDR': TRUSTED_IP})
         assert r.headers.get('Pragma') == 'no-cache'
+
+
+# ── 8. Electrum probe engine ─────────────────────────────────────────────────
+
+class TestProbeSweep:
+    """Probes in one sweep run concurrently and share a single deadline."""
+
+    def test_probes_run_concurrently(self):
+        sweep = dashboard.ProbeSweep(deadline=5)
+        started = time.monotonic()
+        keys = [sweep.submit(('tcp', f'10.0.0.{i}', 50001), time.sleep, 0.2) for i in range(10)]
+        for key in keys:
+            sweep.result(key)
+        assert time.monotonic() - started < 1.0
+
+    def test_duplicate_probe_runs_once(self):
+        calls = []
+        sweep = dashboard.ProbeSweep(deadline=5)
+        for _ in range(3):
+            key = sweep.submit(('tcp', '10.0.0.1', 50001), calls.append, 1)
+        sweep.result(key)
+        assert calls == [1]
+
+    def test_deadline_returns_default(self):
+        sweep = dashboard.ProbeSweep(deadline=0.1)
+        key = sweep.submit(('ssl', '10.0.0.1', 50002), time.sleep, 1)
+        started = time.monotonic()
+        assert sweep.result(key, False) is False
+        assert time.monotonic() - started < 0.5
+
+
+# ── 9. JSON-RPC batching ─────────────────────────────────────────────────────
+
+class _FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self._payload
+
+
+class TestRpcBatch:
+    """palladium_rpc_batch sends one JSON-RPC array and maps replies by id."""
+
+    @patch('app.get_rpc_credentials', return_value=('user', 'pass'))
+    def test_batch_maps_replies_by_id(self, _creds):
+        replies = [
+            {'id': 1, 'result': None, 'error': {'code': -32601, 'message': 'Method not found'}},
+            {'id': 0, 'result': 100_000, 'error': None},
+        ]
+        with patch('app._palladium_rpc_post', return_value=_FakeResponse(replies)) as post:
+            results = dashboard.palladium_rpc_batch(['getblockcount', ('nosuchmethod', [1])])
+        sent = post.call_args[0][0]
+        assert [item['method'] for item in sent] == ['getblockcount', 'nosuchmethod']
+        assert sent[1]['params'] == [1]
+        assert results[0] == {'result': 100_000, 'error': None}
+        assert results[1]['error']['code'] == -32601
+
+    @patch('app.get_rpc_credentials', return_value=('user', 'pass'))
+    def test_transport_failure_returns_none(self, _creds):
+        with patch('app._palladium_rpc_post', side_effect=OSError('connection refused')):
+            assert dashboard.palladium_rpc_batch(['getblockcount']) is None
+            assert dashboard.palladium_rpc_batch_results(['getblockcount', 'getdifficulty']) == [None, None]
+
+
+# ── 10. Recent blocks cache ──────────────────────────────────────────────────
+
+class _FakeChain:
+    """Minimal node stand-in: a linear chain whose tip can be extended or reorged."""
+
+    def __init__(self, tip_height, fork=''):
+        self.blocks = {}
+        self.by_height = {}
+        self.batches = []
+        self.calls = []
+        self.extend(tip_height, fork)
+
+    def extend(self, tip_height, fork='', start=1):
+        for height in range(start, tip_height + 1):
+            block_hash = (fork + f'{height:064x}')[:64]
+            parent = self.by_height.get(height - 1)
+            self.blocks[block_hash] = {'height': height, 'time': 1_700_000_000 + height,
+                                       'size': 250, 'nTx': 1, 'previousblockhash': parent}
+            self.by_height[height] = block_hash
+        self.tip = tip_height
+        dashboard.invalidate_node_state('tip')  # what a ZMQ hashblock would do
+
+    def rpc(self, method, params=None):
+        self.calls.append(method)
+        if method == 'getblockchaininfo':
+            return {'blocks': self.tip, 'bestblockhash': self.by_height[self.tip]}
+        if method == 'getblock':
+            return self.blocks.get(params[0])
+        if method == 'getmininginfo':
+            return {'networkhashps': 1.0}
+        return None
+
+    def rpc_batch(self, calls):
+        calls = [(call, []) if isinstance(call, str) else call for call in calls]
+        self.batches.append([method for method, _ in calls])
+        replies = []
+        for method, params in calls:
+            if method == 'getblockhash':
+                result = self.by_height.get(params[0])
+            elif method == 'getblock':
+                result = self.blocks.get(params[0])
+            else:
+                result = self.rpc(method, params)
+            replies.append({'result': result, 'error': None})
+        return replies
+
+
+@pytest.fixture()
+def chain():
+    dashboard._block_cache.clear()
+    dashboard._block_hash_by_height.clear()
+    fake = _FakeChain(tip_height=600)
+    with patch('app.palladium_rpc_call', side_effect=fake.rpc), \
+         patch('app.palladium_rpc_batch', side_effect=fake.rpc_batch):
+        yield fake
+    dashboard._block_cache.clear()
+    dashboard._block_hash_by_height.clear()
+
+
+class TestRecentBlocksCache:
+    """Blocks are fetched once in batches, then served from the hash-keyed cache."""
+
+    def test_cold_fetch_is_batched(self, client, chain):
+        r = client.get('/api/palladium/blocks/recent?count=300', **_local())
+        blocks = r.get_json()['blocks']
+        assert [b['height'] for b in blocks] == list(range(600, 300, -1))
+        assert 'previousblockhash' not in blocks[0]
+        assert chain.batches == [
+            ['getblockchaininfo', 'getmininginfo'],
+            ['getblockhash'] * 298,
+            ['getblock'] * 299,
+        ]
+
+    def test_warm_cache_needs_no_rpc(self, client, chain):
+        client.get('/api/palladium/blocks/recent', **_local())
+        chain.batches.clear()
+        chain.calls.clear()
+        r = client.get('/api/palladium/blocks/recent', **_local())
+        assert len(r.get_json()['blocks']) == 10
+        assert chain.batches == []
+        assert chain.calls == []
+
+    def test_new_tip_fetches_only_new_block(self, client, chain):
+        client.get('/api/palladium/blocks/recent', **_local())
+        chain.batches.clear()
+        chain.calls.clear()
+        chain.extend(601, start=601)
+        r = client.get('/api/palladium/blocks/recent', **_local())
+        assert r.get_json()['blocks'][0]['height'] == 601
+        assert chain.batches == [['getblockchaininfo', 'getmininginfo']]
+        assert chain.calls == ['getblockchaininfo', 'getmininginfo', 'getblock']
+
+    def test_reorg_evicts_replaced_blocks(self, client, chain):
+        client.get('/api/palladium/blocks/recent', **_local())
+        old_tip = chain.by_height[600]
+        chain.extend(600, fork='f', start=599)
+        r = client.get('/api/palladium/blocks/recent', **_local())
+        blocks = r.get_json()['blocks']
+        assert blocks[0]['hash'] == chain.by_height[600]
+        assert old_tip not in dashboard._block_cache
+
+    def test_count_is_clamped(self, client, chain):
+        r = client.get('/api/palladium/blocks/recent?count=100000', **_local())
+        assert len(r.get_json()['blocks']) == dashboard.RECENT_BLOCKS_MAX
+
+
+# ── 11. Pooled node RPC session ──────────────────────────────────────────────
+
+class _KeepAliveRpcHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        body = json.dumps({'id': request['id'], 'result': 42, 'error': None}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def rpc_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _KeepAliveRpcHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with patch('app.PALLADIUM_RPC_HOST', '127.0.0.1'), \
+         patch('app.PALLADIUM_RPC_PORT', server.server_address[1]), \
+         patch('app.get_rpc_credentials', return_value=('user', 'pass')), \
+         patch('app._rpc_http', dashboard._create_rpc_session()):
+        yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestRpcConnectionPool:
+    """Node RPC calls reuse keep-alive connections from the shared pool."""
+
+    def test_connections_are_reused(self, rpc_server):
+        for _ in range(3):
+            assert dashboard.palladium_rpc_call('getblockcount') == 42
+        stats = dashboard.get_rpc_pool_stats()
+        assert stats['requests'] == 3
+        assert stats['misses'] == 1
+        assert stats['hits'] == 2
+        assert stats['idle'] == 1
+
+    def test_connect_and_read_timeouts_are_separate(self):
+        with patch('app.get_rpc_credentials', return_value=('user', 'pass')), \
+             patch.object(dashboard._rpc_http, 'post', return_value=_FakeResponse({'result': 1})) as post:
+            dashboard.palladium_rpc_call('getblockcount')
+        assert post.call_args.kwargs['timeout'] == (
+            dashboard.PALLADIUM_RPC_CONNECT_TIMEOUT, dashboard.PALLADIUM_RPC_READ_TIMEOUT)
+
+
+# ── 12. palladium.conf snapshot ──────────────────────────────────────────────
+
+@pytest.fixture()
+def conf_file(tmp_path):
+    path = tmp_path / 'palladium.conf'
+    path.write_text('rpcuser=alice\nrpcpassword=secret\n# addnode=9.9.9.9:2333\n'
+                    'addnode=1.2.3.4:2333\naddnode=5.6.7.8\naddnode=1.2.3.4:2333\n')
+    dashboard._palladium_conf_cache.clear()
+    with patch('app.PALLADIUM_CONF_PATH', str(path)), \
+         patch('app.PALLADIUM_CONF_CHECK_INTERVAL', 0):
+        yield path
+    dashboard._palladium_conf_cache.clear()
+
+
+class TestPalladiumConfigSnapshot:
+    """palladium.conf is parsed once and re-read only when the file changes."""
+
+    def test_readers_share_one_parse(self, conf_file):
+        with patch('app._load_palladium_config', wraps=dashboard._load_palladium_config) as load:
+            assert dashboard.get_rpc_credentials() == ('alice', 'secret')
+            assert dashboard.get_rpc_credentials() == ('alice', 'secret')
+            assert dashboard.parse_addnode_hosts() == ['1.2.3.4', '5.6.7.8']
+        assert load.call_count == 1
+
+    def test_credential_rotation_is_picked_up(self, conf_file):
+        assert dashboard.get_rpc_credentials() == ('alice', 'secret')
+        conf_file.write_text('rpcuser=bob\nrpcpassword=rotated-password\n')
+        assert dashboard.get_rpc_credentials() == ('bob', 'rotated-password')
+
+    def test_missing_file_yields_no_credentials(self, tmp_path):
+        dashboard._palladium_conf_cache.clear()
+        with patch('app.PALLADIUM_CONF_PATH', str(tmp_path / 'missing.conf')):
+            assert dashboard.get_rpc_credentials() == (None, None)
+            assert dashboard.parse_addnode_hosts() == []
+
+
+# ── 13. ZMQ-driven node state invalidation ───────────────────────────────────
+
+class TestNodeEventListener:
+    """A stand-in ZMQ publisher drives invalidation of cached node state."""
+
+    @staticmethod
+    def _publish_until(pub, topic, condition, timeout=5.0):
+        # ZMQ subscriptions propagate asynchronously ("slow joiner"), so keep
+        # publishing until the listener has reacted.
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            pub.send_multipart([topic, b'\x00' * 32, b'\x01\x00\x00\x00'])
+            if condition():
+                return True
+            time.sleep(0.05)
+        return False
+
+    def test_block_and_tx_notifications_invalidate_state(self):
+        zmq = pytest.importorskip('zmq')
+        context = zmq.Context()
+        pub = context.socket(zmq.PUB)
+        port = pub.bind_to_random_port('tcp://127.0.0.1')
+        endpoint = f'tcp://127.0.0.1:{port}'
+        listener = dashboard.NodeEventListener([(endpoint, b'hashblock'), (endpoint, b'hashtx')])
+        try:
+            with patch('app.palladium_rpc_batch', side_effect=_rpc_batch) as batch, \
+                 patch('app.get_recent_block_summaries'):
+                dashboard.get_node_state()
+                dashboard.get_node_state()
+                assert batch.call_count == 1
+                listener.start()
+
+                assert self._publish_until(pub, b'hashtx',
+                                           lambda: dashboard._node_state['mempool']['invalidated'])
+                assert not dashboard._node_state['tip']['invalidated']
+                assert dashboard.is_zmq_feed_live()
+
+                # A block refreshes tip data eagerly from the listener thread
+                calls_before = batch.call_count
+                assert self._publish_until(pub, b'hashblock',
+                                           lambda: batch.call_count > calls_before)
+        finally:
+            listener.stop()
+            pub.close(linger=0)
+            context.term()
+        assert not dashboard._zmq_state['running']
+
+    def test_endpoint_derived_from_palladium_conf(self, conf_file):
+        conf_file.write_text('zmqpubhashblock=tcp://0.0.0.0:28332\n')
+        assert dashboard.resolve_zmq_endpoint('zmqpubhashblock') == \
+            f'tcp://{dashboard.PALLADIUM_RPC_HOST}:28332'
+        assert dashboard.resolve_zmq_endpoint('zmqpubrawtx') is None
+        with patch.dict(os.environ, {'PALLADIUM_ZMQ_RAWTX': 'tcp://10.0.0.2:28335'}):
+            assert dashboard.resolve_zmq_endpoint('zmqpubrawtx') == 'tcp://10.0.0.2:28335'
+
+
+# ── 14. Live update stream ───────────────────────────────────────────────────
+
+def _sse_events(chunk):
+    """Parse an SSE chunk into [(event, message dict)]."""
+    events = []
+    for block in chunk.decode().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if ': ' in line)
+        if 'event' in fields:
+            events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+class TestStreamHub:
+    """One producer feeds every stream client with snapshots, then patches."""
+
+    def test_snapshot_then_patch(self):
+        state = {'height': 1, 'hash': 'aa', 'timestamp': 't1'}
+        hub = dashboard.StreamHub({'node': lambda: dict(state)}, interval=0.05, keepalive=2)
+        client = hub.stream(['node'])
+        try:
+            assert next(client).startswith(b'retry:')
+            assert _sse_events(next(client)) == [('node', {'snapshot': state})]
+            state.update(height=2, timestamp='t2')
+            assert _sse_events(next(client)) == [('node', {'patch': {'height': 2, 'timestamp': 't2'}})]
+        finally:
+            client.close()
+
+    def test_clients_share_one_producer(self):
+        builds = []
+
+        def build():
+            builds.append(1)
+            return {'value': len(builds) // 3}
+
+        hub = dashboard.StreamHub({'system': build}, interval=0.05, keepalive=2)
+        clients = [hub.stream(['system']) for _ in range(20)]
+        try:
+            for client in clients:
+                next(client)
+                next(client)
+            assert hub.clients == 20
+            time.sleep(0.3)
+            assert len(builds) < 15  # ~one build per tick, not one per client
+        finally:
+            for client in clients:
+                client.close()
+        assert hub.clients == 0
+
+    def test_unchanged_payload_is_not_republished(self):
+        hub = dashboard.StreamHub({})
+        assert hub.publish('node', {'height': 1, 'timestamp': 't1'})
+        assert not hub.publish('node', {'height': 1, 'timestamp': 't2'})
+
+    def test_health_topic_uses_cached_state(self):
+        dashboard._electrumx_stats_cache.clear()
+        with patch('app.palladium_rpc_call', side_effect=AssertionError('live node call')), \
+             patch.dict(dashboard._node_state['tip'], timestamp=time.time()):
+            hub = dashboard.StreamHub({})
+            assert hub.publish('health', dashboard.STREAM_TOPICS['health']())
+            assert not hub.publish('health', dashboard.STREAM_TOPICS['health']())
+            payload = dashboard.STREAM_TOPICS['health']()
+        assert payload == {'status': 'degraded', 'services': {'palladium': 'up', 'electrumx': 'down'}}
+
+    def test_unknown_topic_rejected(self, client):
+        r = client.get('/api/stream?topics=node,bogus', **_local())
+        assert r.status_code == 400
+
+
+# ── 15. Docker Engine API over the unix socket ───────────────────────────────
+
+class _FakeDockerHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.requests.append(('GET', self.path))
+        if self.path == '/containers/plm-electrumx/json':
+            self._reply(200, {
+                'State': {'Running': True, 'StartedAt': '2024-01-01T00:00:00.000000000Z'},
+                'Config': {'Env': ['SERVICES=tcp://0.0.0.0:50001,ssl://0.0.0.0:50002',
+                                   'PEER_DISCOVERY=on', 'PEER_ANNOUNCE=']},
+            })
+        elif self.path.startswith('/exec/'):
+            self._reply(200, {'ExitCode': 0})
+        else:
+            self._reply(404, {'message': 'No such container'})
+
+    def do_POST(self):
+        self.server.requests.append(('POST', self.path))
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if self.path.endswith('/exec'):
+            self.server.commands.append(body['Cmd'])
+            self._reply(201, {'Id': 'e%d' % len(self.server.commands)})
+            return
+        # exec start: hijacked multiplexed stream, closed when the command ends
+        output = b'12345\t/data\n' if self.server.commands[-1][0] == 'du' else b'3\n'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/vnd.docker.multiplexed-stream')
+        self.end_headers()
+        self.wfile.write(bytes([2, 0, 0, 0]) + (4).to_bytes(4, 'big') + b'warn')
+        self.wfile.write(bytes([1, 0, 0, 0]) + len(output).to_bytes(4, 'big') + output)
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+class _FakeDockerDaemon(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        super().__init__(path, _FakeDockerHandler)
+        self.requests = []
+        self.commands = []
+        self.connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+def _clear_docker_caches():
+    for cache in (dashboard._container_info_cache, dashboard._db_size_du_cache,
+                  dashboard._tcp_sessions_cache):
+        cache.clear()
+
+
+@pytest.fixture()
+def docker_daemon(tmp_path):
+    server = _FakeDockerDaemon(str(tmp_path / 'docker.sock'))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _clear_docker_caches()
+    with patch('app._docker', dashboard.DockerEngine(server.server_address)):
+        yield server
+    _clear_docker_caches()
+    server.shutdown()
+    server.server_close()
+
+
+class TestDockerEngine:
+    """Container facts come from the Docker API socket, cached per kind."""
+
+    def test_inspect_reuses_connection(self, docker_daemon):
+        engine = dashboard.DockerEngine(docker_daemon.server_address)
+        for _ in range(3):
+            assert engine.inspect('plm-electrumx')['State']['Running'] is True
+        assert engine.inspect('missing') is None
+        assert docker_daemon.connections == 1
+        engine.close()
+
+    def test_exec_returns_stdout_only(self, docker_daemon):
+        engine = dashboard.DockerEngine(docker_daemon.server_address)
+        assert engine.exec('plm-electrumx', ['du', '-sb', '/data']) == (0, '12345\t/data\n')
+        engine.close()
+
+    def test_container_env_and_ports(self, docker_daemon):
+        info = dashboard.get_electrumx_container_info()
+        assert info['running'] is True
+        assert info['env']['PEER_DISCOVERY'] == 'on'
+        assert dashboard.get_electrumx_service_ports() == (50001, 50002)
+
+    def test_results_cached_by_kind(self, docker_daemon):
+        for _ in range(3):
+            dashboard.get_electrumx_container_info()
+            assert dashboard.get_electrumx_db_size() == 12345
+            assert dashboard.get_electrumx_tcp_sessions(50001) == 3
+        assert docker_daemon.requests.count(('GET', '/containers/plm-electrumx/json')) == 1
+        assert len(docker_daemon.commands) == 2
+
+    def test_unavailable_daemon_is_not_fatal(self, tmp_path):
+        _clear_docker_caches()
+        with patch('app._docker', dashboard.DockerEngine(str(tmp_path / 'absent.sock'))), \
+             patch.dict(os.environ, {'SERVICES': 'tcp://0.0.0.0:60001'}):
+            assert dashboard.get_electrumx_container_info() is None
+            assert dashboard.get_electrumx_service_ports() == (60001, None)
+        _clear_docker_caches()
+
+
+# ── 16. ElectrumX admin RPC ──────────────────────────────────────────────────
+
+class _FakeElectrumxAdminHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.connections += 1
+        for line in self.rfile:
+            request = json.loads(line)
+            result = self.server.responses[request['method']]
+            self.server.request_total += 25
+            if request['method'] == 'getinfo':
+                result = dict(result, **{'request total': self.server.request_total})
+            self.wfile.write((json.dumps({'jsonrpc': '2.0', 'id': request['id'], 'result': result}) + '\n').encode())
+
+
+@pytest.fixture()
+def electrumx_admin():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _FakeElectrumxAdminHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.request_total = 0
+    server.responses = {
+        'getinfo': {'db height': 1200, 'daemon height': 1201,
+                    'sessions': {'count': 2, 'subs': 7}},
+        # id, flags, peer, client, proto, cost, extra cost, unanswered, txs, subs, recv count, ...
+        'sessions': [
+            [1, 'T', '10.0.0.1:5000', 'electrum/4.5', '1.4', 100.0, 0, 0, 0, 3, 40],
+            [2, 'S', '10.0.0.2:5000', 'electrum/4.5', '1.4', 300.0, 0, 0, 0, 4, 60],
+        ],
+    }
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = dashboard.ElectrumxAdminClient('127.0.0.1', server.server_address[1])
+    with patch('app._electrumx_admin', client), \
+         patch('app._electrumx_request_rate', dashboard.RequestRateTracker(min_interval=0)):
+        yield server
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+class TestElectrumxAdminRpc:
+    """Session, request and subscription counters come from the admin RPC port."""
+
+    def test_metrics_from_getinfo_and_sessions(self, electrumx_admin):
+        metrics = dashboard.get_electrumx_admin_metrics()
+        assert metrics['sessions'] == 2
+        assert metrics['subs'] == 7
+        assert metrics['requests'] == 25
+        assert metrics['request_rate'] is None  # needs two samples
+        assert metrics['db_height'] == 1200
+        assert metrics['daemon_height'] == 1201
+        assert metrics['session_cost_avg'] == 200.0
+        assert metrics['session_cost_max'] == 300.0
+
+    def test_request_rate_and_connection_reuse(self, electrumx_admin):
+        dashboard.get_electrumx_admin_metrics()
+        time.sleep(0.05)
+        metrics = dashboard.get_electrumx_admin_metrics()
+        assert metrics['requests'] == 75
+        assert metrics['request_rate'] > 0
+        assert electrumx_admin.connections == 1
+
+    def test_request_rate_is_shared_across_loaders(self):
+        tracker = dashboard.RequestRateTracker(min_interval=10)
+        assert tracker.update(100, now=1000) is None
+        assert tracker.update(200, now=1020) == 5.0
+        # the other loader sampling a second later reads the same rate, not 10/s over 1 s
+        assert tracker.update(210, now=1021) == 5.0
+        assert tracker.update(400, now=1040) == 10.0
+        assert tracker.update(5, now=1050) is None  # ElectrumX restarted
+
+    def test_reconnects_after_server_drop(self, electrumx_admin):
+        assert dashboard._electrumx_admin.call('getinfo') is not None
+        dashboard._electrumx_admin._stream.sock.shutdown(socket.SHUT_RDWR)
+        assert dashboard._electrumx_admin.call('getinfo') is not None
+        assert electrumx_admin.connections == 2
+
+    def test_unreachable_port_returns_none(self):
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            port = s.getsockname()[1]
+        client = dashboard.ElectrumxAdminClient('127.0.0.1', port, timeout=0.5)
+        with patch('app._electrumx_admin', client):
+            assert dashboard.get_electrumx_admin_metrics() is None
+
+
+# ── 17. ElectrumX DB size tracking ───────────────────────────────────────────
+
+@pytest.fixture()
+def electrumx_data(tmp_path):
+    data = tmp_path / 'electrumx-data'
+    (data / 'utxo').mkdir(parents=True)
+    (data / 'hist').mkdir()
+    (data / 'meta').mkdir()
+    for i in range(50):
+        (data / 'utxo' / f'{i:06d}.ldb').write_bytes(b'u' * 100)
+    (data / 'utxo' / '000051.log').write_bytes(b'l' * 10)
+    (data / 'hist' / '000001.ldb').write_bytes(b'h' * 200)
+    (data / 'meta' / 'headers').write_bytes(b'x' * 80)
+    # Table files written by an earlier compaction, old enough to be settled
+    old = time.time() - 3600
+    for table in data.glob('*/*.ldb'):
+        os.utime(table, (old, old))
+    return data
+
+
+class TestDbSizeTracker:
+    """The DB size is tracked incrementally instead of walking every file."""
+
+    def test_initial_size(self, electrumx_data):
+        tracker = dashboard.DbSizeTracker(str(electrumx_data))
+        assert tracker.sample() == 50 * 100 + 10 + 200 + 80
+
+    def test_unchanged_tables_are_not_restated(self, electrumx_data):
+        tracker = dashboard.DbSizeTracker(str(electrumx_data))
+        tracker.sample()
+        tracker.stat_calls = 0
+        (electrumx_data / 'utxo' / '000051.log').write_bytes(b'l' * 30)
+        (electrumx_data / 'meta' / 'headers').write_bytes(b'x' * 160)
+        assert tracker.sample() == 50 * 100 + 30 + 200 + 160
+        # four directories plus the two mutable files
+        assert tracker.stat_calls == 6
+
+    def test_new_and_removed_files(self, electrumx_data):
+        tracker = dashboard.DbSizeTracker(str(electrumx_data))
+        tracker.sample()
+        (electrumx_data / 'hist' / '000002.ldb').write_bytes(b'h' * 500)
+        (electrumx_data / 'utxo' / '000000.ldb').unlink()
+        assert tracker.sample() == 49 * 100 + 10 + 700 + 80
+
+    def test_table_file_still_being_written_is_restated(self, electrumx_data):
+        tracker = dashboard.DbSizeTracker(str(electrumx_data))
+        table = electrumx_data / 'hist' / '000002.ldb'
+        table.write_bytes(b'h' * 100)  # partially written during compaction
+        tracker.sample()
+        with open(table, 'ab') as f:  # grows in place; the directory mtime does not change
+            f.write(b'h' * 400)
+        assert tracker.sample() == 50 * 100 + 10 + 200 + 500 + 80
+        old = time.time() - 3600
+        os.utime(table, (old, old))
+        tracker.sample()
+        tracker.stat_calls = 0
+        tracker.sample()
+        # four directories plus the two mutable files; the finished table is settled
+        assert tracker.stat_calls == 6
+
+    def test_growth_rate(self, electrumx_data):
+        tracker = dashboard.DbSizeTracker(str(electrumx_data))
+        with patch('app.time.time', return_value=1000.0):
+            tracker.sample()
+        assert tracker.latest()['growth_rate'] is None
+        (electrumx_data / 'hist' / '000002.ldb').write_bytes(b'h' * 600)
+        with patch('app.time.time', return_value=1060.0):
+            tracker.sample()
+        assert tracker.latest()['growth_rate'] == 10.0
+
+    def test_stats_use_mounted_directory(self, electrumx_data):
+        with patch('app._db_size_tracker', dashboard.DbSizeTracker(str(electrumx_data))), \
+             patch('app.get_electrumx_db_size') as du:
+            assert dashboard.get_db_size_stats()['size'] == 50 * 100 + 10 + 200 + 80
+        du.assert_not_called()
+
+
+# ── 18. Server identity ──────────────────────────────────────────────────────
+
+@pytest.fixture()
+def fresh_identity():
+    empty = {'ip': None, 'source': None, 'resolved_at': 0.0}
+    with patch.dict(dashboard._server_identity, empty), \
+         patch('app.get_electrumx_container_info', return_value=None), \
+         patch('app._identity_from_interfaces', return_value=None):
+        yield dashboard._server_identity
+
+
+class TestServerIdentity:
+    """The server's own address is resolved once and served from cache."""
+
+    def test_report_services_wins_without_network(self, fresh_identity):
+        with patch.dict(os.environ, {'REPORT_SERVICES': 'tcp://203.0.113.7:50001,ssl://203.0.113.7:50002'}), \
+             patch('app.requests.get') as get:
+            assert dashboard.get_server_identity() == '203.0.113.7'
+            assert dashboard.get_server_identity() == '203.0.113.7'
+        get.assert_not_called()
+        assert fresh_identity['source'] == 'report_services'
+
+    def test_cached_value_skips_resolution(self, fresh_identity):
+        fresh_identity.update(ip='198.51.100.1', source='ipify')
+        with patch('app.resolve_server_identity') as resolve:
+            assert dashboard.get_server_identity() == '198.51.100.1'
+        resolve.assert_not_called()
+
+    def test_public_lookup_runs_in_background(self, fresh_identity):
+        looked_up = threading.Event()
+
+        def slow_ipify(*args, **kwargs):
+            looked_up.wait(2)
+            return _FakeResponse({'ip': '198.51.100.9'})
+
+        with patch.dict(os.environ, {'REPORT_SERVICES': ''}), \
+             patch('app._identity_from_route', return_value='10.1.2.3'), \
+             patch('app.requests.get', side_effect=slow_ipify):
+            assert dashboard.get_server_identity() == '10.1.2.3'
+            looked_up.set()
+            for _ in range(100):
+                if fresh_identity['source'] == 'ipify':
+                    break
+                time.sleep(0.01)
+        assert dashboard.get_server_identity() == '198.51.100.9'
+
+
+# ── 19. Immutable cache snapshots ────────────────────────────────────────────
+
+class TestCacheSnapshots:
+    """Cache hits share one frozen, pre-encoded snapshot instead of copying."""
+
+    def test_cached_peers_are_shared_and_read_only(self):
+        peers = [{'addr': '1.2.3.4:2333', 'inbound': False, 'subver': '/Palladium:1.0/'}]
+        dashboard._peers_cache.clear()
+        with patch('app.palladium_rpc_call', return_value=peers):
+            first = dashboard.get_peers_cached()
+            assert dashboard.get_peers_cached() is first
+        dashboard._peers_cache.clear()
+        with pytest.raises(TypeError):
+            first[0]['addr'] = 'changed'
+
+    def test_peers_payload_encoded_once(self, client):
+        peers = dashboard.freeze([{'addr': '1.2.3.4:2333', 'inbound': True, 'subver': '/Palladium:1.0/'}])
+        with patch('app.get_peers_cached', return_value=peers), \
+             patch('app.Snapshot', wraps=dashboard.Snapshot) as snapshot_cls:
+            bodies = [client.get('/api/palladium/peers', **_local()).data for _ in range(5)]
+        assert snapshot_cls.call_count == 1
+        assert len(set(bodies)) == 1
+        assert json.loads(bodies[0])['peers'][0]['inbound'] is True
+
+    def test_stats_overlay_leaves_cache_untouched(self):
+        light = dashboard.freeze({'server_version': 'ElectrumX 1.16.0', 'active_servers': []})
+        heavy = dashboard.freeze({'active_servers': [{'host': 'a.example'}], 'active_servers_count': 1})
+
+        def cached(force_refresh=False, include_addnode_probes=False):
+            return heavy if include_addnode_probes else light
+
+        with patch('app.get_electrumx_stats_cached', side_effect=cached), \
+             patch('app.get_electrumx_container_info', return_value={'running': True}):
+            snapshot = dashboard.build_electrumx_stats()
+            assert dashboard.build_electrumx_stats() is snapshot
+        assert snapshot.data['stats']['active_servers_count'] == 1
+        assert snapshot.data['stats']['status'] == 'running'
+        assert light['active_servers'] == ()
+        assert 'status' not in light
+
+    def test_stream_reuses_snapshot_encoding(self):
+        hub = dashboard.StreamHub({})
+        snapshot = dashboard.Snapshot({'height': 5, 'timestamp': 't1'})
+        assert hub.publish('node', snapshot)
+        assert _sse_events(hub._topics['node']['snapshot']) == [
+            ('node', {'snapshot': {'height': 5, 'timestamp': 't1'}})]
+
+
+# ── 20. Stale-while-revalidate cache ─────────────────────────────────────────
+
+class _CountingLoader:
+    def __init__(self, delay=0.0, values=None):
+        self.delay = delay
+        self.values = list(values or [])
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, key):
+        with self._lock:
+            self.calls += 1
+            value = self.values.pop(0) if self.values else {'key': key, 'n': self.calls}
+        time.sleep(self.delay)
+        return value
+
+
+def _new_cache(loader, **kwargs):
+    cache = dashboard.SWRCache('test', loader, **kwargs)
+    dashboard._caches.pop('test', None)
+    return cache
+
+
+class TestSWRCache:
+    """One cache component: TTL, stale-while-revalidate, single flight, negative TTL."""
+
+    def test_fresh_hit_does_not_reload(self):
+        loader = _CountingLoader()
+        cache = _new_cache(loader, ttl=60)
+        first = cache.get('a')
+        assert cache.get('a') is first
+        assert loader.calls == 1
+        assert cache.stats()['hits'] == 1
+
+    def test_concurrent_misses_share_one_load(self):
+        loader = _CountingLoader(delay=0.1)
+        cache = _new_cache(loader, ttl=60)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get('a'))) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert loader.calls == 1
+        assert all(result is results[0] for result in results)
+
+    def test_stale_burst_triggers_single_background_refresh(self):
+        loader = _CountingLoader(delay=0.1)
+        cache = _new_cache(loader, ttl=0.05)
+        first = cache.get()
+        time.sleep(0.06)
+        started = time.monotonic()
+        assert all(cache.get() is first for _ in range(50))
+        assert time.monotonic() - started < 0.05  # stale data served without waiting
+        time.sleep(0.2)
+        assert loader.calls == 2
+        assert cache.get()['n'] == 2
+
+    def test_failure_keeps_last_value_until_negative_ttl(self):
+        loader = _CountingLoader(values=[{'n': 1}, None, {'n': 3}])
+        cache = _new_cache(loader, ttl=0, negative_ttl=60)
+        assert cache.get(force_refresh=True) == {'n': 1}
+        assert cache.get(force_refresh=True) == {'n': 1}
+        assert cache.get() == {'n': 1}
+        assert loader.calls == 2
+        assert cache.stats()['failures'] == 1
+
+    def test_negative_values_use_short_ttl(self):
+        loader = _CountingLoader(values=[{'count': 0}, {'count': 2}])
+        cache = _new_cache(loader, ttl=60, negative_ttl=0, is_negative=lambda v: v['count'] == 0)
+        cache.get()
+        cache.get()
+        time.sleep(0.05)
+        assert cache.get()['count'] == 2
+
+    def test_size_is_bounded(self):
+        cache = _new_cache(_CountingLoader(), ttl=60, max_entries=3)
+        for key in 'abcde':
+            cache.get(key)
+        assert cache.stats()['entries'] == 3
+        assert cache.peek('a') is None
+        assert cache.peek('e') is not None
+
+    def test_peers_burst_makes_one_rpc_call(self):
+        dashboard._peers_cache.clear()
+        loader = _CountingLoader(delay=0.05, values=[[{'addr': '1.2.3.4'}]])
+        with patch('app.palladium_rpc_call', side_effect=lambda method: loader(method)):
+            threads = [threading.Thread(target=dashboard.get_peers_cached) for _ in range(10)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        dashboard._peers_cache.clear()
+        assert loader.calls == 1
+
+
+# ── 21. Background refresh scheduler ─────────────────────────────────────────
+
+@pytest.fixture()
+def scheduler():
+    sched = dashboard.RefreshScheduler(workers=2, jitter=0, max_backoff=0.4)
+    yield sched
+    sched.stop()
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestRefreshScheduler:
+    """Periodic jobs run on a fixed pool; handlers only read their results."""
+
+    def test_jobs_repeat_on_their_interval(self, scheduler):
+        runs = []
+        scheduler.add_job('tick', lambda: runs.append(time.monotonic()), 0.05)
+        scheduler.start()
+        assert _wait_for(lambda: len(runs) >= 4)
+        assert scheduler.status()['tick']['failures'] == 0
+
+    def test_failures_back_off(self, scheduler):
+        runs = []
+
+        def failing():
+            runs.append(time.monotonic())
+            raise RuntimeError('backend down')
+
+        scheduler.add_job('flaky', failing, 0.05)
+        scheduler.start()
+        assert _wait_for(lambda: len(runs) >= 3)
+        gaps = [b - a for a, b in zip(runs, runs[1:])]
+        assert gaps[1] > gaps[0] * 1.5
+        status = scheduler.status()['flaky']
+        assert status['failures'] >= 2
+        assert status['last_error'] == 'backend down'
+
+    def test_job_never_overlaps_itself(self, scheduler):
+        active = []
+        overlaps = []
+
+        def slow():
+            if active:
+                overlaps.append(True)
+            active.append(1)
+            time.sleep(0.15)
+            active.pop()
+
+        scheduler.add_job('slow', slow, 0.01, timeout=0.05)
+        scheduler.start()
+        assert _wait_for(lambda: scheduler.status()['slow']['runs'] >= 2)
+        assert not overlaps
+        assert scheduler.status()['slow']['failures'] >= 1  # overran its timeout
+
+    def test_hung_job_is_flagged_at_its_deadline(self, scheduler):
+        release = threading.Event()
+        calls = []
+
+        def hung():
+            calls.append(1)
+            release.wait(5)
+
+        scheduler.add_job('hung', hung, 0.01, timeout=0.05)
+        scheduler.start()
+        # flagged while still stuck, not only once it returns
+        assert _wait_for(lambda: scheduler.status()['hung']['stalled'])
+        status = scheduler.status()['hung']
+        assert status['running'] and status['overdue']
+        assert status['runs'] == 0
+        assert status['failures'] == 1
+        assert status['timeouts'] == 1
+        assert 'stalled' in status['last_error']
+        time.sleep(0.1)
+        assert len(calls) == 1  # not resubmitted while stuck
+        release.set()
+        assert _wait_for(lambda: scheduler.status()['hung']['runs'] == 1)
+        status = scheduler.status()['hung']
+        assert not status['stalled']
+        assert status['failures'] == 1  # the same timeout is not counted twice
+        assert status['timeouts'] == 1
+
+    def test_scheduled_cache_reads_do_not_start_work(self, scheduler):
+        loader = _CountingLoader()
+        cache = _new_cache(loader, ttl=0.05)
+        cache.get()
+        scheduler.schedule_cache(cache, interval=60)
+        scheduler.running = True  # owned, but the job has not run again yet
+        time.sleep(0.06)
+        for _ in range(20):
+            cache.get()
+        time.sleep(0.05)
+        assert loader.calls == 1
+
+    def test_scheduled_cache_is_refreshed_by_job(self, scheduler):
+        loader = _CountingLoader()
+        cache = _new_cache(loader, ttl=0.05)
+        scheduler.schedule_cache(cache)
+        scheduler.start()
+        assert _wait_for(lambda: loader.calls >= 3)
+        # the loader counts a call before refresh() stores its value
+        assert _wait_for(lambda: cache.get()['n'] >= 3)
+
+    def test_scheduled_failed_load_is_not_retried_by_reads(self, scheduler):
+        loader = _CountingLoader(values=[None])
+        cache = _new_cache(loader, ttl=60)
+        scheduler.schedule_cache(cache, interval=60)
+        scheduler.running = True
+        cache.refresh()
+        assert cache.get() is None
+        assert loader.calls == 1
+        assert cache.refresh()
+        assert cache.get()['n'] == 2
+
+    def test_node_handlers_only_read_while_scheduled(self, client, chain):
+        with patch.object(dashboard._scheduler, 'running', True), \
+             patch.object(dashboard, '_recent_blocks_depth', dashboard.RECENT_BLOCKS_DEFAULT):
+            for path in ('/api/palladium/info', '/api/palladium/blocks/recent',
+                         '/api/dashboard?fields=node,blocks'):
+                client.get(path, **_local())
+            assert chain.batches == [] and chain.calls == []
+
+            # what the node_* and recent_blocks jobs do
+            dashboard.refresh_node_state('tip', 'mempool', 'network')
+            assert dashboard.refresh_recent_blocks()
+            chain.batches.clear()
+            chain.calls.clear()
+            dashboard.invalidate_node_state('mempool')  # a ZMQ hashtx
+            info = client.get('/api/palladium/info', **_local()).get_json()
+            blocks = client.get('/api/palladium/blocks/recent?count=20', **_local()).get_json()['blocks']
+            client.get('/api/dashboard?fields=node', **_local())
+            assert chain.batches == [] and chain.calls == []
+            assert info['blockchain']['blocks'] == 600
+            assert len(blocks) == 10  # served short until the job fetches the deeper range
+
+            assert dashboard.refresh_recent_blocks()
+            blocks = client.get('/api/palladium/blocks/recent?count=20', **_local()).get_json()['blocks']
+            assert [b['height'] for b in blocks] == list(range(600, 580, -1))
+
+
+# ── 22. System resource sampler ──────────────────────────────────────────────
+
+class TestSystemSampler:
+    """System resources come from a background ring buffer, never a 1 s CPU wait."""
+
+    def test_sample_does_not_block(self):
+        sampler = dashboard.SystemSampler(size=10)
+        started = time.monotonic()
+        sample = sampler.sample()
+        assert time.monotonic() - started < 0.5
+        for key in ('cpu', 'memory', 'disk', 'network', 'disk_io', 'timestamp'):
+            assert key in sample
+
+    def test_rates_from_counter_deltas(self):
+        sampler = dashboard.SystemSampler(size=10)
+        assert sampler.sample()['network']['sent_rate'] is None
+        time.sleep(0.05)
+        second = sampler.sample()
+        assert second['network']['sent_rate'] is not None
+        assert second['network']['sent_rate'] >= 0
+
+    def test_ring_buffer_is_bounded(self):
+        sampler = dashboard.SystemSampler(size=3)
+        for _ in range(5):
+            sampler.sample()
+        assert len(sampler.history(3600)) == 3
+
+    def test_endpoint_serves_latest_sample_and_history(self, client):
+        sampler = dashboard.SystemSampler(size=10)
+        sampler.sample()
+        latest = sampler.sample()
+        with patch('app._system_sampler', sampler), \
+             patch.object(dashboard._scheduler, 'running', True), \
+             patch('psutil.cpu_percent') as cpu_percent:
+            data = client.get('/api/system/resources?history=60', **_local()).get_json()
+        cpu_percent.assert_not_called()
+        assert data['timestamp'] == latest['timestamp']
+        assert len(data['history']) == 2
+        assert 'history' not in latest
+
+
+# ── 23. Metric history store ─────────────────────────────────────────────────
+
+@pytest.fixture()
+def history(tmp_path):
+    store = dashboard.TimeSeriesStore(str(tmp_path / 'history.sqlite'))
+    with patch('app._history', store):
+        yield store
+
+
+class TestTimeSeriesStore:
+    """Metric history is persisted in SQLite and downsampled by tier."""
+
+    def test_raw_range_query(self, history):
+        now = int(time.time())
+        for i in range(10):
+            history.record({'block_height': 100 + i}, timestamp=now - 100 + i * 10)
+        resolution, points = history.query('block_height', now - 100, now)
+        assert resolution == 0
+        assert [p[1] for p in points] == [100.0 + i for i in range(10)]
+
+    def test_old_points_only_survive_downsampled(self, history):
+        now = int(time.time())
+        base = now - 7200 - now % 60
+        for i in range(6):
+            history.record({'cpu_percent': 10 * i}, timestamp=base + i * 10)
+        history.record({'cpu_percent': 1}, timestamp=now)  # prunes the raw tier
+        resolution, points = history.query('cpu_percent', base, base + 59)
+        assert resolution == 60
+        assert points == [[base, 25.0, 0.0, 50.0]]
+
+    def test_step_aggregates_buckets(self, history):
+        now = int(time.time())
+        start = now - 600 - now % 300
+        for i in range(60):
+            history.record({'mempool_size': i}, timestamp=start + i * 10)
+        _, points = history.query('mempool_size', start, start + 599, step=300)
+        assert [p[0] for p in points] == [start, start + 300]
+        assert points[0][1] == pytest.approx(14.5)
+
+    def test_bucket_holding_start_is_included(self, history):
+        now = int(time.time())
+        base = now - 7200 - now % 60
+        history.record({'cpu_percent': 10}, timestamp=base + 5)
+        history.record({'cpu_percent': 30}, timestamp=base + 65)
+        resolution, points = history.query('cpu_percent', base + 30, base + 119)
+        assert resolution == 60
+        assert points == [[base, 10.0, 10.0, 10.0], [base + 60, 30.0, 30.0, 30.0]]
+
+    def test_persists_across_reopen(self, tmp_path):
+        path = str(tmp_path / 'h.sqlite')
+        dashboard.TimeSeriesStore(path).record({'peer_count': 8}, timestamp=time.time())
+        _, points = dashboard.TimeSeriesStore(path).query('peer_count', time.time() - 60, time.time())
+        assert points[0][1] == 8.0
+
+    def test_history_endpoint(self, client, history):
+        history.record({'block_height': 42}, timestamp=time.time() - 5)
+        data = client.get('/api/history/block_height', **_local()).get_json()
+        assert data['metric'] == 'block_height'
+        assert data['points'][-1][1] == 42.0
+        assert client.get('/api/history/nope', **_local()).status_code == 404
+        assert client.get('/api/history/block_height?from=10&to=5', **_local()).status_code == 400
+
+    def test_default_range_uses_raw_points(self, client, history):
+        history.record({'block_height': 42}, timestamp=time.time() - 5)
+        data = client.get('/api/history/block_height', **_local()).get_json()
+        assert data['resolution'] == 0
+        assert data['step'] is None
+
+    def test_recorder_collects_node_and_system_metrics(self, history):
+        node = {'getblockchaininfo': {'blocks': 500, 'difficulty': 2.5},
+                'getmempoolinfo': {'size': 3, 'bytes': 900}}
+        with patch('app.get_node_state', return_value=node):
+            dashboard.record_history()
+        _, points = history.query('mempool_bytes', time.time() - 60, time.time())
+        assert points[0][1] == 900.0
+        _, points = history.query('hashrate', time.time() - 60, time.time())
+        assert points == []
+
+
+# ── 24. Prometheus metrics ───────────────────────────────────────────────────
+
+class TestMetrics:
+    """/metrics exposes route, node RPC, probe and cache timings."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        hist = dashboard.Histogram('test_seconds', 'test', ('op',), buckets=(0.1, 1))
+        dashboard._metrics.remove(hist)
+        for seconds in (0.05, 0.5, 5):
+            hist.observe(seconds, 'x')
+        lines = hist.render()
+        assert 'test_seconds_bucket{op="x",le="0.1"} 1' in lines
+        assert 'test_seconds_bucket{op="x",le="1"} 2' in lines
+        assert 'test_seconds_bucket{op="x",le="+Inf"} 3' in lines
+        assert 'test_seconds_count{op="x"} 3' in lines
+
+    def test_route_latency_uses_rule_not_path(self, client):
+        before = dashboard.HTTP_REQUEST_SECONDS.count('/api/history/<metric>', 'GET', 404)
+        client.get('/api/history/nope', **_local())
+        assert dashboard.HTTP_REQUEST_SECONDS.count('/api/history/<metric>', 'GET', 404) == before + 1
+
+    def test_rpc_latency_and_errors_per_method(self):
+        before = dashboard.RPC_ERRORS.value('getblockcount')
+        calls = dashboard.RPC_SECONDS.count('getblockcount')
+        with patch('app.get_rpc_credentials', return_value=('user', 'pass')), \
+             patch.object(dashboard._rpc_http, 'post', side_effect=OSError('refused')):
+            assert dashboard.palladium_rpc_call('getblockcount') is None
+        assert dashboard.RPC_ERRORS.value('getblockcount') == before + 1
+        assert dashboard.RPC_SECONDS.count('getblockcount') == calls + 1
+
+    def test_probe_outcome_is_labelled(self):
+        before = dashboard.PROBE_SECONDS.count('tcp', 'fail')
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        assert dashboard.probe_electrum_peer('127.0.0.1', port, timeout=0.5)['reachable'] is False
+        assert dashboard.PROBE_SECONDS.count('tcp', 'fail') == before + 1
+
+    def test_scrape_includes_cache_counters(self, client):
+        dashboard._peers_cache.clear()
+        with patch('app.palladium_rpc_call', return_value=_PEER_INFO):
+            dashboard.get_peers_cached()
+        r = client.get('/metrics', **_local())
+        assert r.status_code == 200
+        assert r.content_type.startswith('text/plain; version=0.0.4')
+        body = r.get_data(as_text=True)
+        assert '# TYPE dashboard_http_request_duration_seconds histogram' in body
+        assert 'dashboard_cache_requests_total{cache="palladium_peers",result="misses"} 1' in body
+        assert 'dashboard_cache_refresh_duration_seconds_count{cache="palladium_peers"}' in body
+
+    def test_external_scrape_requires_api_key(self, client):
+        assert client.get('/metrics', **_ext()).status_code in (401, 503)
+
+
+# ── 25. Sampling profiler ────────────────────────────────────────────────────
+
+class TestStackProfiler:
+    """/api/debug/profile samples every thread into collapsed stacks."""
+
+    def test_samples_background_threads(self, client):
+        stop = threading.Event()
+
+        def busy_background_worker():
+            stop.wait()
+
+        worker = threading.Thread(target=busy_background_worker, name='probe-worker', daemon=True)
+        worker.start()
+        try:
+            r = client.get('/api/debug/profile?seconds=0.2&hz=50', **_local())
+        finally:
+            stop.set()
+        assert r.status_code == 200
+        assert int(r.headers['X-Profile-Samples']) >= 5
+        lines = r.get_data(as_text=True).strip().split('\n')
+        stack, count = lines[0].rsplit(' ', 1)
+        assert int(count) >= 1
+        assert any(line.startswith('probe-worker;') and 'busy_background_worker' in line for line in lines)
+
+    def test_rejects_bad_parameters(self, client):
+        assert client.get('/api/debug/profile?seconds=0', **_local()).status_code == 400
+        assert client.get('/api/debug/profile?seconds=1&hz=0', **_local()).status_code == 400
+        seconds = dashboard.PROFILE_MAX_SECONDS + 1
+        assert client.get(f'/api/debug/profile?seconds={seconds}', **_local()).status_code == 400
+
+    def test_only_one_profile_at_a_time(self, client):
+        with dashboard._profiler._lock:
+            r = client.get('/api/debug/profile?seconds=0.1', **_local())
+        assert r.status_code == 409
+
+
+# ── 26. Conditional GET ──────────────────────────────────────────────────────
+
+class TestConditionalGet:
+    """Snapshot-backed responses carry an ETag and answer If-None-Match with 304."""
+
+    _PEERS = dashboard.freeze([{'addr': '1.2.3.4:2333', 'inbound': True, 'subver': '/Palladium:1.0/'}])
+
+    def test_unchanged_snapshot_returns_304(self, client):
+        with patch('app.get_peers_cached', return_value=self._PEERS):
+            first = client.get('/api/palladium/peers', **_local())
+            etag = first.headers['ETag']
+            second = client.get('/api/palladium/peers', headers={'If-None-Match': etag},
+                                environ_base={'REMOTE_ADDR': TRUSTED_IP})
+        assert first.status_code == 200 and first.data
+        assert second.status_code == 304
+        assert second.data == b''
+        assert second.headers['ETag'] == etag
+        assert 'no-store' in second.headers['Cache-Control']
+
+    def test_new_snapshot_gets_new_etag(self, client):
+        with patch('app.get_peers_cached', return_value=self._PEERS):
+            etag = client.get('/api/palladium/peers', **_local()).headers['ETag']
+        changed = dashboard.freeze([{'addr': '5.6.7.8:2333', 'inbound': False, 'subver': '/Palladium:1.0/'}])
+        with patch('app.get_peers_cached', return_value=changed):
+            r = client.get('/api/palladium/peers', headers={'If-None-Match': etag},
+                           environ_base={'REMOTE_ADDR': TRUSTED_IP})
+        assert r.status_code == 200
+        assert r.headers['ETag'] != etag
+        assert r.get_json()['peers'][0]['addr'] == '5.6.7.8:2333'
+
+
+# ── 27. Aggregated dashboard endpoint ────────────────────────────────────────
+
+class TestDashboardSnapshot:
+    """/api/dashboard returns every card in one response, with field selection."""
+
+    @patch('app.get_electrumx_container_info', return_value={'running': True})
+    @patch('app.get_electrumx_stats_cached', return_value=_ELECTRUMX_STATS)
+    @patch('app.palladium_rpc_batch', side_effect=_rpc_batch)
+    @patch('app.palladium_rpc_call', side_effect=_rpc)
+    def test_all_cards_by_default(self, _rpc_mock, _batch_mock, _stats_mock, _container_mock, client):
+        r = client.get('/api/dashboard', **_local())
+        assert r.status_code == 200
+        data = r.get_json()
+        assert set(data) == set(dashboard.DASHBOARD_SECTIONS) | {'timestamp'}
+        assert data['node']['blockchain']['blocks'] == _BLOCKCHAIN_INFO['blocks']
+        assert data['electrumx']['stats']['status'] == 'running'
+        assert 'percent' in data['system']['cpu']
+        assert isinstance(data['blocks']['blocks'], list)
+        assert 'no-store' in r.headers['Cache-Control']
+
+    def test_health_section_makes_no_live_checks(self, client):
+        with patch('app.palladium_rpc_call', side_effect=AssertionError('live node call')), \
+             patch('app.get_electrumx_stats_cached') as stats, \
+             patch.dict(dashboard._node_state['tip'], timestamp=time.time()):
+            data = client.get('/api/dashboard?fields=health', **_local()).get_json()
+        assert data['health']['services']['palladium'] == 'up'
+        assert all(not call.kwargs.get('force_refresh') for call in stats.call_args_list)
+
+    def test_fields_selects_sections(self, client):
+        with patch('app.build_system_resources', return_value={'cpu': {'percent': 1.0}}) as system, \
+             patch('app.build_health') as health:
+            with patch.dict(dashboard.STREAM_TOPICS, system=system, health=health):
+                data = client.get('/api/dashboard?fields=system', **_local()).get_json()
+        assert set(data) == {'system', 'timestamp'}
+        health.assert_not_called()
+
+    def test_failing_section_does_not_fail_response(self, client):
+        def broken():
+            raise RuntimeError('node down')
+
+        with patch.dict(dashboard.STREAM_TOPICS, node=broken, blocks=lambda: None):
+            r = client.get('/api/dashboard?fields=node,blocks', **_local())
+        assert r.status_code == 200
+        assert r.get_json()['node'] == {'error': 'node down'}
+        assert 'error' in r.get_json()['blocks']
+
+    def test_unknown_field_rejected(self, client):
+        assert client.get('/api/dashboard?fields=node,bogus', **_local()).status_code == 400
+
+    @patch('app.palladium_rpc_batch', side_effect=_rpc_batch)
+    def test_combined_etag_revalidates(self, _batch_mock, client):
+        with patch.dict(dashboard.STREAM_TOPICS, health=lambda: {'status': 'healthy'}):
+            first = client.get('/api/dashboard?fields=health,node', **_local())
+            etag = first.headers['ETag']
+            again = client.get('/api/dashboard?fields=health,node', **_local(),
+                               headers={'If-None-Match': etag})
+            assert again.status_code == 304
+            assert again.headers['ETag'] == etag
+            assert client.get('/api/dashboard?fields=node', **_local(),
+                              headers={'If-None-Match': etag}).status_code == 200
+
+            dashboard.invalidate_node_state('tip')  # a new block
+            with patch.dict(_RPC_DISPATCH, getblockchaininfo={**_BLOCKCHAIN_INFO, 'blocks': 100_001}):
+                changed = client.get('/api/dashboard?fields=health,node', **_local(),
+                                     headers={'If-None-Match': etag})
+        assert changed.status_code == 200
+        assert changed.headers['ETag'] != etag
+
+
+# ── 28. Liveness and readiness probes ────────────────────────────────────────
+
+@pytest.fixture()
+def cold_backends():
+    """Fail loudly if a probe reaches the node, ElectrumX or Docker."""
+    dashboard._electrumx_stats_cache.clear()
+    boom = RuntimeError('probe must not call backends')
+    with patch('app.palladium_rpc_call', side_effect=boom), \
+         patch('app.palladium_rpc_batch', side_effect=boom), \
+         patch('app.get_electrumx_stats', side_effect=boom), \
+         patch.dict(dashboard._node_state['tip'], timestamp=0.0):
+        yield
+    dashboard._electrumx_stats_cache.clear()
+
+
+class TestHealthProbes:
+    """/api/health/live and /api/health/ready answer from in-process state only."""
+
+    def test_live(self, client, cold_backends):
+        r = client.get('/api/health/live', **_local())
+        assert r.status_code == 200
+        assert r.get_json()['status'] == 'alive'
+
+    def test_not_ready_before_first_refresh(self, client, cold_backends):
+        r = client.get('/api/health/ready', **_local())
+        assert r.status_code == 503
+        data = r.get_json()
+        assert data['status'] == 'not_ready'
+        assert data['checks']['palladium'] == {
+            'ok': False, 'age': None, 'max_age': dashboard.NODE_TIP_TTL + dashboard.HEALTH_READY_GRACE}
+
+    def test_ready_from_background_state(self, client, cold_backends):
+        dashboard._node_state['tip']['timestamp'] = time.time() - 3
+        with patch('app.get_electrumx_stats', return_value=_ELECTRUMX_STATS):
+            dashboard._electrumx_stats_cache.refresh()
+        r = client.get('/api/health/ready', **_local())
+        assert r.status_code == 200
+        checks = r.get_json()['checks']
+        assert checks['palladium']['ok'] and 2 <= checks['palladium']['age'] < 10
+        assert checks['electrumx']['ok'] and checks['electrumx']['age'] < 1
+
+    def test_failed_refresh_keeps_age_and_fails_check(self, client, cold_backends):
+        dashboard._node_state['tip']['timestamp'] = time.time()
+        with patch('app.get_electrumx_stats', return_value=_ELECTRUMX_STATS):
+            dashboard._electrumx_stats_cache.refresh()
+        with patch('app.get_electrumx_stats', return_value=None):
+            dashboard._electrumx_stats_cache.refresh()
+        r = client.get('/api/health/ready', **_local())
+        assert r.status_code == 503
+        assert r.get_json()['checks']['electrumx']['ok'] is False
+        assert r.get_json()['checks']['electrumx']['age'] is not None
+
+    def test_node_down_after_good_refresh_fails_check(self, client, cold_backends):
+        with patch('app.palladium_rpc_batch', side_effect=_rpc_batch):
+            assert dashboard.refresh_node_state('tip')
+        assert dashboard.build_readiness()['checks']['palladium']['ok']
+        with patch('app.palladium_rpc_batch', return_value=None), \
+             patch('app.is_zmq_feed_live', return_value=True):
+            assert not dashboard.refresh_node_state('tip')
+            r = client.get('/api/health/ready', **_local())
+            summary = dashboard.build_health_summary()
+        assert r.status_code == 503
+        check = r.get_json()['checks']['palladium']
+        assert check['ok'] is False and check['age'] is not None
+        assert check['max_age'] == dashboard.NODE_TIP_TTL + dashboard.HEALTH_READY_GRACE
+        assert summary['services']['palladium'] == 'down'
+
+
+# ── 29. Combined Electrum peer probe ─────────────────────────────────────────
+
+_GENESIS = 'ab' * 32
+
+
+class _FakeElectrumPeerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.connections += 1
+        for line in self.rfile:
+            request = json.loads(line)
+            result = self.server.responses.get(request['method'])
+            reply = {'jsonrpc': '2.0', 'id': request['id']}
+            if result is None:
+                reply['error'] = {'code': -32601, 'message': 'unknown method'}
+            else:
+                reply['result'] = result
+            self.wfile.write((json.dumps(reply) + '\n').encode())
+
+
+@pytest.fixture()
+def electrum_peer():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _FakeElectrumPeerHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.responses = {
+        'server.version': ['ElectrumX 1.16.0', '1.4'],
+        'server.features': {'server_version': 'ElectrumX 1.16.0', 'protocol_min': '1.4',
+                            'protocol_max': '1.4.2', 'genesis_hash': _GENESIS},
+    }
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestElectrumPeerProbe:
+    """Version and features are pipelined over a single connection per transport."""
+
+    def test_one_connection_returns_everything(self, electrum_peer):
+        result = dashboard.probe_electrum_peer('127.0.0.1', electrum_peer.server_address[1], timeout=1)
+        assert electrum_peer.connections == 1
+        assert result['reachable'] is True
+        assert result['server_version'] == 'ElectrumX 1.16.0'
+        assert result['protocol'] == '1.4'
+        assert (result['protocol_min'], result['protocol_max']) == ('1.4', '1.4.2')
+        assert result['genesis_hash'] == _GENESIS
+        assert result['rtt_ms'] is not None and result['rtt_ms'] >= 0
+
+    def test_features_error_still_reachable(self, electrum_peer):
+        del electrum_peer.responses['server.features']
+        result = dashboard.probe_electrum_peer('127.0.0.1', electrum_peer.server_address[1], timeout=1)
+        assert result['reachable'] is True
+        assert result['genesis_hash'] is None
+
+    def test_unreachable_peer(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        result = dashboard.probe_electrum_peer('127.0.0.1', port, timeout=0.5)
+        assert result['reachable'] is False
+        assert result['rtt_ms'] is None
+
+
+# ── 30. Persistent peer probe state ──────────────────────────────────────────
+
+_UP = {'reachable': True, 'rtt_ms': 12.5, 'server_version': 'ElectrumX 1.16.0'}
+_DOWN = {'reachable': False, 'rtt_ms': None}
+
+
+@pytest.fixture()
+def peer_store(tmp_path):
+    return dashboard.PeerProbeStore(str(tmp_path / 'peers.sqlite'), min_interval=100,
+                                    stable_max=800, dead_max=1600)
+
+
+class TestPeerProbeStore:
+    """Peer probe outcomes persist and drive adaptive re-probe intervals."""
+
+    KEY = ('tcp', '10.0.0.1', 50001)
+
+    def test_stable_peer_backs_off_to_cap(self, peer_store):
+        intervals = []
+        for now in (0, 1000, 2000, 3000, 4000, 5000):
+            peer_store.record(self.KEY, _UP, now=now)
+            intervals.append(peer_store.get(self.KEY)['next_probe_at'] - now)
+        assert intervals == [100, 200, 400, 800, 800, 800]
+
+    def test_state_change_resets_interval(self, peer_store):
+        for now in (0, 1000, 2000):
+            peer_store.record(self.KEY, _UP, now=now)
+        peer_store.record(self.KEY, _DOWN, now=3000)
+        state = peer_store.get(self.KEY)
+        assert state['next_probe_at'] == 3100
+        assert (state['failures'], state['successes']) == (1, 0)
+        assert state['last_success'] == 2000 and state['last_failure'] == 3000
+        assert state['rtt_ms'] == 12.5
+        for now in (4000, 5000, 6000, 7000, 8000):
+            peer_store.record(self.KEY, _DOWN, now=now)
+        assert peer_store.get(self.KEY)['next_probe_at'] - 8000 == 1600
+
+    def test_cached_result_until_due(self, peer_store):
+        peer_store.record(self.KEY, _UP, now=0)
+        assert peer_store.cached_result(self.KEY, now=50) == _UP
+        assert peer_store.cached_result(self.KEY, now=100) is None
+        assert peer_store.cached_result(('ssl', '10.0.0.1', 50002), now=0) is None
+
+    def test_state_survives_reopen(self, tmp_path, peer_store):
+        now = time.time()
+        peer_store.record(self.KEY, _UP, now=now)
+        reopened = dashboard.PeerProbeStore(peer_store.path, min_interval=100)
+        state = reopened.get(self.KEY)
+        assert state['last_success'] == now
+        assert state['result'] == _UP
+        assert reopened.cached_result(self.KEY, now=now + 1) == _UP
+
+    def test_retention_drops_forgotten_peers(self, peer_store):
+        peer_store.record(self.KEY, _DOWN, now=time.time() - 10)
+        peer_store.record(('tcp', '10.0.0.2', 50001), _DOWN, now=time.time() - 400)
+        reopened = dashboard.PeerProbeStore(peer_store.path, retention=300)
+        assert reopened.stats()['tracked'] == 1
+
+    def test_prune_drops_forgotten_peers_while_running(self, peer_store):
+        peer_store.retention = 300
+        peer_store.record(self.KEY, _DOWN, now=1000)
+        peer_store.record(('tcp', '10.0.0.2', 50001), _UP, now=1250)
+        assert peer_store.prune(now=1200) == 0
+        assert peer_store.prune(now=1400) == 1
+        assert peer_store.get(self.KEY) is None
+        assert peer_store.stats()['tracked'] == 1
+        reopened = dashboard.PeerProbeStore(peer_store.path, retention=1e12)
+        assert reopened.stats()['tracked'] == 1  # the row is gone from the table too
+
+    def test_probe_records_outcome(self, peer_store, electrum_peer):
+        port = electrum_peer.server_address[1]
+        result = peer_store.probe('tcp', '127.0.0.1', port, timeout=1)
+        assert result['reachable'] is True
+        state = peer_store.get(('tcp', '127.0.0.1', port))
+        assert state['successes'] == 1 and state['result']['genesis_hash'] == _GENESIS
+
+    def test_sweep_uses_stored_result(self):
+        sweep = dashboard.ProbeSweep(deadline=1)
+        key = sweep.put(self.KEY, _UP)
+        sweep.submit(self.KEY, pytest.fail, 'must not probe a key with a known result')
+        assert sweep.result(key) == _UP
+
+
+# ── 31. TLS session resumption for SSL probes ────────────────────────────────
+
+@pytest.fixture()
+def tls_electrum_peer(tmp_path, electrum_peer):
+    """The fake Electrum peer behind a TLS listener with a throwaway self-signed cert."""
+    if not shutil.which('openssl'):
+        pytest.skip('openssl CLI not available to create a test certificate')
+    cert, key = tmp_path / 'cert.pem', tmp_path / 'key.pem'
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                    '-subj', '/CN=localhost', '-keyout', str(key), '-out', str(cert)],
+                   check=True, capture_output=True)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(str(cert), str(key))
+    original_get_request = electrum_peer.get_request
+
+    def get_request():
+        sock, addr = original_get_request()
+        return context.wrap_socket(sock, server_side=True), addr
+
+    electrum_peer.get_request = get_request
+    dashboard._tls_sessions.clear()
+    yield electrum_peer
+    dashboard._tls_sessions.clear()
+
+
+class TestTlsSessionResumption:
+    """SSL probes share one context and resume the peer's TLS session."""
+
+    def test_second_probe_resumes_session(self, tls_electrum_peer):
+        port = tls_electrum_peer.server_address[1]
+        full = dashboard.TLS_HANDSHAKE_SECONDS.count('false')
+        resumed = dashboard.TLS_HANDSHAKE_SECONDS.count('true')
+        first = dashboard.probe_electrum_peer('127.0.0.1', port, use_ssl=True, timeout=2)
+        second = dashboard.probe_electrum_peer('127.0.0.1', port, use_ssl=True, timeout=2)
+        assert first['reachable'] and second['reachable']
+        assert second['genesis_hash'] == _GENESIS
+        assert dashboard.TLS_HANDSHAKE_SECONDS.count('false') == full + 1
+        assert dashboard.TLS_HANDSHAKE_SECONDS.count('true') == resumed + 1
+        assert ('127.0.0.1', port) in dashboard._tls_sessions
+
+    def test_context_is_shared(self, tls_electrum_peer):
+        port = tls_electrum_peer.server_address[1]
+        with patch('ssl.create_default_context') as create:
+            assert dashboard.probe_electrum_peer('127.0.0.1', port, use_ssl=True, timeout=2)['reachable']
+        create.assert_not_called()
+
+
+# ── 32. Framed Electrum stream ───────────────────────────────────────────────
+
+
+def _send_in_pieces(sock, data, size):
+    def run():
+        for offset in range(0, len(data), size):
+            sock.sendall(data[offset:offset + size])
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+class TestElectrumStream:
+    """Newline-framed reads handle large, split and pipelined messages."""
+
+    def test_large_message_across_many_chunks(self):
+        left, right = socket.socketpair()
+        peers = [[f'10.0.{i // 256}.{i % 256}', f'peer{i}.example', ['v1.4', 's50002', 't50001']]
+                 for i in range(20000)]
+        payload = json.dumps({'id': 1, 'result': peers}).encode() + b'\n'
+        assert len(payload) > 1_000_000
+        _send_in_pieces(right, payload, 1000)
+        with ElectrumStream(left, timeout=5) as stream:
+            assert stream.read_message()['result'] == peers
+        right.close()
+
+    def test_pipelined_messages_in_one_chunk(self):
+        left, right = socket.socketpair()
+        right.sendall(b'{"id": 1, "result": "a"}\n\n{"id": 2, "result": "b"}\n{"id": 3')
+        stream = ElectrumStream(left, timeout=1)
+        assert stream.read_message() == {'id': 1, 'result': 'a'}
+        assert stream.read_message() == {'id': 2, 'result': 'b'}
+        right.sendall(b', "result": "c"}\n')
+        assert stream.read_message() == {'id': 3, 'result': 'c'}
+        stream.close()
+        right.close()
+
+    def test_request_skips_notifications(self):
+        left, right = socket.socketpair()
+        stream = ElectrumStream(left, timeout=1)
+        right.sendall(b'{"method": "blockchain.headers.subscribe", "params": []}\n{"id": 1, "result": 7}\n')
+        assert stream.request('server.ping') == {'id': 1, 'result': 7}
+        assert json.loads(right.recv(4096))['method'] == 'server.ping'
+        stream.close()
+        right.close()
+
+    def test_limits(self):
+        left, right = socket.socketpair()
+        stream = ElectrumStream(left, timeout=0.2, max_line=100)
+        right.sendall(b'{"id": 1')
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            stream.read_line()
+        assert time.monotonic() - started < 1
+        right.sendall(b'x' * 200)
+        with pytest.raises(LineTooLong):
+            stream.read_line()
+        right.close()
+        with pytest.raises(ConnectionError):
+            ElectrumStream(left, timeout=1).read_line()
+        stream.close()
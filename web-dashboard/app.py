@@ -3,22 +3,39 @@
 Web Dashboard API for Palladium Node and ElectrumX Server Statistics
 """
 
-from flask import Flask, jsonify, render_template, request, session
+from flask import Flask, Response, g, jsonify, render_template, request, session, stream_with_context
 from flask_cors import CORS
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import os
+import http.client
 import time
-import copy
+import heapq
+import itertools
+import random
 import threading
 import ssl
+import sys
 import ipaddress
 import base64
+import hashlib
 import hmac
 import secrets
+import sqlite3
 from datetime import datetime, timedelta
 import psutil
 import socket
+from collections import OrderedDict, deque
+from types import MappingProxyType
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from electrum_stream import ElectrumStream, LineTooLong
+
+try:
+    import zmq
+except ImportError:  # optional: without pyzmq node data falls back to TTL polling
+    zmq = None
 
 app = Flask(__name__)
 CORS(app)
@@ -31,6 +48,173 @@ app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 _cookie_secure_raw = os.getenv('DASHBOARD_SESSION_COOKIE_SECURE', 'false').strip().lower()
 app.config['SESSION_COOKIE_SECURE'] = _cookie_secure_raw in ('1', 'true', 'yes')
 
+# ── Metrics (Prometheus text exposition, see /metrics) ──────────────────────
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+class Counter:
+    """Monotonic counter with labels; each series is a one-element list updated in place."""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def inc(self, *labels, amount=1):
+        series = self._series.get(labels)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(labels, [0])
+        with self._lock:
+            series[0] += amount
+
+    def value(self, *labels):
+        series = self._series.get(labels)
+        return series[0] if series else 0
+
+    def render(self):
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {series[0]}"
+                for labels, series in list(self._series.items())]
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram with labels (Prometheus semantics)."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def observe(self, seconds, *labels):
+        series = self._series.get(labels)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(labels, [0] * (len(self.buckets) + 2))
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                index = i
+                break
+        with self._lock:
+            series[index] += 1
+            series[-1] += seconds
+
+    def count(self, *labels):
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def render(self):
+        lines = []
+        for labels, series in list(self._series.items()):
+            with self._lock:
+                counts, total = list(series[:-1]), series[-1]
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket"
+                             f"{_format_labels(self.labelnames, labels, (('le', bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {round(total, 6)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class timed:
+    """Context manager observing the elapsed time of its block into a histogram."""
+
+    __slots__ = ('histogram', 'labels', 'started')
+
+    def __init__(self, histogram, *labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+        return False
+
+
+_metrics = []
+# Callables returning (name, type, help, [(labels dict, value)]) for values
+# that already live elsewhere (cache counters, pool stats) and are read at scrape time
+_metric_collectors = []
+
+HTTP_REQUEST_SECONDS = Histogram(
+    'dashboard_http_request_duration_seconds', 'Flask request latency by route', ('route', 'method', 'status'))
+RPC_SECONDS = Histogram(
+    'dashboard_rpc_duration_seconds', 'palladiumd JSON-RPC latency by method', ('method',))
+RPC_ERRORS = Counter(
+    'dashboard_rpc_errors_total', 'palladiumd JSON-RPC failures by method', ('method',))
+PROBE_SECONDS = Histogram(
+    'dashboard_probe_duration_seconds', 'Electrum server probe latency', ('kind', 'result'))
+TLS_HANDSHAKE_SECONDS = Histogram(
+    'dashboard_probe_tls_handshake_seconds', 'TLS handshake time of Electrum SSL probes', ('resumed',))
+CACHE_REFRESH_SECONDS = Histogram(
+    'dashboard_cache_refresh_duration_seconds', 'Cache loader duration', ('cache',))
+DOCKER_SECONDS = Histogram(
+    'dashboard_docker_call_duration_seconds', 'Docker Engine API call latency', ('call',))
+ELECTRUMX_ADMIN_SECONDS = Histogram(
+    'dashboard_electrumx_admin_duration_seconds', 'ElectrumX admin RPC latency by method', ('method',))
+JOB_SECONDS = Histogram(
+    'dashboard_job_duration_seconds', 'Scheduled refresh job duration', ('job',))
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def observe_request_latency(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, route, request.method, response.status_code)
+    return response
+
+
+def render_metrics():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in _metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    for collect in _metric_collectors:
+        try:
+            for name, kind, documentation, samples in collect():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    if value is not None:
+                        lines.append(f"{name}{_format_labels(labels.keys(), labels.values())} {value}")
+        except Exception as e:
+            print(f"Metrics collector error: {e}")
+    return '\n'.join(lines) + '\n'
+
+
 TRUSTED_CLIENT_NETWORKS = (
     ipaddress.ip_network('127.0.0.0/8'),
     ipaddress.ip_network('10.0.0.0/8'),
@@ -92,14 +276,14 @@ def enforce_external_auth():
     """
     Localhost and LAN clients can access directly.
     External clients:
-    - For API routes: must authenticate via API key.
+    - For API routes and /metrics: must authenticate via API key.
     - For dashboard routes: must authenticate via Basic Auth.
     """
     client_ip = request.remote_addr or ''
     if is_trusted_client_ip(client_ip):
         return None
 
-    if request.path.startswith('/api/'):
+    if request.path.startswith('/api/') or request.path == '/metrics':
         if not os.getenv('API_KEY', '').strip():
             return jsonify({'error': 'API key is not configured'}), 503
         if has_valid_api_key():
@@ -136,7 +320,11 @@ def enforce_external_auth():
 
 @app.after_request
 def disable_api_cache(response):
-    """Prevent stale API payloads from browser/proxy caches."""
+    """
+    Prevent stale API payloads from browser/proxy caches. Snapshot-backed
+    responses still carry an ETag, so clients that keep the last body can
+    revalidate with If-None-Match and get a 304.
+    """
     if request.path.startswith('/api/'):
         response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
         response.headers['Pragma'] = 'no-cache'
@@ -146,97 +334,1034 @@ def disable_api_cache(response):
 # Configuration
 PALLADIUM_RPC_HOST = os.getenv('PALLADIUM_RPC_HOST', 'palladiumd')
 PALLADIUM_RPC_PORT = int(os.getenv('PALLADIUM_RPC_PORT', '2332'))
+PALLADIUM_RPC_POOL_SIZE = int(os.getenv('PALLADIUM_RPC_POOL_SIZE', '4'))
+PALLADIUM_RPC_CONNECT_TIMEOUT = float(os.getenv('PALLADIUM_RPC_CONNECT_TIMEOUT', '3'))
+PALLADIUM_RPC_READ_TIMEOUT = float(os.getenv('PALLADIUM_RPC_READ_TIMEOUT', '10'))
+PALLADIUM_CONF_PATH = os.getenv('PALLADIUM_CONF_PATH', '/palladium-config/palladium.conf')
+PALLADIUM_CONF_CHECK_INTERVAL = float(os.getenv('PALLADIUM_CONF_CHECK_INTERVAL', '1'))
 ELECTRUMX_RPC_HOST = os.getenv('ELECTRUMX_RPC_HOST', 'electrumx')
 ELECTRUMX_RPC_PORT = int(os.getenv('ELECTRUMX_RPC_PORT', '8000'))
+ELECTRUMX_ADMIN_TIMEOUT = float(os.getenv('ELECTRUMX_ADMIN_TIMEOUT', '5'))
 ELECTRUMX_STATS_TTL = int(os.getenv('ELECTRUMX_STATS_TTL', '60'))
 ELECTRUMX_SERVERS_TTL = int(os.getenv('ELECTRUMX_SERVERS_TTL', '120'))
 ELECTRUMX_EMPTY_SERVERS_TTL = int(os.getenv('ELECTRUMX_EMPTY_SERVERS_TTL', '15'))
 PALLADIUM_PEERS_TTL = int(os.getenv('PALLADIUM_PEERS_TTL', '30'))
+ELECTRUM_PROBE_CONCURRENCY = int(os.getenv('ELECTRUM_PROBE_CONCURRENCY', '32'))
+ELECTRUM_PROBE_TIMEOUT = float(os.getenv('ELECTRUM_PROBE_TIMEOUT', '2.0'))
+ELECTRUM_PROBE_DEADLINE = float(os.getenv('ELECTRUM_PROBE_DEADLINE', '10'))
+# Per-peer probe state: re-probe intervals double with every repeated
+# outcome (up to the stable/dead caps) and reset when a peer changes state
+PEER_PROBE_DB_PATH = os.getenv('PEER_PROBE_DB_PATH', '') or ':memory:'
+PEER_PROBE_MIN_INTERVAL = float(os.getenv('PEER_PROBE_MIN_INTERVAL', '120'))
+PEER_PROBE_STABLE_MAX = float(os.getenv('PEER_PROBE_STABLE_MAX', '3600'))
+PEER_PROBE_DEAD_MAX = float(os.getenv('PEER_PROBE_DEAD_MAX', '86400'))
+PEER_PROBE_RETENTION = float(os.getenv('PEER_PROBE_RETENTION', str(30 * 86400)))
+PEER_PROBE_PRUNE_INTERVAL = float(os.getenv('PEER_PROBE_PRUNE_INTERVAL', '3600'))
+RECENT_BLOCKS_DEFAULT = 10
+RECENT_BLOCKS_MAX = int(os.getenv('RECENT_BLOCKS_MAX', '500'))
+BLOCK_CACHE_SIZE = max(int(os.getenv('BLOCK_CACHE_SIZE', '1000')), RECENT_BLOCKS_MAX)
+NODE_TIP_TTL = int(os.getenv('NODE_TIP_TTL', '10'))
+NODE_TIP_MAX_AGE = int(os.getenv('NODE_TIP_MAX_AGE', '300'))
+NODE_NETWORK_TTL = int(os.getenv('NODE_NETWORK_TTL', '30'))
+# Extra age past its refresh interval before background state counts as stale for /api/health/ready
+HEALTH_READY_GRACE = int(os.getenv('HEALTH_READY_GRACE', '60'))
+ZMQ_SILENCE_TIMEOUT = int(os.getenv('ZMQ_SILENCE_TIMEOUT', '600'))
+STREAM_INTERVAL = float(os.getenv('STREAM_INTERVAL', '2'))
+STREAM_KEEPALIVE = float(os.getenv('STREAM_KEEPALIVE', '15'))
+DOCKER_SOCKET = os.getenv('DOCKER_SOCKET', '/var/run/docker.sock')
+DOCKER_TIMEOUT = float(os.getenv('DOCKER_TIMEOUT', '5'))
+ELECTRUMX_CONTAINER = os.getenv('ELECTRUMX_CONTAINER', 'plm-electrumx')
+DOCKER_INSPECT_TTL = int(os.getenv('DOCKER_INSPECT_TTL', '30'))
+DOCKER_SESSIONS_TTL = int(os.getenv('DOCKER_SESSIONS_TTL', '10'))
+DOCKER_DB_SIZE_TTL = int(os.getenv('DOCKER_DB_SIZE_TTL', '300'))
+ELECTRUMX_DATA_DIR = os.getenv('ELECTRUMX_DATA_DIR', '/electrumx-data')
+DB_SIZE_INTERVAL = float(os.getenv('DB_SIZE_INTERVAL', '300'))
+DB_SIZE_GROWTH_WINDOW = float(os.getenv('DB_SIZE_GROWTH_WINDOW', '3600'))
+SERVER_IDENTITY_REFRESH = float(os.getenv('SERVER_IDENTITY_REFRESH', '21600'))
+CACHE_FAILURE_TTL = float(os.getenv('CACHE_FAILURE_TTL', '5'))
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '64'))
+SCHEDULER_WORKERS = int(os.getenv('SCHEDULER_WORKERS', '4'))
+SCHEDULER_JITTER = float(os.getenv('SCHEDULER_JITTER', '0.1'))
+SCHEDULER_MAX_BACKOFF = float(os.getenv('SCHEDULER_MAX_BACKOFF', '600'))
+SYSTEM_SAMPLE_INTERVAL = float(os.getenv('SYSTEM_SAMPLE_INTERVAL', '5'))
+SYSTEM_HISTORY_SIZE = int(os.getenv('SYSTEM_HISTORY_SIZE', '720'))
+HISTORY_DB_PATH = os.getenv('HISTORY_DB_PATH', '') or ':memory:'
+HISTORY_INTERVAL = float(os.getenv('HISTORY_INTERVAL', '30'))
+PROFILE_DEFAULT_HZ = int(os.getenv('PROFILE_DEFAULT_HZ', '100'))
+PROFILE_MAX_SECONDS = int(os.getenv('PROFILE_MAX_SECONDS', '60'))
+
+# Block summaries are immutable once mined, so they are cached by hash (LRU).
+# The height index tracks which hash is on the best chain at each height and
+# is used to evict blocks that a reorg has replaced.
+_block_cache = OrderedDict()
+_block_hash_by_height = {}
+_block_cache_lock = threading.Lock()
+
+# Node data grouped by what invalidates it. `tip` and `mempool` are dropped
+# by ZMQ block/tx notifications; `network` only ages out.
+NODE_STATE_SECTIONS = {
+    'tip': ('getblockchaininfo', 'getmininginfo'),
+    'mempool': ('getmempoolinfo',),
+    'network': ('getnetworkinfo', 'getpeerinfo'),
+}
+_node_state = {
+    name: {'timestamp': 0.0, 'invalidated': True, 'failed': False, 'data': {}}
+    for name in NODE_STATE_SECTIONS
+}
+_node_state_lock = threading.Lock()
+_zmq_state = {'running': False, 'last_message': 0.0}
+
+
+def freeze(value):
+    """Read-only copy of a JSON-like structure (dicts become mapping proxies, lists tuples)."""
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# Snapshot versions are unique per process; the boot id keeps ETags from
+# colliding across restarts.
+_snapshot_versions = itertools.count(1)
+_SNAPSHOT_BOOT_ID = secrets.token_hex(4)
+
+
+class Snapshot:
+    """
+    Immutable API payload together with its JSON encoding.
 
-# In-memory caches for fast card stats and heavier server probing stats
-_electrumx_stats_cache = {'timestamp': 0.0, 'stats': None}
-_electrumx_servers_cache = {'timestamp': 0.0, 'stats': None}
-_palladium_peers_cache = {'timestamp': 0.0, 'data': None}
+    Built once per underlying data change and shared by every request, so a
+    cache hit costs neither a copy nor a re-serialization. Each snapshot gets
+    a new version, which is its strong ETag: a client that already holds
+    that version gets an empty 304 instead of the body.
+    """
 
+    __slots__ = ('data', 'body', 'created_at', 'etag')
 
-def _refresh_peers_async():
-    """Refresh peers cache in background — never blocks callers."""
-    def _worker():
-        try:
-            peer_info = palladium_rpc_call('getpeerinfo')
-            if peer_info is not None:
-                _palladium_peers_cache['data'] = peer_info
-                _palladium_peers_cache['timestamp'] = time.time()
-        except Exception as e:
-            print(f"Peers background refresh error: {e}")
-    threading.Thread(target=_worker, daemon=True).start()
+    def __init__(self, data, created_at=None):
+        self.created_at = time.time() if created_at is None else created_at
+        self.body = json.dumps(data, separators=(',', ':'), default=_json_default).encode()
+        self.data = freeze(data)
+        self.etag = f"{_SNAPSHOT_BOOT_ID}-{next(_snapshot_versions)}"
 
+    def response(self):
+        return conditional_json_response(self.body, self.etag)
 
-def get_peers_cached():
-    """Return cached peer list; never blocks after first load.
 
-    If cache is valid: return immediately (<1ms).
-    If stale: return old data now + kick off background refresh.
-    If empty (first call): block once to populate cache.
+def conditional_json_response(body, etag):
+    """JSON `body` tagged with `etag`, or an empty 304 if the client already holds it."""
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
+
+# payload name -> (source objects, Snapshot)
+_payload_snapshots = {}
+
+
+def derived_snapshot(name, sources, build):
     """
-    cache = _palladium_peers_cache
-    now = time.time()
-    cached = cache.get('data')
-    cache_age = now - cache.get('timestamp', 0.0)
+    Return the Snapshot of `build(timestamp)`, rebuilt only when one of the
+    `sources` is no longer the same object as last time. Cached data is
+    replaced rather than mutated, so identity is a cheap change check; the
+    payload timestamp is the time the snapshot was built.
+    """
+    entry = _payload_snapshots.get(name)
+    if entry is not None and len(entry[0]) == len(sources) and all(
+            old is new for old, new in zip(entry[0], sources)):
+        return entry[1]
+    created_at = time.time()
+    snapshot = Snapshot(build(datetime.fromtimestamp(created_at).isoformat()), created_at)
+    _payload_snapshots[name] = (tuple(sources), snapshot)
+    return snapshot
 
-    if cached is not None and cache_age < PALLADIUM_PEERS_TTL:
-        return copy.deepcopy(cached)
 
-    # Stale: return old data immediately, refresh in background
-    _refresh_peers_async()
-    if cached is not None:
-        return copy.deepcopy(cached)
+class SWRCache:
+    """
+    Stale-while-revalidate cache shared by every slow data source.
+
+    - A fresh entry is returned as is.
+    - A stale entry is returned immediately while one background refresh
+      runs for that key.
+    - A missing entry is loaded inline. Concurrent callers for the same key
+      wait for that single load instead of starting their own
+      (single-flight).
+
+    `loader(key)` returns the new value or None on failure. A failure keeps
+    the previous value, and the key is retried after `negative_ttl`. Values
+    for which `is_negative(value)` is true (e.g. an empty result) also use
+    `negative_ttl`. The least recently used keys are dropped beyond
+    `max_entries`. Values are frozen, so every caller shares the same
+    read-only object.
+
+    Once a running RefreshScheduler owns the cache (see schedule_cache),
+    reads never start a refresh: stale values, and misses left by a failed
+    load, are served until the scheduled job replaces them.
+    """
 
-    # No data yet: block once so the first response is still meaningful
-    fresh = palladium_rpc_call('getpeerinfo')
-    if fresh is not None:
-        cache['data'] = fresh
-        cache['timestamp'] = time.time()
-    return fresh
+    def __init__(self, name, loader, ttl, negative_ttl=CACHE_FAILURE_TTL, is_negative=None,
+                 max_entries=CACHE_MAX_ENTRIES):
+        self.name = name
+        self.loader = loader
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.is_negative = is_negative
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> {'value', 'expires_at', 'ttl', 'failed', 'loaded_at'}
+        self._inflight = {}            # key -> threading.Event
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0,
+                          'failures': 0, 'refresh_seconds': 0.0, 'last_refresh_seconds': 0.0}
+        self.scheduler = None
+        _caches[name] = self
+
+    def get(self, key=None, force_refresh=False):
+        """Cached value for `key` (None if it could never be loaded)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            if force_refresh or entry is None:
+                self._counters['misses'] += 1
+            elif now < entry['expires_at']:
+                self._counters['hits'] += 1
+                return entry['value']
+            elif entry['value'] is not None:
+                self._counters['stale_hits'] += 1
+
+        scheduled = self.scheduler is not None and self.scheduler.running
+        if entry is not None and entry['value'] is None and scheduled and not force_refresh:
+            return None  # failed load: the scheduled job retries it, not the reader
+        if force_refresh or entry is None or entry['value'] is None:
+            return self._load(key, wait=True)
+        if not scheduled:
+            self._load(key, wait=False)
+        return entry['value']
+
+    def refresh(self, key=None):
+        """Load `key` now (joining a load already in flight); True on success."""
+        self._load(key, wait=True)
+        entry = self._entries.get(key)
+        return entry is not None and not entry['failed']
+
+    def next_refresh_in(self, key=None):
+        """Seconds until `key` goes stale (its TTL, or negative_ttl after a failure)."""
+        entry = self._entries.get(key)
+        return entry['ttl'] if entry is not None else self.ttl
+
+    def peek(self, key=None):
+        """Cached value without triggering a load."""
+        entry = self._entries.get(key)
+        return entry['value'] if entry is not None else None
+
+    def age(self, key=None):
+        """(seconds since the last successful load or None, whether the latest load failed)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+        loaded_at = entry['loaded_at']
+        return (time.monotonic() - loaded_at if loaded_at is not None else None), entry['failed']
+
+    def invalidate(self, key=None):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _load(self, key, wait):
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = threading.Event()
+        if leader:
+            if not wait:
+                threading.Thread(target=self._refresh, args=(key, flight), daemon=True).start()
+                return None
+            self._refresh(key, flight)
+        elif wait:
+            flight.wait()
+        return self.peek(key)
+
+    def _refresh(self, key, flight):
+        started = time.monotonic()
+        try:
+            value = freeze(self.loader(key))
+        except Exception as e:
+            print(f"{self.name} cache refresh error: {e}")
+            value = None
+        now = time.monotonic()
+        CACHE_REFRESH_SECONDS.observe(now - started, self.name)
+        with self._lock:
+            self._counters['refreshes'] += 1
+            self._counters['refresh_seconds'] += now - started
+            self._counters['last_refresh_seconds'] = now - started
+            entry = self._entries.get(key)
+            failed = value is None
+            loaded_at = now
+            if failed:
+                self._counters['failures'] += 1
+                # Keep serving the last good value; retry after negative_ttl
+                value = entry['value'] if entry is not None else None
+                loaded_at = entry['loaded_at'] if entry is not None else None
+                ttl = self.negative_ttl
+            elif self.is_negative is not None and self.is_negative(value):
+                ttl = self.negative_ttl
+            else:
+                ttl = self.ttl
+            self._entries[key] = {'value': value, 'expires_at': now + ttl, 'ttl': ttl, 'failed': failed,
+                                  'loaded_at': loaded_at}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            del self._inflight[key]
+        flight.set()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._entries)
+            inflight = len(self._inflight)
+        refresh_seconds = counters.pop('refresh_seconds')
+        last_refresh_seconds = counters.pop('last_refresh_seconds')
+        return {
+            **counters,
+            'entries': entries,
+            'inflight': inflight,
+            'refresh_avg_ms': round(refresh_seconds * 1000 / counters['refreshes'], 1) if counters['refreshes'] else 0,
+            'refresh_last_ms': round(last_refresh_seconds * 1000, 1),
+        }
 
 
-def warm_electrumx_caches_async():
-    """Pre-warm caches in background to reduce first-load latency."""
-    def _worker():
+# cache name -> SWRCache, for /api/health
+_caches = {}
+
+
+def get_cache_stats():
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+class RefreshScheduler:
+    """
+    Runs every periodic refresh job on one fixed worker pool.
+
+    Each job has its own interval (a number, or a callable evaluated after
+    every run), jitter, timeout and failure backoff. A job fails when it
+    raises, returns False or overruns its timeout. After n consecutive
+    failures it waits interval * 2**n, capped at SCHEDULER_MAX_BACKOFF (or
+    the interval if that is longer). A job never overlaps with itself.
+    Request handlers only read what the jobs produced.
+
+    Python threads cannot be cancelled, so a job that hangs keeps its pool
+    thread. The scheduler wakes at each running job's deadline instead: the
+    job is marked stalled and counted as a failure right then, status()
+    reports it, and it is not resubmitted until the stuck call returns.
+    """
+
+    def __init__(self, workers=SCHEDULER_WORKERS, jitter=SCHEDULER_JITTER, max_backoff=SCHEDULER_MAX_BACKOFF):
+        self.workers = workers
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.jobs = {}
+        self._queue = []  # heap of (due, seq, name)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._pool = None
+        self._thread = None
+        self.running = False
+
+    def add_job(self, name, fn, interval, timeout=30, jitter=None, initial_delay=0.0):
+        with self._cond:
+            self.jobs[name] = {
+                'name': name, 'fn': fn, 'interval': interval, 'timeout': timeout,
+                'jitter': self.jitter if jitter is None else jitter,
+                'running_since': None, 'stalled': False, 'failures': 0, 'runs': 0, 'timeouts': 0,
+                'last_run': None, 'last_duration': None, 'last_error': None,
+            }
+            self._push(name, time.monotonic() + initial_delay)
+
+    def _push(self, name, due):
+        self._seq += 1
+        heapq.heappush(self._queue, (due, self._seq, name))
+        self._cond.notify()
+
+    def _next_delay(self, job):
+        interval = job['interval']() if callable(job['interval']) else job['interval']
+        if job['failures']:
+            interval = min(interval * 2 ** job['failures'], max(interval, self.max_backoff))
+        return interval * (1 + random.uniform(-job['jitter'], job['jitter']))
+
+    def _execute(self, job):
+        started = time.monotonic()
+        error = None
         try:
-            get_electrumx_stats_cached(force_refresh=True, include_addnode_probes=False)
-            get_electrumx_stats_cached(force_refresh=True, include_addnode_probes=True)
+            ok = job['fn']() is not False
         except Exception as e:
-            print(f"ElectrumX cache warmup error: {e}")
+            ok = False
+            error = str(e)
+            print(f"Scheduled job {job['name']} error: {e}")
+        duration = time.monotonic() - started
+        JOB_SECONDS.observe(duration, job['name'])
+        with self._cond:
+            # _check_deadlines may have flagged it already, while it was running
+            stalled = job['stalled'] or duration > job['timeout']
+            if ok and stalled:
+                ok = False
+                error = f"overran timeout of {job['timeout']}s"
+            if stalled and not job['stalled']:
+                job['timeouts'] += 1
+            job['runs'] += 1
+            job['running_since'] = None
+            job['last_run'] = time.time()
+            job['last_duration'] = round(duration, 3)
+            job['last_error'] = error if not ok else None
+            if ok:
+                job['failures'] = 0
+            elif not job['stalled']:
+                job['failures'] += 1
+            job['stalled'] = False
+            if self.running:
+                self._push(job['name'], time.monotonic() + self._next_delay(job))
+
+    def _check_deadlines(self, now):
+        """Flag running jobs past their timeout; return the next deadline still ahead, if any."""
+        next_deadline = None
+        for job in self.jobs.values():
+            if job['running_since'] is None or job['stalled']:
+                continue
+            deadline = job['running_since'] + job['timeout']
+            if deadline <= now:
+                job['stalled'] = True
+                job['timeouts'] += 1
+                job['failures'] += 1
+                job['last_error'] = f"stalled: still running after its timeout of {job['timeout']}s"
+                print(f"Scheduled job {job['name']} stalled past its {job['timeout']}s timeout")
+            elif next_deadline is None or deadline < next_deadline:
+                next_deadline = deadline
+        return next_deadline
+
+    def _loop(self):
+        with self._cond:
+            while self.running:
+                now = time.monotonic()
+                next_deadline = self._check_deadlines(now)
+                if not self._queue or self._queue[0][0] > now:
+                    wakeups = [t for t in (self._queue[0][0] if self._queue else None, next_deadline) if t is not None]
+                    self._cond.wait(min(wakeups) - now if wakeups else None)
+                    continue
+                _, _, name = heapq.heappop(self._queue)
+                job = self.jobs.get(name)
+                if job is None or job['running_since'] is not None:
+                    continue
+                job['running_since'] = now
+                self._pool.submit(self._execute, job)
+
+    def start(self):
+        with self._cond:
+            if self.running:
+                return self
+            self.running = True
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='refresh')
+        self._thread = threading.Thread(target=self._loop, name='refresh-scheduler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+    def status(self):
+        """Per-job state for /api/health; jobs running past their timeout are flagged stalled."""
+        now = time.monotonic()
+        with self._cond:
+            result = {}
+            for name, job in self.jobs.items():
+                running_for = now - job['running_since'] if job['running_since'] is not None else None
+                result[name] = {
+                    'runs': job['runs'],
+                    'failures': job['failures'],
+                    'last_run': job['last_run'],
+                    'last_duration': job['last_duration'],
+                    'last_error': job['last_error'],
+                    'running': running_for is not None,
+                    'running_for': round(running_for, 3) if running_for is not None else None,
+                    'overdue': running_for is not None and running_for > job['timeout'],
+                    'stalled': job['stalled'],
+                    'timeouts': job['timeouts'],
+                }
+            return result
+
+    def schedule_cache(self, cache, key=None, timeout=30, interval=None):
+        """Refresh `cache[key]` periodically; the interval follows the cache TTL."""
+        cache.scheduler = self
+        self.add_job(
+            cache.name if key is None else f"{cache.name}:{key}",
+            lambda: cache.refresh(key),
+            interval if interval is not None else (lambda: cache.next_refresh_in(key)),
+            timeout=timeout,
+        )
 
-    threading.Thread(target=_worker, daemon=True).start()
 
+_scheduler = RefreshScheduler()
 
-def warm_peers_cache_async():
-    """Pre-warm peers cache at startup so first user gets instant response."""
-    _refresh_peers_async()
 
+_peers_cache = SWRCache(
+    'palladium_peers', lambda key: palladium_rpc_call('getpeerinfo'), ttl=PALLADIUM_PEERS_TTL)
 
-def parse_addnode_hosts(conf_path='/palladium-config/palladium.conf'):
-    """Extract addnode hosts from palladium.conf"""
-    hosts = []
+
+def get_peers_cached():
+    """Return the cached (read-only) peer list; never blocks after first load."""
+    return _peers_cache.get()
+
+
+class PalladiumConfig:
+    """Read-only view of one revision of palladium.conf."""
+
+    __slots__ = ('path', 'signature', 'entries')
+
+    def __init__(self, path, signature, entries):
+        self.path = path
+        self.signature = signature
+        self.entries = tuple(entries)
+
+    def get(self, key, default=None):
+        """Last value set for `key` (later lines override earlier ones)."""
+        for entry_key, value in reversed(self.entries):
+            if entry_key == key:
+                return value
+        return default
+
+    def get_all(self, key):
+        """Every value set for a repeatable key such as addnode."""
+        return [value for entry_key, value in self.entries if entry_key == key]
+
+
+def _conf_signature(conf_path):
+    """Identity of the file on disk; changes on edit, replace or rotation."""
+    try:
+        st = os.stat(conf_path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _load_palladium_config(conf_path, signature):
+    entries = []
     try:
         with open(conf_path, 'r') as f:
             for raw_line in f:
                 line = raw_line.strip()
-                if not line or line.startswith('#') or not line.startswith('addnode='):
-                    continue
-                value = line.split('=', 1)[1].strip()
-                if not value:
+                if not line or line.startswith('#') or line.startswith('[') or '=' not in line:
                     continue
-                host = value.rsplit(':', 1)[0] if ':' in value else value
-                if host and host not in hosts:
-                    hosts.append(host)
+                key, value = line.split('=', 1)
+                entries.append((key.strip(), value.strip()))
     except Exception as e:
-        print(f"Error parsing addnode hosts: {e}")
+        print(f"Error reading {conf_path}: {e}")
+    return PalladiumConfig(conf_path, signature, entries)
+
+
+# conf path -> {'config': PalladiumConfig, 'checked_at': monotonic time}
+_palladium_conf_cache = {}
+_palladium_conf_lock = threading.Lock()
+
+
+def get_palladium_config(conf_path=None):
+    """
+    Return the parsed palladium.conf, shared by every reader.
+
+    The file is re-parsed only when its inode, mtime or size changes, so
+    credential rotations are picked up without a restart. The change check
+    itself (one stat call) runs at most every PALLADIUM_CONF_CHECK_INTERVAL
+    seconds, which keeps file I/O off the RPC hot path.
+    """
+    conf_path = conf_path or PALLADIUM_CONF_PATH
+    now = time.monotonic()
+    entry = _palladium_conf_cache.get(conf_path)
+    if entry is not None and now - entry['checked_at'] < PALLADIUM_CONF_CHECK_INTERVAL:
+        return entry['config']
+
+    with _palladium_conf_lock:
+        entry = _palladium_conf_cache.get(conf_path)
+        signature = _conf_signature(conf_path)
+        if entry is None or entry['config'].signature != signature:
+            if signature is None:
+                if entry is None or entry['config'].entries:
+                    print(f"Error reading {conf_path}: file not found")
+                config = PalladiumConfig(conf_path, None, ())
+            else:
+                config = _load_palladium_config(conf_path, signature)
+            entry = {'config': config, 'checked_at': now}
+            _palladium_conf_cache[conf_path] = entry
+        else:
+            entry['checked_at'] = now
+        return entry['config']
+
+
+def parse_addnode_hosts(conf_path=None):
+    """Extract addnode hosts from palladium.conf"""
+    hosts = []
+    for value in get_palladium_config(conf_path).get_all('addnode'):
+        if not value:
+            continue
+        host = value.rsplit(':', 1)[0] if ':' in value else value
+        if host and host not in hosts:
+            hosts.append(host)
     return hosts
 
 
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP/1.1 connection to a unix domain socket (the Docker daemon)."""
+
+    def __init__(self, socket_path, timeout):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class DockerEngine:
+    """
+    Minimal Docker Engine API client talking to the daemon socket directly.
+
+    Inspect and exec-bookkeeping requests share one keep-alive connection.
+    Exec output is read on a throwaway connection because the daemon
+    hijacks it for the attached stream and closes it when the command ends.
+    """
+
+    def __init__(self, socket_path=DOCKER_SOCKET, timeout=DOCKER_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _send(self, conn, method, path, body):
+        headers = {'Host': 'docker'}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+        conn.request(method, path, body=payload, headers=headers)
+        response = conn.getresponse()
+        return response.status, response.read()
+
+    def request(self, method, path, body=None):
+        """Send one API request on the shared connection; returns (status, body bytes)."""
+        with self._lock:
+            for attempt in (0, 1):
+                reused = self._conn is not None
+                if not reused:
+                    self._conn = _UnixHTTPConnection(self.socket_path, self.timeout)
+                try:
+                    return self._send(self._conn, method, path, body)
+                except (http.client.HTTPException, OSError):
+                    self._conn.close()
+                    self._conn = None
+                    # The daemon may have dropped an idle keep-alive connection
+                    if not reused or attempt:
+                        raise
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def inspect(self, container):
+        """`docker inspect` equivalent; returns the container JSON or None."""
+        with timed(DOCKER_SECONDS, 'inspect'):
+            status, body = self.request('GET', f'/containers/{container}/json')
+        if status != 200:
+            print(f"Docker inspect {container} failed: HTTP {status}")
+            return None
+        return json.loads(body)
+
+    def exec(self, container, cmd):
+        """
+        `docker exec` equivalent without a TTY.
+
+        Returns (exit_code, stdout text) or None if the exec could not be
+        created.
+        """
+        with timed(DOCKER_SECONDS, 'exec'):
+            return self._exec(container, cmd)
+
+    def _exec(self, container, cmd):
+        status, body = self.request('POST', f'/containers/{container}/exec', {
+            'Cmd': cmd,
+            'AttachStdout': True,
+            'AttachStderr': False,
+            'Tty': False,
+        })
+        if status != 201:
+            print(f"Docker exec create on {container} failed: HTTP {status}")
+            return None
+        exec_id = json.loads(body)['Id']
+
+        conn = _UnixHTTPConnection(self.socket_path, self.timeout)
+        try:
+            status, raw = self._send(conn, 'POST', f'/exec/{exec_id}/start',
+                                     {'Detach': False, 'Tty': False})
+        finally:
+            conn.close()
+        if status != 200:
+            print(f"Docker exec start on {container} failed: HTTP {status}")
+            return None
+
+        status, body = self.request('GET', f'/exec/{exec_id}/json')
+        exit_code = json.loads(body).get('ExitCode') if status == 200 else None
+        return exit_code, _demux_docker_stream(raw, stream=1).decode(errors='replace')
+
+
+def _demux_docker_stream(raw, stream=1):
+    """Extract one stream from Docker's multiplexed attach output (8-byte frame headers)."""
+    out = []
+    pos = 0
+    while pos + 8 <= len(raw):
+        kind = raw[pos]
+        size = int.from_bytes(raw[pos + 4:pos + 8], 'big')
+        if kind == stream:
+            out.append(raw[pos + 8:pos + 8 + size])
+        pos += 8 + size
+    return b''.join(out)
+
+
+_docker = DockerEngine()
+
+def _load_container_info(container):
+    data = _docker.inspect(container)
+    if data is None:
+        return None
+    env = {}
+    for item in (data.get('Config') or {}).get('Env') or []:
+        key, _, value = item.partition('=')
+        env[key] = value
+    state = data.get('State') or {}
+    return {
+        'running': bool(state.get('Running')),
+        'started_at': state.get('StartedAt') or '',
+        'env': env,
+    }
+
+
+def _load_db_size_du(container):
+    result = _docker.exec(container, ['du', '-sb', '/data'])
+    if result is None or result[0] != 0:
+        return None
+    return int(result[1].split()[0])
+
+
+def _load_tcp_sessions(key):
+    container, tcp_port = key
+    result = _docker.exec(container, [
+        'sh', '-c',
+        f'netstat -an 2>/dev/null | grep ":{int(tcp_port)}.*ESTABLISHED" | wc -l'
+    ])
+    if result is None or result[0] != 0:
+        return None
+    return int(result[1].strip())
+
+
+# Container facts cached by how often they change: inspect data (env,
+# start time, running state) only changes on restart, session counts move
+# constantly and the DB size is expensive to measure. An unreachable Docker
+# API is remembered for the full TTL.
+_container_info_cache = SWRCache(
+    'docker_inspect', _load_container_info, ttl=DOCKER_INSPECT_TTL, negative_ttl=DOCKER_INSPECT_TTL)
+_db_size_du_cache = SWRCache(
+    'docker_db_size', _load_db_size_du, ttl=DOCKER_DB_SIZE_TTL, negative_ttl=DOCKER_DB_SIZE_TTL)
+_tcp_sessions_cache = SWRCache(
+    'docker_sessions', _load_tcp_sessions, ttl=DOCKER_SESSIONS_TTL, negative_ttl=DOCKER_SESSIONS_TTL)
+
+
+def get_electrumx_container_info():
+    """
+    Running state, start time and environment of the ElectrumX container.
+    Returns a dict or None when the Docker API is unavailable.
+    """
+    return _container_info_cache.get(ELECTRUMX_CONTAINER)
+
+
+def get_electrumx_db_size():
+    """
+    Size in bytes of the ElectrumX /data directory measured with `du` in the
+    container, or None. Only used when the data directory is not mounted
+    into the dashboard (see DbSizeTracker).
+    """
+    return _db_size_du_cache.get(ELECTRUMX_CONTAINER)
+
+
+def get_electrumx_tcp_sessions(tcp_port):
+    """Established connections on the ElectrumX TCP port, or None."""
+    return _tcp_sessions_cache.get((ELECTRUMX_CONTAINER, tcp_port))
+
+
+class DbSizeTracker:
+    """
+    Tracks the size of the ElectrumX data directory without re-walking it.
+
+    LevelDB table files (.ldb/.sst) are never modified once compaction has
+    finished writing them, so a table file whose mtime is at least `settle`
+    seconds old is "settled" and its size is cached by name. Everything
+    else (write-ahead logs, MANIFEST, ElectrumX's flat files, and table
+    files still being written) is stat'ed again on every sample. A
+    directory whose mtime is unchanged has the same entries as last time;
+    directories whose mtime changed are rescanned, and only names that are
+    new or not yet settled are stat'ed. The cost of a sample therefore
+    follows the number of changed files, not the size of the database.
+    """
+
+    IMMUTABLE_SUFFIXES = ('.ldb', '.sst')
+    SETTLE_SECONDS = 60
+
+    def __init__(self, path, window=DB_SIZE_GROWTH_WINDOW, settle=SETTLE_SECONDS):
+        self.path = path
+        self.window = window
+        self.settle_ns = int(settle * 1e9)
+        # directory -> {'mtime': ns, 'files': {name: size}, 'settled': {names}, 'dirs': [names]}
+        self._dirs = {}
+        self._samples = []  # (timestamp, size), oldest first
+        self._lock = threading.Lock()
+        self.stat_calls = 0
+
+    def _stat(self, path):
+        self.stat_calls += 1
+        return os.stat(path, follow_symlinks=False)
+
+    def _stat_file(self, cached, dir_path, name, now_ns):
+        """Refresh the size of `name`, marking table files settled once their mtime is old enough."""
+        try:
+            st = self._stat(os.path.join(dir_path, name))
+        except FileNotFoundError:
+            cached['files'][name] = 0
+            return
+        cached['files'][name] = st.st_size
+        if name.endswith(self.IMMUTABLE_SUFFIXES) and now_ns - st.st_mtime_ns >= self.settle_ns:
+            cached['settled'].add(name)
+
+    def _scan_dir(self, dir_path, seen):
+        seen.add(dir_path)
+        st = self._stat(dir_path)
+        now_ns = time.time_ns()
+        cached = self._dirs.get(dir_path)
+        if cached is None or cached['mtime'] != st.st_mtime_ns:
+            previous = cached or {'files': {}, 'settled': set()}
+            cached = {'mtime': st.st_mtime_ns, 'files': {}, 'settled': set(), 'dirs': []}
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        cached['dirs'].append(entry.name)
+                    elif entry.name in previous['settled']:
+                        cached['files'][entry.name] = previous['files'][entry.name]
+                        cached['settled'].add(entry.name)
+                    else:
+                        self._stat_file(cached, dir_path, entry.name, now_ns)
+            self._dirs[dir_path] = cached
+        else:
+            for name in list(cached['files']):
+                if name not in cached['settled']:
+                    self._stat_file(cached, dir_path, name, now_ns)
+
+        total = sum(cached['files'].values())
+        for name in cached['dirs']:
+            try:
+                total += self._scan_dir(os.path.join(dir_path, name), seen)
+            except FileNotFoundError:
+                pass
+        return total
+
+    def sample(self):
+        """Measure the directory now and record the sample; returns the size in bytes."""
+        with self._lock:
+            seen = set()
+            size = self._scan_dir(self.path, seen)
+            for stale in set(self._dirs) - seen:
+                del self._dirs[stale]
+            now = time.time()
+            self._samples.append((now, size))
+            while len(self._samples) > 2 and now - self._samples[1][0] >= self.window:
+                self._samples.pop(0)
+            return size
+
+    def latest(self):
+        """
+        {'size', 'growth_rate' (bytes/s), 'sampled_at'} from the most recent
+        sample, or None before the first one.
+        """
+        samples = self._samples
+        if not samples:
+            return None
+        last_time, last_size = samples[-1]
+        first_time, first_size = samples[0]
+        growth_rate = None
+        if last_time > first_time:
+            growth_rate = round((last_size - first_size) / (last_time - first_time), 2)
+        return {'size': last_size, 'growth_rate': growth_rate, 'sampled_at': last_time}
+
+
+
+_db_size_tracker = DbSizeTracker(ELECTRUMX_DATA_DIR)
+
+
+def get_db_size_stats():
+    """Latest DB size and growth rate; measured inline if nothing was sampled yet."""
+    latest = _db_size_tracker.latest()
+    if latest is None and os.path.isdir(_db_size_tracker.path):
+        try:
+            _db_size_tracker.sample()
+        except Exception as e:
+            print(f"DB size sample error: {e}")
+        latest = _db_size_tracker.latest()
+    if latest is not None:
+        return latest
+    size = get_electrumx_db_size()
+    if size is None:
+        return None
+    return {'size': size, 'growth_rate': None, 'sampled_at': None}
+
+
+# Public identity of this server, used for display and to drop ourselves
+# from discovered peer lists. Resolved off the refresh path.
+_server_identity = {'ip': None, 'source': None, 'resolved_at': 0.0}
+_server_identity_lock = threading.Lock()
+_identity_refresh_lock = threading.Lock()
+
+
+def _identity_from_report_services():
+    """Host announced in REPORT_SERVICES (container env first, then local env)."""
+    container = get_electrumx_container_info()
+    services = (container or {}).get('env', {}).get('REPORT_SERVICES') or os.getenv('REPORT_SERVICES', '')
+    for item in services.split(','):
+        item = item.strip()
+        if '://' not in item:
+            continue
+        host = item.split('://', 1)[1].rsplit(':', 1)[0].strip('[]')
+        if host:
+            return host
+    return None
+
+
+def _identity_from_interfaces():
+    """First globally routable address bound to a local interface (host networking)."""
+    try:
+        for addresses in psutil.net_if_addrs().values():
+            for address in addresses:
+                if address.family not in (socket.AF_INET, socket.AF_INET6):
+                    continue
+                try:
+                    ip_obj = ipaddress.ip_address(address.address.split('%', 1)[0])
+                except ValueError:
+                    continue
+                if ip_obj.is_global:
+                    return str(ip_obj)
+    except Exception as e:
+        print(f"Interface address lookup error: {e}")
+    return None
+
+
+def _identity_from_route():
+    """Source address of the default route (no packets are sent), else the hostname's address."""
+    try:
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
+        finally:
+            s.close()
+    except Exception:
+        pass
+    try:
+        return socket.gethostbyname(socket.gethostname())
+    except Exception:
+        return None
+
+
+def _set_server_identity(ip, source):
+    with _server_identity_lock:
+        _server_identity.update(ip=ip, source=source, resolved_at=time.time())
+
+
+def resolve_server_identity(allow_network=True):
+    """
+    Determine this server's public address and cache it.
+
+    Order: REPORT_SERVICES, a global interface address, the public address
+    seen by api.ipify.org (only when allow_network), then the local
+    default-route address.
+    """
+    for source, lookup in (('report_services', _identity_from_report_services),
+                           ('interface', _identity_from_interfaces)):
+        ip = lookup()
+        if ip:
+            _set_server_identity(ip, source)
+            return ip
+
+    if allow_network:
+        try:
+            response = requests.get('https://api.ipify.org?format=json', timeout=2)
+            if response.status_code == 200 and response.json().get('ip'):
+                ip = response.json()['ip']
+                _set_server_identity(ip, 'ipify')
+                return ip
+        except Exception as e:
+            print(f"IP detection error: {e}")
+
+    ip = _identity_from_route()
+    if ip:
+        # Keep a previously found public address over a local fallback
+        if _server_identity['source'] != 'ipify':
+            _set_server_identity(ip, 'local')
+        return _server_identity['ip']
+    return None
+
+
+def _refresh_server_identity_async():
+    if not _identity_refresh_lock.acquire(blocking=False):
+        return  # resolution already in progress
+    def _worker():
+        try:
+            resolve_server_identity(allow_network=True)
+        finally:
+            _identity_refresh_lock.release()
+    threading.Thread(target=_worker, daemon=True).start()
+
+
+def get_server_identity():
+    """
+    Cached public address of this server; never waits on the network.
+
+    Before the first scheduled resolution completes, a local answer is
+    computed inline. Without a running scheduler the public lookup is then
+    started in the background.
+    """
+    ip = _server_identity['ip']
+    if ip:
+        return ip
+    ip = resolve_server_identity(allow_network=False)
+    if _server_identity['source'] == 'local' and not _scheduler.running:
+        _refresh_server_identity_async()
+    return ip
+
+
 def parse_services_ports(services):
     """Extract TCP/SSL ports from SERVICES string (e.g. tcp://0.0.0.0:50001,ssl://0.0.0.0:50002)."""
     tcp_port = None
@@ -263,165 +1388,330 @@ def get_electrumx_service_ports():
     1) SERVICES env from electrumx container
     2) local SERVICES env (if provided)
     """
-    try:
-        import subprocess
-        result = subprocess.run(
-            ['docker', 'exec', 'plm-electrumx', 'sh', '-c', 'printf "%s" "${SERVICES:-}"'],
-            capture_output=True,
-            text=True,
-            timeout=2
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            return parse_services_ports(result.stdout.strip())
-    except Exception:
-        pass
+    info = get_electrumx_container_info()
+    services = (info or {}).get('env', {}).get('SERVICES', '').strip()
+    if services:
+        return parse_services_ports(services)
 
     return parse_services_ports(os.getenv('SERVICES', ''))
 
 
-def probe_electrum_server(host, port, timeout=2.0):
-    """Check if an Electrum server is reachable and speaking protocol on host:port"""
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
-        sock.connect((host, port))
-        request = {
-            "jsonrpc": "2.0",
-            "id": 100,
-            "method": "server.version",
-            "params": ["palladium-dashboard", "1.4"]
-        }
-        sock.sendall((json.dumps(request) + '\n').encode())
+ELECTRUM_PROBE_MAX_BYTES = 65536
+ELECTRUM_TLS_SESSION_CACHE_SIZE = 1024
 
-        data = b""
-        for _ in range(6):
-            chunk = sock.recv(4096)
-            if not chunk:
-                break
-            data += chunk
-            candidate = data.decode(errors='ignore')
-            candidate = candidate.split("\n", 1)[0].strip()
-            if candidate:
-                try:
-                    payload = json.loads(candidate)
-                    sock.close()
-                    return 'result' in payload
-                except Exception:
-                    pass
-        sock.close()
-        line = data.split(b"\n", 1)[0].decode(errors='ignore').strip() if data else ""
-        payload = json.loads(line) if line else {}
-        if 'result' in payload:
-            return True
-    except Exception:
-        return False
-    return False
 
+def _create_probe_ssl_context():
+    """
+    Client context shared by every SSL probe. Peers use self-signed
+    certificates, so nothing is verified and no CA store is loaded.
+    """
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
 
-def probe_electrum_server_ssl(host, port, timeout=2.0):
-    """Check if an Electrum SSL server is reachable on host:port (self-signed allowed)."""
-    try:
-        raw_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        raw_sock.settimeout(timeout)
-        raw_sock.connect((host, port))
 
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
-        ssl_sock = context.wrap_socket(raw_sock, server_hostname=host)
-        ssl_sock.settimeout(timeout)
+_probe_ssl_context = _create_probe_ssl_context()
+# (host, port) -> last ssl.SSLSession, offered for resumption on the next probe
+_tls_sessions = OrderedDict()
+_tls_sessions_lock = threading.Lock()
 
-        request = {
-            "jsonrpc": "2.0",
-            "id": 101,
-            "method": "server.version",
-            "params": ["palladium-dashboard", "1.4"]
-        }
-        ssl_sock.sendall((json.dumps(request) + '\n').encode())
-        data = b""
-        for _ in range(6):
-            chunk = ssl_sock.recv(4096)
-            if not chunk:
-                break
-            data += chunk
-            candidate = data.decode(errors='ignore')
-            candidate = candidate.split("\n", 1)[0].strip()
-            if candidate:
+
+def _wrap_probe_socket(sock, host, port):
+    """TLS-wrap a probe socket, resuming the peer's cached session if it has one."""
+    with _tls_sessions_lock:
+        session = _tls_sessions.get((host, port))
+    started = time.perf_counter()
+    try:
+        ssl_sock = _probe_ssl_context.wrap_socket(sock, server_hostname=host, session=session)
+    except (ssl.SSLError, ValueError):
+        # A stale or rejected session must not keep breaking the handshake
+        with _tls_sessions_lock:
+            _tls_sessions.pop((host, port), None)
+        raise
+    TLS_HANDSHAKE_SECONDS.observe(time.perf_counter() - started, 'true' if ssl_sock.session_reused else 'false')
+    return ssl_sock
+
+
+def _remember_tls_session(ssl_sock, host, port):
+    """Keep the session for the next probe (TLS 1.3 tickets arrive after the first reply)."""
+    session = ssl_sock.session
+    if session is None or not session.has_ticket and not session.id:
+        return
+    with _tls_sessions_lock:
+        _tls_sessions[(host, port)] = session
+        _tls_sessions.move_to_end((host, port))
+        while len(_tls_sessions) > ELECTRUM_TLS_SESSION_CACHE_SIZE:
+            _tls_sessions.popitem(last=False)
+
+
+def probe_electrum_peer(host, port, use_ssl=False, timeout=2.0):
+    """
+    Probe one Electrum transport (TCP or SSL, self-signed allowed) over a
+    single connection.
+
+    `server.version` and `server.features` are pipelined in one write and
+    both replies are read back, so reachability, versions and the genesis
+    hash cost one connect (and at most one TLS handshake, resumed from the
+    peer's previous session when it supports that). `rtt_ms` is the time
+    from sending the requests to the first reply. Never raises.
+    """
+    result = {
+        'reachable': False,
+        'server_version': None,
+        'protocol': None,
+        'protocol_min': None,
+        'protocol_max': None,
+        'genesis_hash': None,
+        'rtt_ms': None,
+    }
+    started = time.perf_counter()
+    sock = None
+    try:
+        sock = socket.create_connection((host, port), timeout=timeout)
+        if use_ssl:
+            sock = _wrap_probe_socket(sock, host, port)
+        requests_out = [
+            {"jsonrpc": "2.0", "id": 1, "method": "server.version", "params": ["palladium-dashboard", "1.4"]},
+            {"jsonrpc": "2.0", "id": 2, "method": "server.features", "params": []},
+        ]
+        stream = ElectrumStream(sock, timeout=timeout, max_line=ELECTRUM_PROBE_MAX_BYTES)
+        sent_at = time.perf_counter()
+        stream.send(*requests_out)
+
+        replies = {}
+        try:
+            while len(replies) < len(requests_out):
+                line = stream.read_line()
                 try:
-                    payload = json.loads(candidate)
-                    ssl_sock.close()
-                    return 'result' in payload
-                except Exception:
-                    pass
-        ssl_sock.close()
-        line = data.split(b"\n", 1)[0].decode(errors='ignore').strip() if data else ""
-        payload = json.loads(line) if line else {}
-        if 'result' in payload:
-            return True
+                    reply = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(reply, dict) and reply.get('id') in (1, 2):
+                    if not replies:
+                        result['rtt_ms'] = round((time.perf_counter() - sent_at) * 1000, 1)
+                    replies[reply['id']] = reply
+        except (OSError, LineTooLong):
+            # Keep whatever arrived before the peer closed, stalled or overflowed
+            pass
+        if use_ssl and replies:
+            _remember_tls_session(sock, host, port)
+
+        version = (replies.get(1) or {}).get('result')
+        if version is not None:
+            result['reachable'] = True
+            if isinstance(version, list) and len(version) >= 2:
+                result['server_version'], result['protocol'] = version[0], version[1]
+        features = (replies.get(2) or {}).get('result')
+        if isinstance(features, dict):
+            result['reachable'] = True
+            result['server_version'] = result['server_version'] or features.get('server_version')
+            result['protocol_min'] = features.get('protocol_min')
+            result['protocol_max'] = features.get('protocol_max')
+            result['genesis_hash'] = features.get('genesis_hash')
     except Exception:
-        return False
-    return False
+        pass
+    finally:
+        if sock is not None:
+            sock.close()
+        PROBE_SECONDS.observe(time.perf_counter() - started, 'ssl' if use_ssl else 'tcp',
+                              'ok' if result['reachable'] else 'fail')
+    return result
 
 
-def get_electrum_server_genesis(host, tcp_port=None, ssl_port=None, timeout=2.0):
-    """Return peer genesis_hash via server.features, trying TCP first then SSL."""
-    request = {
-        "jsonrpc": "2.0",
-        "id": 102,
-        "method": "server.features",
-        "params": []
-    }
+# Shared worker pool for outbound Electrum probes. Every sweep submits into
+# the same pool, so ELECTRUM_PROBE_CONCURRENCY is a global cap on open probe
+# sockets no matter how many sweeps overlap.
+_probe_executor = ThreadPoolExecutor(
+    max_workers=max(1, ELECTRUM_PROBE_CONCURRENCY),
+    thread_name_prefix='electrum-probe'
+)
 
-    if tcp_port:
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
-            sock.connect((host, tcp_port))
-            sock.sendall((json.dumps(request) + '\n').encode())
-            data = b""
-            for _ in range(6):
-                chunk = sock.recv(4096)
-                if not chunk:
-                    break
-                data += chunk
-                candidate = data.decode(errors='ignore').split("\n", 1)[0].strip()
-                if candidate:
-                    payload = json.loads(candidate)
-                    genesis = (payload.get('result') or {}).get('genesis_hash')
-                    sock.close()
-                    return genesis
-            sock.close()
-        except Exception:
-            pass
 
-    if ssl_port:
+class ProbeSweep:
+    """
+    One round of concurrent Electrum probes bounded by a single deadline.
+
+    Probes are keyed (e.g. ('tcp', host, port)) and de-duplicated, so the same
+    host/port/protocol is only contacted once per sweep however many code
+    paths ask for it. result() waits at most until the sweep deadline; probes
+    still running after that report the caller's default.
+    """
+
+    def __init__(self, deadline=ELECTRUM_PROBE_DEADLINE):
+        self._expires_at = time.monotonic() + deadline
+        self._futures = {}
+
+    def submit(self, key, fn, *args, **kwargs):
+        if key not in self._futures:
+            self._futures[key] = _probe_executor.submit(fn, *args, **kwargs)
+        return key
+
+    def put(self, key, value):
+        """Use an already known result for `key` instead of probing."""
+        if key not in self._futures:
+            future = Future()
+            future.set_result(value)
+            self._futures[key] = future
+        return key
+
+    def result(self, key, default=None):
+        future = self._futures.get(key)
+        if future is None:
+            return default
+        remaining = self._expires_at - time.monotonic()
         try:
-            raw_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            raw_sock.settimeout(timeout)
-            raw_sock.connect((host, ssl_port))
-            context = ssl.create_default_context()
-            context.check_hostname = False
-            context.verify_mode = ssl.CERT_NONE
-            ssl_sock = context.wrap_socket(raw_sock, server_hostname=host)
-            ssl_sock.settimeout(timeout)
-            ssl_sock.sendall((json.dumps(request) + '\n').encode())
-            data = b""
-            for _ in range(6):
-                chunk = ssl_sock.recv(4096)
-                if not chunk:
-                    break
-                data += chunk
-                candidate = data.decode(errors='ignore').split("\n", 1)[0].strip()
-                if candidate:
-                    payload = json.loads(candidate)
-                    genesis = (payload.get('result') or {}).get('genesis_hash')
-                    ssl_sock.close()
-                    return genesis
-            ssl_sock.close()
+            return future.result(timeout=max(0.0, remaining))
         except Exception:
-            pass
+            return default
 
-    return None
+    def close(self):
+        """Drop probes that never got a worker before the deadline."""
+        for future in self._futures.values():
+            future.cancel()
+
+
+class PeerProbeStore:
+    """
+    Per-peer Electrum probe state, persisted in SQLite.
+
+    Keys are (transport, host, port). Each probe outcome updates the last
+    success/failure time, consecutive success and failure counts, RTT and
+    the full probe result, and schedules the next probe: the interval starts
+    at `min_interval` and doubles with every repeated outcome, up to
+    `stable_max` for healthy peers and `dead_max` for failing ones. A change
+    of state resets it, so probe cost follows how often peers flip rather
+    than how many there are. Until a peer is due, sweeps reuse its stored
+    result. Entries unseen for `retention` seconds are dropped on load and
+    by prune(), which the scheduler runs every PEER_PROBE_PRUNE_INTERVAL.
+    """
+
+    _PRUNE_SQL = 'DELETE FROM peer_probes WHERE MAX(COALESCE(last_success, 0), COALESCE(last_failure, 0)) < ?'
+
+    def __init__(self, path=PEER_PROBE_DB_PATH, min_interval=PEER_PROBE_MIN_INTERVAL,
+                 stable_max=PEER_PROBE_STABLE_MAX, dead_max=PEER_PROBE_DEAD_MAX,
+                 retention=PEER_PROBE_RETENTION):
+        self.path = path
+        self.min_interval = min_interval
+        self.stable_max = stable_max
+        self.dead_max = dead_max
+        self.retention = retention
+        self._conn = None
+        self._peers = None  # key -> state dict
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._peers is not None:
+            return
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        with conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS peer_probes ('
+                ' transport TEXT NOT NULL, host TEXT NOT NULL, port INTEGER NOT NULL,'
+                ' last_success REAL, last_failure REAL, successes INTEGER NOT NULL,'
+                ' failures INTEGER NOT NULL, rtt_ms REAL, next_probe_at REAL NOT NULL, result TEXT,'
+                ' PRIMARY KEY (transport, host, port)) WITHOUT ROWID'
+            )
+            conn.execute(self._PRUNE_SQL, (time.time() - self.retention,))
+        self._peers = {}
+        for (transport, host, port, last_success, last_failure, successes, failures,
+             rtt_ms, next_probe_at, result) in conn.execute('SELECT * FROM peer_probes'):
+            self._peers[(transport, host, port)] = {
+                'last_success': last_success,
+                'last_failure': last_failure,
+                'successes': successes,
+                'failures': failures,
+                'rtt_ms': rtt_ms,
+                'next_probe_at': next_probe_at,
+                'result': json.loads(result) if result else None,
+            }
+        self._conn = conn
+
+    def _interval(self, state):
+        if state['failures']:
+            return min(self.min_interval * 2 ** min(state['failures'] - 1, 30), self.dead_max)
+        return min(self.min_interval * 2 ** min(state['successes'] - 1, 30), self.stable_max)
+
+    def get(self, key):
+        """Copy of the stored state for `key`, or None if never probed."""
+        with self._lock:
+            self._load()
+            state = self._peers.get(key)
+            return dict(state) if state is not None else None
+
+    def cached_result(self, key, now=None):
+        """Stored probe result while `key` is not yet due for a re-probe, else None."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._load()
+            state = self._peers.get(key)
+            if state is None or state['result'] is None or now >= state['next_probe_at']:
+                return None
+            return state['result']
+
+    def record(self, key, result, now=None):
+        """Fold one probe result into the state of `key` and persist it."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._load()
+            state = self._peers.get(key) or {
+                'last_success': None, 'last_failure': None, 'successes': 0, 'failures': 0, 'rtt_ms': None}
+            if result.get('reachable'):
+                state['last_success'] = now
+                state['successes'] += 1
+                state['failures'] = 0
+                state['rtt_ms'] = result.get('rtt_ms')
+            else:
+                state['last_failure'] = now
+                state['failures'] += 1
+                state['successes'] = 0
+            state['result'] = result
+            state['next_probe_at'] = now + self._interval(state)
+            self._peers[key] = state
+            with self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO peer_probes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (*key, state['last_success'], state['last_failure'], state['successes'],
+                     state['failures'], state['rtt_ms'], state['next_probe_at'], json.dumps(result)))
+
+    def prune(self, now=None):
+        """Drop entries unseen for `retention` seconds; returns how many were dropped."""
+        cutoff = (time.time() if now is None else now) - self.retention
+        with self._lock:
+            self._load()
+            forgotten = [
+                key for key, state in self._peers.items()
+                if max(state['last_success'] or 0, state['last_failure'] or 0) < cutoff
+            ]
+            for key in forgotten:
+                del self._peers[key]
+            with self._conn:
+                self._conn.execute(self._PRUNE_SQL, (cutoff,))
+            return len(forgotten)
+
+    def probe(self, transport, host, port, timeout=ELECTRUM_PROBE_TIMEOUT):
+        """Probe one transport now and record the outcome."""
+        result = probe_electrum_peer(host, port, use_ssl=transport == 'ssl', timeout=timeout)
+        self.record((transport, host, port), result)
+        return result
+
+    def stats(self):
+        """Tracked peers and how many are currently due, for /api/health."""
+        now = time.time()
+        with self._lock:
+            self._load()
+            return {
+                'tracked': len(self._peers),
+                'due': sum(1 for state in self._peers.values() if now >= state['next_probe_at']),
+                'failing': sum(1 for state in self._peers.values() if state['failures']),
+            }
+
+
+_peer_probes = PeerProbeStore()
 
 
 def is_electrumx_reachable(timeout=1.0):
@@ -430,20 +1720,8 @@ def is_electrumx_reachable(timeout=1.0):
     if not tcp_port:
         return False
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
-        sock.connect((ELECTRUMX_RPC_HOST, tcp_port))
-        request = {
-            "jsonrpc": "2.0",
-            "id": 999,
-            "method": "server.version",
-            "params": ["palladium-health", "1.4"]
-        }
-        sock.send((json.dumps(request) + '\n').encode())
-        response = sock.recv(4096).decode()
-        sock.close()
-        data = json.loads(response)
-        return 'result' in data
+        with ElectrumStream.connect(ELECTRUMX_RPC_HOST, tcp_port, timeout=timeout) as stream:
+            return 'result' in stream.request('server.version', ["palladium-health", "1.4"])
     except Exception:
         return False
 
@@ -456,142 +1734,672 @@ def is_electrumx_reachable_retry():
     return is_electrumx_reachable(timeout=2.0)
 
 
-_refresh_lock_stats   = threading.Lock()   # include_addnode_probes=False
-_refresh_lock_servers = threading.Lock()   # include_addnode_probes=True
+class ElectrumxAdminClient:
+    """
+    Client for the ElectrumX local RPC interface (the `rpc://` service that
+    `electrumx_rpc` talks to): newline-delimited JSON-RPC over one TCP
+    connection that is kept open and reused between calls.
+    """
+
+    def __init__(self, host=ELECTRUMX_RPC_HOST, port=ELECTRUMX_RPC_PORT, timeout=ELECTRUMX_ADMIN_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._stream = None
+        self._lock = threading.Lock()
+
+    def _disconnect(self):
+        if self._stream is not None:
+            self._stream.close()
+        self._stream = None
+
+    def call(self, method, params=None):
+        """Call an admin RPC method; returns the result or None on error."""
+        with timed(ELECTRUMX_ADMIN_SECONDS, method), self._lock:
+            for attempt in (0, 1):
+                reused = self._stream is not None
+                try:
+                    if not reused:
+                        self._stream = ElectrumStream.connect(self.host, self.port, timeout=self.timeout)
+                    response = self._stream.request(method, params)
+                    break
+                except (OSError, ValueError) as e:
+                    self._disconnect()
+                    # ElectrumX may have dropped an idle connection; retry once on a fresh one
+                    if not reused or attempt:
+                        print(f"ElectrumX admin RPC error ({method}): {e}")
+                        return None
+        if response.get('error'):
+            print(f"ElectrumX admin RPC error ({method}): {response['error']}")
+            return None
+        return response.get('result')
 
+    def close(self):
+        with self._lock:
+            self._disconnect()
 
-def _refresh_cache_async(include_addnode_probes):
-    """Background worker: refresh cache without blocking callers."""
-    lock = _refresh_lock_servers if include_addnode_probes else _refresh_lock_stats
-    if not lock.acquire(blocking=False):
-        return  # refresh already in progress
-    def _worker():
+
+class RequestRateTracker:
+    """
+    Turns ElectrumX's cumulative request counter into a rate.
+
+    Both ElectrumX cache loaders sample the counter, on different scheduler
+    workers and intervals. Samples are folded in under a lock, and the rate
+    is only re-measured once `min_interval` seconds have passed since the
+    sample it was last measured from, so every caller reads the same rate
+    over a full window rather than over the gap since the other loader ran.
+    A counter that goes backwards (ElectrumX restarted) starts a new window.
+    """
+
+    def __init__(self, min_interval=ELECTRUMX_STATS_TTL):
+        self.min_interval = min_interval
+        self._base = None  # (timestamp, total) the next rate is measured from
+        self._rate = None
+        self._lock = threading.Lock()
+
+    def update(self, total, now=None):
+        """Fold in a counter sample; returns the current rate (None until two samples)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if self._base is None or total < self._base[1]:
+                self._base = (now, total)
+                self._rate = None
+            elif now - self._base[0] >= self.min_interval and now > self._base[0]:
+                self._rate = round((total - self._base[1]) / (now - self._base[0]), 2)
+                self._base = (now, total)
+            return self._rate
+
+
+_electrumx_admin = ElectrumxAdminClient()
+_electrumx_request_rate = RequestRateTracker()
+
+# Column layout of ElectrumX `sessions` rows
+_SESSION_COST_COLUMN = 5
+_SESSION_SUBS_COLUMN = 9
+_SESSION_RECV_COUNT_COLUMN = 10
+
+
+def get_electrumx_admin_metrics():
+    """
+    Live server metrics from the ElectrumX admin RPC `getinfo` and
+    `sessions` calls. Returns a dict or None if the RPC port is unavailable.
+    """
+    info = _electrumx_admin.call('getinfo')
+    if not isinstance(info, dict):
+        return None
+    rows = _electrumx_admin.call('sessions')
+    rows = rows if isinstance(rows, list) else []
+
+    def column(row, index):
         try:
-            cache = _electrumx_servers_cache if include_addnode_probes else _electrumx_stats_cache
-            fresh = get_electrumx_stats(include_addnode_probes=include_addnode_probes)
-            if fresh is not None:
-                cache['timestamp'] = time.time()
-                cache['stats'] = fresh
-        except Exception as e:
-            print(f"Background cache refresh error: {e}")
-        finally:
-            lock.release()
-    threading.Thread(target=_worker, daemon=True).start()
+            return float(row[index])
+        except (IndexError, TypeError, ValueError):
+            return 0.0
+
+    costs = [column(row, _SESSION_COST_COLUMN) for row in rows]
+    session_info = info.get('sessions') if isinstance(info.get('sessions'), dict) else {}
+    sessions = session_info.get('count', len(rows))
+    subs = session_info.get('subs')
+    if subs is None:
+        subs = int(sum(column(row, _SESSION_SUBS_COLUMN) for row in rows))
+    requests_total = info.get('request total')
+    if requests_total is None:
+        requests_total = int(sum(column(row, _SESSION_RECV_COUNT_COLUMN) for row in rows))
+
+    return {
+        'sessions': sessions,
+        'requests': requests_total,
+        'request_rate': _electrumx_request_rate.update(requests_total),
+        'subs': subs,
+        'db_height': info.get('db height'),
+        'daemon_height': info.get('daemon height'),
+        'session_cost_avg': round(sum(costs) / len(costs), 2) if costs else 0,
+        'session_cost_max': round(max(costs), 2) if costs else 0,
+    }
+
+
+# Fast card stats, and the heavier view with addnode server probing. An empty
+# server list is re-probed sooner than a populated one.
+_electrumx_stats_cache = SWRCache(
+    'electrumx_stats',
+    lambda key: get_electrumx_stats(include_addnode_probes=False),
+    ttl=ELECTRUMX_STATS_TTL)
+_electrumx_servers_cache = SWRCache(
+    'electrumx_servers',
+    lambda key: get_electrumx_stats(include_addnode_probes=True),
+    ttl=ELECTRUMX_SERVERS_TTL,
+    negative_ttl=ELECTRUMX_EMPTY_SERVERS_TTL,
+    is_negative=lambda stats: stats.get('active_servers_count', 0) == 0)
 
 
 def get_electrumx_stats_cached(force_refresh=False, include_addnode_probes=False):
-    """Return cached ElectrumX stats; refresh in background when stale.
+    """Return cached (read-only) ElectrumX stats; refresh in background when stale.
+
+    Only the very first call (or force_refresh, used by warm-up) waits for
+    the probes; afterwards stale data is served while a single refresh runs.
+    """
+    cache = _electrumx_servers_cache if include_addnode_probes else _electrumx_stats_cache
+    return cache.get(force_refresh=force_refresh)
+
+# Read RPC credentials from palladium.conf
+def get_rpc_credentials():
+    """Read RPC credentials from the shared palladium.conf snapshot"""
+    config = get_palladium_config()
+    return config.get('rpcuser'), config.get('rpcpassword')
+
+def _create_rpc_session():
+    """
+    Build the HTTP session shared by all node RPC calls.
+
+    The adapter keeps up to PALLADIUM_RPC_POOL_SIZE keep-alive connections to
+    palladiumd. urllib3 connection pools are thread-safe, and the session holds
+    no per-request state (auth is passed per call), so one instance is shared
+    by every request thread and background worker.
+    """
+    rpc_session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=max(1, PALLADIUM_RPC_POOL_SIZE),
+        max_retries=0
+    )
+    rpc_session.mount('http://', adapter)
+    rpc_session.mount('https://', adapter)
+    return rpc_session
+
+
+_rpc_http = _create_rpc_session()
+
+
+def _palladium_rpc_url():
+    return f"http://{PALLADIUM_RPC_HOST}:{PALLADIUM_RPC_PORT}"
+
+
+def _palladium_rpc_post(payload, rpc_user, rpc_password):
+    """POST a JSON-RPC payload (single request or batch array) to the node."""
+    headers = {'content-type': 'application/json'}
+    return _rpc_http.post(
+        _palladium_rpc_url(),
+        auth=(rpc_user, rpc_password),
+        data=json.dumps(payload),
+        headers=headers,
+        timeout=(PALLADIUM_RPC_CONNECT_TIMEOUT, PALLADIUM_RPC_READ_TIMEOUT)
+    )
+
+
+def get_rpc_pool_stats():
+    """
+    Connection reuse counters for the node RPC pool.
+
+    `misses` counts TCP connections that had to be opened, `hits` requests
+    served over an already-open keep-alive connection.
+    """
+    try:
+        url = _palladium_rpc_url()
+        pool = _rpc_http.get_adapter(url).poolmanager.connection_from_url(url)
+        total = pool.num_requests
+        misses = pool.num_connections
+        # The pool queue is pre-filled with None placeholders; only real
+        # connection objects are idle keep-alive sockets.
+        idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool is not None else 0
+        return {
+            'pool_size': PALLADIUM_RPC_POOL_SIZE,
+            'idle': idle,
+            'requests': total,
+            'hits': max(0, total - misses),
+            'misses': misses,
+        }
+    except Exception as e:
+        print(f"RPC pool stats error: {e}")
+        return None
+
+def palladium_rpc_call(method, params=None):
+    """Make RPC call to Palladium node"""
+    if params is None:
+        params = []
+
+    rpc_user, rpc_password = get_rpc_credentials()
+    if not rpc_user or not rpc_password:
+        return None
+
+    payload = {
+        "jsonrpc": "2.0",
+        "id": "dashboard",
+        "method": method,
+        "params": params
+    }
+
+    started = time.perf_counter()
+    try:
+        response = _palladium_rpc_post(payload, rpc_user, rpc_password)
+
+        if response.status_code == 200:
+            result = response.json()
+            if result.get('error'):
+                RPC_ERRORS.inc(method)
+            return result.get('result')
+        RPC_ERRORS.inc(method)
+        return None
+    except Exception as e:
+        RPC_ERRORS.inc(method)
+        print(f"RPC call error ({method}): {e}")
+        return None
+    finally:
+        RPC_SECONDS.observe(time.perf_counter() - started, method)
+
+def palladium_rpc_batch(calls):
+    """
+    Make several RPC calls to the Palladium node in a single HTTP round trip.
+
+    `calls` is a list of method names or (method, params) tuples. Returns a
+    list aligned with `calls` holding one {'result': ..., 'error': ...} dict
+    per call, or None when the batch request itself fails.
+    """
+    if not calls:
+        return []
+
+    rpc_user, rpc_password = get_rpc_credentials()
+    if not rpc_user or not rpc_password:
+        return None
+
+    payload = []
+    for index, call in enumerate(calls):
+        if isinstance(call, str):
+            method, params = call, []
+        else:
+            method = call[0]
+            params = list(call[1]) if len(call) > 1 and call[1] is not None else []
+        payload.append({
+            "jsonrpc": "2.0",
+            "id": index,
+            "method": method,
+            "params": params
+        })
+
+    started = time.perf_counter()
+    try:
+        response = _palladium_rpc_post(payload, rpc_user, rpc_password)
+        # The node answers a batch with HTTP 200 even when individual calls
+        # fail; per-call failures are reported in each reply's `error`.
+        if response.status_code != 200:
+            RPC_ERRORS.inc('batch')
+            return None
+        replies = response.json()
+        if not isinstance(replies, list):
+            RPC_ERRORS.inc('batch')
+            return None
+
+        results = [
+            {'result': None, 'error': {'code': None, 'message': 'No reply from node'}}
+            for _ in calls
+        ]
+        for reply in replies:
+            if not isinstance(reply, dict):
+                continue
+            index = reply.get('id')
+            if isinstance(index, int) and 0 <= index < len(calls):
+                results[index] = {'result': reply.get('result'), 'error': reply.get('error')}
+        for request_item, result in zip(payload, results):
+            if result['error']:
+                RPC_ERRORS.inc(request_item['method'])
+        return results
+    except Exception as e:
+        RPC_ERRORS.inc('batch')
+        print(f"RPC batch call error ({len(calls)} calls): {e}")
+        return None
+    finally:
+        RPC_SECONDS.observe(time.perf_counter() - started, 'batch')
+
+def palladium_rpc_batch_results(calls):
+    """Batch RPC helper returning only the results (None for failed calls)."""
+    replies = palladium_rpc_batch(calls)
+    if replies is None:
+        return [None] * len(calls)
+    return [reply.get('result') if not reply.get('error') else None for reply in replies]
+
+def invalidate_node_state(*sections):
+    """Mark node state sections (all by default) for refetch on next read."""
+    for name in sections or NODE_STATE_SECTIONS:
+        _node_state[name]['invalidated'] = True
+
+
+def is_zmq_feed_live():
+    """True while the ZMQ listener runs and has heard from the node recently."""
+    return (
+        _zmq_state['running']
+        and time.time() - _zmq_state['last_message'] < ZMQ_SILENCE_TIMEOUT
+    )
+
+
+def _node_section_ttl(name):
+    if name == 'network':
+        return NODE_NETWORK_TTL
+    # With a live ZMQ feed, tip and mempool data only change when the node
+    # says so; the max age is just a safety net for missed notifications.
+    return NODE_TIP_MAX_AGE if is_zmq_feed_live() else NODE_TIP_TTL
+
+
+def _stale_node_sections(sections):
+    now = time.time()
+    return [
+        name for name in sections
+        if _node_state[name]['invalidated']
+        or now - _node_state[name]['timestamp'] >= _node_section_ttl(name)
+    ]
+
+
+def _fetch_node_state(sections):
+    """
+    Refetch the stale ones of `sections` together in a single batched round
+    trip. Failed calls come back as None, leave their section stale (so the
+    next fetch retries) and mark it `failed` until a fetch succeeds again.
+    """
+    if _stale_node_sections(sections):
+        with _node_state_lock:
+            stale = _stale_node_sections(sections)
+            if stale:
+                calls = [method for name in stale for method in NODE_STATE_SECTIONS[name]]
+                # Clear the flags before fetching: a notification arriving
+                # mid-fetch sets them again instead of being lost.
+                for name in stale:
+                    _node_state[name]['invalidated'] = False
+                results = dict(zip(calls, palladium_rpc_batch_results(calls)))
+                fetched_at = time.time()
+                for name in stale:
+                    entry = _node_state[name]
+                    entry['data'] = {method: results.get(method) for method in NODE_STATE_SECTIONS[name]}
+                    entry['failed'] = any(value is None for value in entry['data'].values())
+                    if entry['failed']:
+                        entry['invalidated'] = True
+                    else:
+                        entry['timestamp'] = fetched_at
+
+
+def get_node_state(sections=tuple(NODE_STATE_SECTIONS)):
+    """
+    Return {rpc method: result} for the requested node state sections.
+
+    Stale sections are fetched inline, except while the scheduler runs: its
+    node_* jobs own this state then, and reads only return what they stored.
+    """
+    if not _scheduler.running:
+        _fetch_node_state(sections)
+    state = {}
+    for name in sections:
+        state.update(_node_state[name]['data'])
+    return state
+
+
+def refresh_node_state(*sections, stale_only=False):
+    """
+    Scheduled job body: refetch node state sections now, whatever their TTL
+    (only the stale or invalidated ones with `stale_only`). True if all are good.
+    """
+    if not stale_only:
+        invalidate_node_state(*sections)
+    _fetch_node_state(sections)
+    return not any(_node_state[name]['failed'] for name in sections)
+
+
+def resolve_zmq_endpoint(conf_key):
+    """
+    ZMQ endpoint for a palladium.conf `zmqpub*` key, as seen from here.
 
-    Never blocks the caller: if the cache is stale or empty but a refresh is
-    already in-flight, return whatever stale data we have immediately so every
-    HTTP response is fast.  A force_refresh=True call (from warm-up) still
-    blocks because it runs in its own background thread anyway.
+    palladiumd binds e.g. tcp://0.0.0.0:28332, so the host part is replaced
+    with PALLADIUM_RPC_HOST. PALLADIUM_ZMQ_<TOPIC> (e.g.
+    PALLADIUM_ZMQ_HASHBLOCK) overrides the derived endpoint.
     """
-    cache = _electrumx_servers_cache if include_addnode_probes else _electrumx_stats_cache
-    ttl = ELECTRUMX_SERVERS_TTL if include_addnode_probes else ELECTRUMX_STATS_TTL
-    now = time.time()
-    cached = cache.get('stats')
-    cached_ts = cache.get('timestamp', 0.0)
-
-    if (
-        include_addnode_probes
-        and cached is not None
-        and (cached.get('active_servers_count', 0) == 0)
-    ):
-        ttl = ELECTRUMX_EMPTY_SERVERS_TTL
-
-    cache_age = now - cached_ts
-    cache_valid = cached is not None and cache_age < ttl
-
-    if force_refresh:
-        # Called from warm_electrumx_caches_async — do a real blocking fetch
-        fresh = get_electrumx_stats(include_addnode_probes=include_addnode_probes)
-        if fresh is not None:
-            cache['timestamp'] = time.time()
-            cache['stats'] = fresh
-            return copy.deepcopy(fresh)
-        if cached is not None:
-            return copy.deepcopy(cached)
+    override = os.getenv('PALLADIUM_ZMQ_' + conf_key[len('zmqpub'):].upper(), '').strip()
+    if override:
+        return override
+    value = get_palladium_config().get(conf_key)
+    if not value or '://' not in value:
         return None
+    scheme, address = value.split('://', 1)
+    port = address.rsplit(':', 1)[-1]
+    return f"{scheme}://{PALLADIUM_RPC_HOST}:{port}"
 
-    if cache_valid:
-        return copy.deepcopy(cached)
 
-    # Cache is stale — kick off a background refresh and return stale data now
-    _refresh_cache_async(include_addnode_probes)
-    if cached is not None:
-        return copy.deepcopy(cached)
+class NodeEventListener:
+    """
+    Background ZMQ subscriber for palladiumd block and transaction feeds.
 
-    # No cached data at all: block once to get something to show
-    fresh = get_electrumx_stats(include_addnode_probes=include_addnode_probes)
-    if fresh is not None:
-        cache['timestamp'] = time.time()
-        cache['stats'] = fresh
-        return copy.deepcopy(fresh)
-    return None
+    A new block invalidates tip and mempool state and refreshes it (plus
+    the recent blocks cache) right away; a new transaction only invalidates
+    mempool state, which the next node_mempool job run (or, without the
+    scheduler, the next read) refetches. Notifications that arrive together are coalesced into one refresh.
+    """
 
-# Read RPC credentials from palladium.conf
-def get_rpc_credentials():
-    """Read RPC credentials from palladium.conf"""
-    try:
-        conf_path = '/palladium-config/palladium.conf'
-        rpc_user = None
-        rpc_password = None
+    BLOCK_TOPICS = (b'hashblock', b'rawblock')
+    TX_TOPICS = (b'hashtx', b'rawtx')
+
+    def __init__(self, subscriptions):
+        # subscriptions: iterable of (endpoint, topic bytes)
+        self.subscriptions = list(subscriptions)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='zmq-listener', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        context = zmq.Context()
+        sock = context.socket(zmq.SUB)
+        sock.setsockopt(zmq.LINGER, 0)
+        for endpoint in sorted({endpoint for endpoint, _ in self.subscriptions}):
+            sock.connect(endpoint)
+        for topic in {topic for _, topic in self.subscriptions}:
+            sock.setsockopt(zmq.SUBSCRIBE, topic)
+
+        _zmq_state['running'] = True
+        try:
+            while not self._stop.is_set():
+                if not sock.poll(1000):
+                    continue
+                topics = set()
+                try:
+                    while True:
+                        topics.add(sock.recv_multipart(zmq.NOBLOCK)[0])
+                except zmq.Again:
+                    pass
+                self._handle(topics)
+        except Exception as e:
+            print(f"ZMQ listener error: {e}")
+        finally:
+            _zmq_state['running'] = False
+            sock.close()
+            context.term()
 
-        with open(conf_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith('rpcuser='):
-                    rpc_user = line.split('=', 1)[1]
-                elif line.startswith('rpcpassword='):
-                    rpc_password = line.split('=', 1)[1]
-
-        return rpc_user, rpc_password
-    except Exception as e:
-        print(f"Error reading RPC credentials: {e}")
-        return None, None
+    def _handle(self, topics):
+        _zmq_state['last_message'] = time.time()
+        if topics & set(self.BLOCK_TOPICS):
+            try:
+                refresh_node_state('tip', 'mempool')
+                refresh_recent_blocks()
+            except Exception as e:
+                print(f"ZMQ block refresh error: {e}")
+        elif topics & set(self.TX_TOPICS):
+            invalidate_node_state('mempool')
 
-def palladium_rpc_call(method, params=None):
-    """Make RPC call to Palladium node"""
-    if params is None:
-        params = []
 
-    rpc_user, rpc_password = get_rpc_credentials()
-    if not rpc_user or not rpc_password:
+def start_node_event_listener():
+    """Subscribe to the node's block/tx ZMQ feeds when pyzmq and palladium.conf allow it."""
+    if zmq is None:
+        print("pyzmq not installed; node data refreshes on TTL only")
         return None
 
-    url = f"http://{PALLADIUM_RPC_HOST}:{PALLADIUM_RPC_PORT}"
-    headers = {'content-type': 'application/json'}
-    payload = {
-        "jsonrpc": "2.0",
-        "id": "dashboard",
-        "method": method,
-        "params": params
+    subscriptions = []
+    for conf_keys in (('zmqpubhashblock', 'zmqpubrawblock'), ('zmqpubhashtx', 'zmqpubrawtx')):
+        for conf_key in conf_keys:
+            endpoint = resolve_zmq_endpoint(conf_key)
+            if endpoint:
+                subscriptions.append((endpoint, conf_key[len('zmqpub'):].encode()))
+                break
+    if not subscriptions:
+        print("No zmqpub* endpoints configured; node data refreshes on TTL only")
+        return None
+    return NodeEventListener(subscriptions).start()
+
+
+def _summarize_block(block_hash, block, height=None):
+    """Keep only the fields the dashboard shows (and the parent link)."""
+    tx_count = block.get('nTx')
+    if tx_count is None:
+        tx_count = len(block.get('tx') or [])
+    return {
+        'height': block.get('height', height),
+        'hash': block_hash,
+        'time': block.get('time'),
+        'size': block.get('size'),
+        'tx_count': tx_count,
+        'previousblockhash': block.get('previousblockhash'),
     }
 
-    try:
-        response = requests.post(
-            url,
-            auth=(rpc_user, rpc_password),
-            data=json.dumps(payload),
-            headers=headers,
-            timeout=10
-        )
 
-        if response.status_code == 200:
-            result = response.json()
-            return result.get('result')
-        return None
-    except Exception as e:
-        print(f"RPC call error ({method}): {e}")
+def _cache_block(summary):
+    """Insert a block summary, evicting whatever a reorg replaced at its height."""
+    block_hash = summary['hash']
+    height = summary.get('height')
+    with _block_cache_lock:
+        if height is not None:
+            replaced = _block_hash_by_height.get(height)
+            if replaced and replaced != block_hash:
+                _block_cache.pop(replaced, None)
+            _block_hash_by_height[height] = block_hash
+        _block_cache[block_hash] = summary
+        _block_cache.move_to_end(block_hash)
+        while len(_block_cache) > BLOCK_CACHE_SIZE:
+            evicted_hash, evicted = _block_cache.popitem(last=False)
+            if _block_hash_by_height.get(evicted.get('height')) == evicted_hash:
+                del _block_hash_by_height[evicted['height']]
+
+
+def get_recent_block_summaries(count=RECENT_BLOCKS_DEFAULT, fetch=True):
+    """
+    Return summaries for the `count` most recent blocks, newest first.
+
+    Starting from the best block hash (from the cached tip state), cached
+    blocks are chained through `previousblockhash` without touching the node,
+    so a warm cache costs no RPC at all and a new tip one getblock. Anything else
+    missing is fetched in two batched round trips (hashes, then blocks);
+    with `fetch=False` only the cached part of the chain is returned.
+    Returns None if the node is unreachable.
+    """
+    blockchain_info = get_node_state(('tip',)).get('getblockchaininfo')
+    if not blockchain_info:
         return None
 
+    tip_height = blockchain_info.get('blocks', 0)
+    heights = [tip_height - i for i in range(min(count, tip_height))]
+    summaries = {}
+    position = 0
+    block_hash = blockchain_info.get('bestblockhash')
+
+    def walk_cached_chain():
+        nonlocal position, block_hash
+        with _block_cache_lock:
+            while position < len(heights) and block_hash:
+                summary = _block_cache.get(block_hash)
+                if summary is None or summary.get('height') != heights[position]:
+                    return
+                _block_cache.move_to_end(block_hash)
+                summaries[heights[position]] = summary
+                block_hash = summary.get('previousblockhash')
+                position += 1
+
+    walk_cached_chain()
+    if not fetch:
+        return [
+            {key: value for key, value in summaries[height].items() if key != 'previousblockhash'}
+            for height in heights[:position]
+        ]
+
+    # Usual case after a new block: only the tip is unknown. Fetch it by hash
+    # and resume the cached walk from its parent.
+    if position < len(heights) and block_hash:
+        block = palladium_rpc_call('getblock', [block_hash, 1])
+        if isinstance(block, dict):
+            summary = _summarize_block(block_hash, block, heights[position])
+            _cache_block(summary)
+            summaries[heights[position]] = summary
+            block_hash = summary.get('previousblockhash')
+            position += 1
+            walk_cached_chain()
+
+    # Cold cache or deep reorg: resolve the rest of the range in one batch of
+    # getblockhash calls, then one batch of getblock calls for unknown hashes.
+    missing_heights = heights[position:]
+    if missing_heights:
+        hashes = {}
+        lookup = missing_heights
+        if block_hash:
+            hashes[missing_heights[0]] = block_hash
+            lookup = missing_heights[1:]
+        if lookup:
+            found_hashes = palladium_rpc_batch_results(
+                [('getblockhash', [height]) for height in lookup])
+            for height, found in zip(lookup, found_hashes):
+                if isinstance(found, str) and found:
+                    hashes[height] = found
+
+        to_fetch = []
+        with _block_cache_lock:
+            for height in missing_heights:
+                found = hashes.get(height)
+                cached = _block_cache.get(found) if found else None
+                if cached is not None and cached.get('height') == height:
+                    summaries[height] = cached
+                elif found:
+                    to_fetch.append((height, found))
+
+        if to_fetch:
+            blocks = palladium_rpc_batch_results(
+                [('getblock', [found, 1]) for _, found in to_fetch])
+            for (height, found), block in zip(to_fetch, blocks):
+                if isinstance(block, dict):
+                    summary = _summarize_block(found, block, height)
+                    _cache_block(summary)
+                    summaries[height] = summary
+
+    return [
+        {key: value for key, value in summaries[height].items() if key != 'previousblockhash'}
+        for height in heights
+        if height in summaries
+    ]
+
+# Deepest `count` a reader has asked for; the recent_blocks job keeps that many cached
+_recent_blocks_depth = RECENT_BLOCKS_DEFAULT
+
+
+def refresh_recent_blocks():
+    """Scheduled job body: fetch whatever the recent blocks readers need into the block cache."""
+    return get_recent_block_summaries(_recent_blocks_depth) is not None
+
+
+def read_recent_block_summaries(count=RECENT_BLOCKS_DEFAULT):
+    """
+    Recent block summaries for request handlers. While the scheduler runs
+    this only reads the block cache; a deeper `count` than it holds is
+    served short and picked up by the next recent_blocks job run.
+    """
+    global _recent_blocks_depth
+    if not _scheduler.running:
+        return get_recent_block_summaries(count)
+    _recent_blocks_depth = max(_recent_blocks_depth, count)
+    return get_recent_block_summaries(count, fetch=False)
+
+
 def get_electrumx_stats(include_addnode_probes=False):
     """Get ElectrumX statistics via Electrum protocol and system info"""
     try:
         import socket
         import json
-        import subprocess
         from datetime import datetime
 
         local_tcp_port, local_ssl_port = get_electrumx_service_ports()
@@ -610,54 +2418,29 @@ def get_electrumx_stats(include_addnode_probes=False):
             'active_servers': [],
             'active_servers_count': 0,
             'requests': 0,
+            'request_rate': None,
             'subs': 0,
+            'db_height': None,
+            'daemon_height': None,
+            'session_cost_avg': None,
+            'session_cost_max': None,
             'uptime': 0,
             'db_size': 0,
+            'db_growth_rate': None,
             'tcp_port': str(local_tcp_port) if local_tcp_port else None,
             'ssl_port': str(local_ssl_port) if local_ssl_port else None,
             'server_ip': 'Unknown'
         }
 
-        # Get server IP address
-        try:
-            # Try to get public IP from external service
-            response = requests.get('https://api.ipify.org?format=json', timeout=0.4)
-            if response.status_code == 200:
-                stats['server_ip'] = response.json().get('ip', 'Unknown')
-            else:
-                # Fallback to local IP
-                s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                s.connect(("8.8.8.8", 80))
-                stats['server_ip'] = s.getsockname()[0]
-                s.close()
-        except Exception as e:
-            print(f"IP detection error: {e}")
-            # Last fallback: get hostname IP
-            try:
-                stats['server_ip'] = socket.gethostbyname(socket.gethostname())
-            except Exception:
-                stats['server_ip'] = 'Unknown'
+        # Server IP address (resolved in the background, see get_server_identity)
+        stats['server_ip'] = get_server_identity() or 'Unknown'
 
         # Get server features via Electrum protocol
         try:
             if not local_tcp_port:
                 raise RuntimeError("SERVICES tcp port not configured")
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            sock.connect((ELECTRUMX_RPC_HOST, local_tcp_port))
-
-            request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "server.features",
-                "params": []
-            }
-
-            sock.send((json.dumps(request) + '\n').encode())
-            response = sock.recv(4096).decode()
-            sock.close()
-
-            data = json.loads(response)
+            with ElectrumStream.connect(ELECTRUMX_RPC_HOST, local_tcp_port, timeout=5) as stream:
+                data = stream.request('server.features')
             if 'result' in data:
                 result = data['result']
                 full_genesis = result.get('genesis_hash', '')
@@ -686,22 +2469,10 @@ def get_electrumx_stats(include_addnode_probes=False):
         try:
             if not local_tcp_port:
                 raise RuntimeError("SERVICES tcp port not configured")
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            sock.connect((ELECTRUMX_RPC_HOST, local_tcp_port))
-
-            request = {
-                "jsonrpc": "2.0",
-                "id": 2,
-                "method": "server.peers.subscribe",
-                "params": []
-            }
-
-            sock.send((json.dumps(request) + '\n').encode())
-            response = sock.recv(65535).decode()
-            sock.close()
-
-            data = json.loads(response)
+            # The peer list of a large network spans many TCP segments;
+            # the framed reader waits for the whole line.
+            with ElectrumStream.connect(ELECTRUMX_RPC_HOST, local_tcp_port, timeout=5) as stream:
+                data = stream.request('server.peers.subscribe')
             if 'result' in data and isinstance(data['result'], list):
                 peers = []
                 for peer in data['result']:
@@ -768,12 +2539,54 @@ def get_electrumx_stats(include_addnode_probes=False):
 
         # Optional full probing for dedicated servers page
         if include_addnode_probes:
+            sweep = ProbeSweep()
             try:
+                # One connection per transport answers version and features
+                # together; results are dicts from probe_electrum_peer().
+                # Peers that are not yet due reuse their stored result.
+                def probe_transport(transport, host, port):
+                    key = (transport, host, port)
+                    cached = _peer_probes.cached_result(key)
+                    if cached is not None:
+                        return sweep.put(key, cached)
+                    return sweep.submit(key, _peer_probes.probe, transport, host, port,
+                                        timeout=ELECTRUM_PROBE_TIMEOUT)
+
+                def probe_tcp(host, port):
+                    return probe_transport('tcp', host, port)
+
+                def probe_ssl(host, port):
+                    return probe_transport('ssl', host, port)
+
+                def probe_result(key):
+                    return sweep.result(key) or {}
+
+                def peer_port(value, fallback):
+                    return int(value) if str(value or '').isdigit() else fallback
+
+                # Queue every probe that is already known up front so addnode
+                # hosts and discovered peers are all contacted concurrently.
                 addnode_hosts = parse_addnode_hosts()
+                for host in addnode_hosts:
+                    if local_tcp_port:
+                        probe_tcp(host, local_tcp_port)
+                    if local_ssl_port:
+                        probe_ssl(host, local_ssl_port)
+                for peer in (stats.get('active_servers') or []):
+                    host = (peer.get('host') or '').strip()
+                    if not host:
+                        continue
+                    peer_tcp_port = peer_port(peer.get('tcp_port'), local_tcp_port)
+                    peer_ssl_port = peer_port(peer.get('ssl_port'), local_ssl_port)
+                    if peer.get('tcp_reachable') is None and peer_tcp_port:
+                        probe_tcp(host, peer_tcp_port)
+                    if peer.get('ssl_reachable') is None and peer_ssl_port:
+                        probe_ssl(host, peer_ssl_port)
+
                 extra_servers = []
                 for host in addnode_hosts:
-                    tcp_ok = probe_electrum_server(host, local_tcp_port, timeout=2.0) if local_tcp_port else False
-                    ssl_ok = probe_electrum_server_ssl(host, local_ssl_port, timeout=2.0) if local_ssl_port else False
+                    tcp_ok = probe_result(('tcp', host, local_tcp_port)).get('reachable', False)
+                    ssl_ok = probe_result(('ssl', host, local_ssl_port)).get('reachable', False)
                     if tcp_ok or ssl_ok:
                         extra_servers.append({
                             'host': host,
@@ -813,116 +2626,83 @@ def get_electrumx_stats(include_addnode_probes=False):
                             existing['ssl_reachable'] = peer.get('ssl_reachable')
                 merged = list(merged_by_host.values())
 
-                # Probe merged list so summary can report both TCP and SSL reachability
+                # Probe merged list so summary can report both TCP and SSL reachability.
+                # Most of these were queued above; submit() only adds the missing ones.
+                pending = []
                 for peer in merged:
                     host = peer.get('host')
                     if not host:
                         continue
-                    peer_tcp_port = int(peer.get('tcp_port')) if str(peer.get('tcp_port', '')).isdigit() else local_tcp_port
-                    peer_ssl_port = int(peer.get('ssl_port')) if str(peer.get('ssl_port', '')).isdigit() else local_ssl_port
-
-                    if peer.get('tcp_reachable') is None and peer_tcp_port:
-                        peer['tcp_reachable'] = probe_electrum_server(host, peer_tcp_port, timeout=2.0)
-                    if peer.get('ssl_reachable') is None and peer_ssl_port:
-                        peer['ssl_reachable'] = probe_electrum_server_ssl(host, peer_ssl_port, timeout=2.0)
+                    peer_tcp_port = peer_port(peer.get('tcp_port'), local_tcp_port)
+                    peer_ssl_port = peer_port(peer.get('ssl_port'), local_ssl_port)
+                    tcp_key = probe_tcp(host, peer_tcp_port) if peer_tcp_port else None
+                    ssl_key = probe_ssl(host, peer_ssl_port) if peer_ssl_port else None
+                    pending.append((peer, peer_tcp_port, peer_ssl_port, tcp_key, ssl_key))
+
+                for peer, peer_tcp_port, peer_ssl_port, tcp_key, ssl_key in pending:
+                    tcp_result = probe_result(tcp_key) if tcp_key else {}
+                    ssl_result = probe_result(ssl_key) if ssl_key else {}
+                    if tcp_key and peer.get('tcp_reachable') is None:
+                        peer['tcp_reachable'] = tcp_result.get('reachable', False)
+                    if ssl_key and peer.get('ssl_reachable') is None:
+                        peer['ssl_reachable'] = ssl_result.get('reachable', False)
                     if peer.get('tcp_reachable') is True and not peer.get('tcp_port') and peer_tcp_port:
                         peer['tcp_port'] = str(peer_tcp_port)
                     if peer.get('ssl_reachable') is True and not peer.get('ssl_port') and peer_ssl_port:
                         peer['ssl_port'] = str(peer_ssl_port)
 
+                    # Version, protocol range and genesis came back with the
+                    # reachability probes; prefer TCP, fill gaps from SSL.
+                    for field in ('server_version', 'protocol_min', 'protocol_max', 'genesis_hash'):
+                        peer[field] = tcp_result.get(field) or ssl_result.get(field)
+                    rtts = [r['rtt_ms'] for r in (tcp_result, ssl_result) if r.get('rtt_ms') is not None]
+                    peer['rtt_ms'] = min(rtts) if rtts else None
+
                 # Keep only peers matching local Electrum network (same genesis hash).
                 expected_genesis = (stats.get('genesis_hash_full') or '').strip().lower()
                 if expected_genesis:
-                    filtered = []
-                    for peer in merged:
-                        host = peer.get('host')
-                        if not host:
-                            continue
-                        if peer.get('tcp_reachable') is not True and peer.get('ssl_reachable') is not True:
-                            continue
-                        peer_tcp_port = int(peer.get('tcp_port')) if str(peer.get('tcp_port', '')).isdigit() else None
-                        peer_ssl_port = int(peer.get('ssl_port')) if str(peer.get('ssl_port', '')).isdigit() else None
-                        peer_genesis = get_electrum_server_genesis(
-                            host,
-                            tcp_port=peer_tcp_port,
-                            ssl_port=peer_ssl_port,
-                            timeout=2.0
-                        )
-                        if peer_genesis and peer_genesis.strip().lower() == expected_genesis:
-                            filtered.append(peer)
-                    merged = filtered
+                    merged = [
+                        peer for peer in merged
+                        if (peer.get('tcp_reachable') is True or peer.get('ssl_reachable') is True)
+                        and (peer.get('genesis_hash') or '').strip().lower() == expected_genesis
+                    ]
 
                 stats['active_servers'] = merged
                 stats['active_servers_count'] = len(merged)
             except Exception as e:
                 print(f"Supplemental Electrum discovery error: {e}")
-
-        # Read peer discovery/announce settings from electrumx container env
-        try:
-            result = subprocess.run(
-                ['docker', 'exec', 'plm-electrumx', 'sh', '-c',
-                 'printf "%s|%s" "${PEER_DISCOVERY:-unknown}" "${PEER_ANNOUNCE:-unknown}"'],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-            if result.returncode == 0:
-                values = (result.stdout or '').strip().split('|', 1)
-                if len(values) == 2:
-                    stats['peer_discovery'] = values[0] or 'unknown'
-                    stats['peer_announce'] = values[1] or 'unknown'
-        except Exception as e:
-            print(f"Peer discovery env read error: {e}")
-
-        # Try to get container stats via Docker
-        try:
-            # Get container uptime
-            result = subprocess.run(
-                ['docker', 'inspect', 'plm-electrumx', '--format', '{{.State.StartedAt}}'],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-            if result.returncode == 0:
-                started_at = result.stdout.strip()
-                # Parse and calculate uptime
+            finally:
+                sweep.close()
+
+        # Peer discovery/announce settings and uptime from the container
+        container = get_electrumx_container_info()
+        if container:
+            env = container['env']
+            stats['peer_discovery'] = env.get('PEER_DISCOVERY') or 'unknown'
+            stats['peer_announce'] = env.get('PEER_ANNOUNCE') or 'unknown'
+            try:
                 from dateutil import parser
-                start_time = parser.parse(started_at)
+                start_time = parser.parse(container['started_at'])
                 uptime_seconds = int((datetime.now(start_time.tzinfo) - start_time).total_seconds())
                 stats['uptime'] = uptime_seconds
-        except Exception as e:
-            print(f"Docker uptime error: {e}")
-
-        # Try to estimate DB size from data directory
-        try:
-            result = subprocess.run(
-                ['docker', 'exec', 'plm-electrumx', 'du', '-sb', '/data'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                db_size = int(result.stdout.split()[0])
-                stats['db_size'] = db_size
-        except Exception as e:
-            print(f"DB size error: {e}")
-
-        # Count active connections (TCP sessions)
-        try:
-            if not local_tcp_port:
-                raise RuntimeError("SERVICES tcp port not configured")
-            result = subprocess.run(
-                ['docker', 'exec', 'plm-electrumx', 'sh', '-c',
-                 f'netstat -an 2>/dev/null | grep ":{local_tcp_port}.*ESTABLISHED" | wc -l'],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-            if result.returncode == 0:
-                sessions = int(result.stdout.strip())
+            except Exception as e:
+                print(f"Docker uptime error: {e}")
+
+        # DB size and growth of the data directory
+        db_stats = get_db_size_stats()
+        if db_stats is not None:
+            stats['db_size'] = db_stats['size']
+            stats['db_growth_rate'] = db_stats['growth_rate']
+
+        # Sessions, request and subscription counters from the admin RPC;
+        # fall back to counting established TCP connections
+        admin_metrics = get_electrumx_admin_metrics()
+        if admin_metrics:
+            stats.update(admin_metrics)
+        elif local_tcp_port:
+            sessions = get_electrumx_tcp_sessions(local_tcp_port)
+            if sessions is not None:
                 stats['sessions'] = sessions
-        except Exception as e:
-            print(f"Sessions count error: {e}")
 
         return stats
     except Exception as e:
@@ -944,26 +2724,33 @@ def electrum_servers():
     """Serve Electrum active servers page"""
     return render_template('electrum_servers.html', api_key=os.getenv('API_KEY', '').strip())
 
-@app.route('/api/palladium/info')
-def palladium_info():
-    """Get Palladium node blockchain info"""
-    try:
-        blockchain_info = palladium_rpc_call('getblockchaininfo')
-        network_info = palladium_rpc_call('getnetworkinfo')
-        mining_info = palladium_rpc_call('getmininginfo')
-        peer_info = palladium_rpc_call('getpeerinfo')
-        mempool_info = palladium_rpc_call('getmempoolinfo')
-
-        data = {
+def build_palladium_info():
+    """Snapshot for /api/palladium/info, rebuilt when a node state fetch replaces its data"""
+    state = get_node_state()
+    blockchain_info = state.get('getblockchaininfo')
+    network_info = state.get('getnetworkinfo')
+    mining_info = state.get('getmininginfo')
+    peer_info = state.get('getpeerinfo')
+    mempool_info = state.get('getmempoolinfo')
+
+    def build(timestamp):
+        return {
             'blockchain': blockchain_info or {},
             'network': network_info or {},
             'mining': mining_info or {},
             'peers': len(peer_info) if peer_info else 0,
             'mempool': mempool_info or {},
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         }
 
-        return jsonify(data)
+    return derived_snapshot(
+        'palladium_info', (blockchain_info, network_info, mining_info, peer_info, mempool_info), build)
+
+@app.route('/api/palladium/info')
+def palladium_info():
+    """Get Palladium node blockchain info"""
+    try:
+        return build_palladium_info().response()
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -971,7 +2758,9 @@ def palladium_info():
 def palladium_block_height():
     """Get current blockchain height."""
     try:
-        height = palladium_rpc_call('getblockcount')
+        height = (get_node_state(('tip',)).get('getblockchaininfo') or {}).get('blocks')
+        if height is None and not _scheduler.running:
+            height = palladium_rpc_call('getblockcount')
         if height is None:
             blockchain_info = palladium_rpc_call('getblockchaininfo') or {}
             height = blockchain_info.get('blocks')
@@ -990,7 +2779,9 @@ def palladium_block_height():
 def palladium_network_hashrate():
     """Get network hashrate (hashes per second)."""
     try:
-        hashrate = palladium_rpc_call('getnetworkhashps')
+        hashrate = (get_node_state(('tip',)).get('getmininginfo') or {}).get('networkhashps')
+        if hashrate is None and not _scheduler.running:
+            hashrate = palladium_rpc_call('getnetworkhashps')
         if hashrate is None:
             mining_info = palladium_rpc_call('getmininginfo') or {}
             hashrate = mining_info.get('networkhashps')
@@ -1010,7 +2801,9 @@ def palladium_network_hashrate():
 def palladium_difficulty():
     """Get current PoW network difficulty."""
     try:
-        difficulty = palladium_rpc_call('getdifficulty')
+        difficulty = (get_node_state(('tip',)).get('getblockchaininfo') or {}).get('difficulty')
+        if difficulty is None and not _scheduler.running:
+            difficulty = palladium_rpc_call('getdifficulty')
         if difficulty is None:
             blockchain_info = palladium_rpc_call('getblockchaininfo') or {}
             difficulty = blockchain_info.get('difficulty')
@@ -1048,13 +2841,13 @@ def palladium_coinbase_subsidy():
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/palladium/peers')
-def palladium_peers():
-    """Get detailed peer information"""
-    try:
-        peer_info = get_peers_cached()
+def build_palladium_peers():
+    """Snapshot for /api/palladium/peers"""
+    peer_info = get_peers_cached()
+
+    def build(timestamp):
         if not peer_info:
-            return jsonify({'peers': []})
+            return {'peers': []}
 
         peers_data = []
         for peer in peer_info:
@@ -1067,150 +2860,824 @@ def palladium_peers():
                 'bytesrecv': peer.get('bytesrecv', 0)
             })
 
-        return jsonify({
+        return {
             'peers': peers_data,
             'total': len(peers_data),
-            'timestamp': datetime.now().isoformat()
-        })
+            'timestamp': timestamp
+        }
+
+    return derived_snapshot('peers', (peer_info,), build)
+
+@app.route('/api/palladium/peers')
+def palladium_peers():
+    """Get detailed peer information"""
+    try:
+        return build_palladium_peers().response()
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def build_recent_blocks(count=RECENT_BLOCKS_DEFAULT):
+    """Payload for /api/palladium/blocks/recent; None if the node is unreachable"""
+    blocks = read_recent_block_summaries(count)
+    if blocks is None:
+        return None
+    return {'blocks': blocks}
+
 @app.route('/api/palladium/blocks/recent')
 def recent_blocks():
-    """Get recent blocks information"""
+    """Get recent blocks information (`?count=` up to RECENT_BLOCKS_MAX)"""
     try:
-        blockchain_info = palladium_rpc_call('getblockchaininfo')
-        if not blockchain_info:
+        count = request.args.get('count', default=RECENT_BLOCKS_DEFAULT, type=int)
+        count = max(1, min(count or RECENT_BLOCKS_DEFAULT, RECENT_BLOCKS_MAX))
+
+        data = build_recent_blocks(count)
+        if data is None:
             return jsonify({'error': 'Cannot get blockchain info'}), 500
 
-        current_height = blockchain_info.get('blocks', 0)
-        blocks = []
-
-        # Get last 10 blocks
-        for i in range(min(10, current_height)):
-            height = current_height - i
-            block_hash = palladium_rpc_call('getblockhash', [height])
-            if block_hash:
-                block = palladium_rpc_call('getblock', [block_hash])
-                if block:
-                    blocks.append({
-                        'height': height,
-                        'hash': block_hash,
-                        'time': block.get('time'),
-                        'size': block.get('size'),
-                        'tx_count': len(block.get('tx', []))
-                    })
-
-        return jsonify({'blocks': blocks})
+        return jsonify(data)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def build_electrumx_stats():
+    """Snapshot for /api/electrumx/stats; None if ElectrumX is unreachable"""
+    stats = get_electrumx_stats_cached(include_addnode_probes=False)
+    if not stats:
+        return None
+    heavy_stats = get_electrumx_stats_cached(include_addnode_probes=True)
+    # Container running state comes from the cached inspect data
+    container = get_electrumx_container_info()
+    running = bool(container and container['running'])
+
+    def build(timestamp):
+        overlay = {}
+        # Keep dashboard card aligned with /api/electrumx/servers:
+        # always prefer the full discovery view for active servers.
+        if heavy_stats:
+            overlay['active_servers'] = heavy_stats.get('active_servers', [])
+            overlay['active_servers_count'] = heavy_stats.get('active_servers_count', 0)
+        if running:
+            overlay['status'] = 'running'
+        return {
+            'stats': {**stats, **overlay},
+            'timestamp': timestamp
+        }
+
+    return derived_snapshot('electrumx_stats', (stats, heavy_stats, running), build)
+
 @app.route('/api/electrumx/stats')
 def electrumx_stats():
     """Get ElectrumX server statistics"""
     try:
-        stats = get_electrumx_stats_cached(include_addnode_probes=False)
-        if stats:
-            # Keep dashboard card aligned with /api/electrumx/servers:
-            # always prefer the full discovery view for active servers.
-            heavy_stats = get_electrumx_stats_cached(include_addnode_probes=True)
-            if heavy_stats:
-                stats['active_servers'] = heavy_stats.get('active_servers', [])
-                stats['active_servers_count'] = heavy_stats.get('active_servers_count', 0)
-
-            # Get additional info from logs if available
-            try:
-                # Try to get container stats
-                import subprocess
-                result = subprocess.run(
-                    ['docker', 'exec', 'plm-electrumx', 'sh', '-c',
-                     'ps aux | grep electrumx_server | grep -v grep'],
-                    capture_output=True,
-                    text=True,
-                    timeout=2
-                )
-                if result.returncode == 0:
-                    # Process is running, add placeholder stats
-                    stats['status'] = 'running'
-                    stats['requests'] = 0
-                    stats['subs'] = 0
-            except:
-                pass
-
-            return jsonify({
-                'stats': stats,
-                'timestamp': datetime.now().isoformat()
-            })
+        snapshot = build_electrumx_stats()
+        if snapshot:
+            return snapshot.response()
         return jsonify({'error': 'Cannot connect to ElectrumX'}), 500
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def build_electrumx_servers():
+    """Snapshot for /api/electrumx/servers; None if ElectrumX is unreachable"""
+    stats = get_electrumx_stats_cached(include_addnode_probes=True)
+    if not stats:
+        return None
+
+    def build(timestamp):
+        servers = stats.get('active_servers') or []
+        return {
+            'servers': servers,
+            'total': len(servers),
+            'timestamp': timestamp
+        }
+
+    return derived_snapshot('electrumx_servers', (stats,), build)
+
 @app.route('/api/electrumx/servers')
 def electrumx_servers():
     """Get active Electrum servers discovered by this node"""
     try:
-        stats = get_electrumx_stats_cached(include_addnode_probes=True)
-        if not stats:
+        snapshot = build_electrumx_servers()
+        if not snapshot:
             return jsonify({'error': 'Cannot connect to ElectrumX'}), 500
-
-        servers = stats.get('active_servers') or []
-        return jsonify({
-            'servers': servers,
-            'total': len(servers),
-            'timestamp': datetime.now().isoformat()
-        })
+        return snapshot.response()
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/system/resources')
-def system_resources():
-    """Get system resource usage"""
-    try:
-        cpu_percent = psutil.cpu_percent(interval=1)
+class SystemSampler:
+    """
+    Fixed-rate sampler of host resources with a ring buffer of history.
+
+    CPU usage is measured between consecutive samples (psutil's
+    non-blocking mode), so taking a sample never sleeps. Network and disk
+    I/O rates are derived from the counter deltas between samples. Each
+    sample is a new dict and is never modified after it is stored.
+    """
+
+    def __init__(self, size=SYSTEM_HISTORY_SIZE):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._previous_counters = None
+        psutil.cpu_percent(interval=None)  # prime the CPU delta
+
+    @staticmethod
+    def _rate(current, previous, elapsed):
+        if previous is None or elapsed <= 0 or current < previous:
+            return None
+        return round((current - previous) / elapsed, 1)
+
+    def sample(self):
+        """Take one sample, store it and return it."""
+        now = time.time()
+        cpu_percent = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
         disk = psutil.disk_usage('/')
+        net = psutil.net_io_counters()
+        try:
+            disk_io = psutil.disk_io_counters()
+        except Exception:
+            disk_io = None
+
+        with self._lock:
+            previous = self._previous_counters
+            elapsed = now - previous['time'] if previous else 0
+            counters = {
+                'time': now,
+                'bytes_sent': net.bytes_sent if net else None,
+                'bytes_recv': net.bytes_recv if net else None,
+                'read_bytes': disk_io.read_bytes if disk_io else None,
+                'write_bytes': disk_io.write_bytes if disk_io else None,
+            }
 
-        data = {
-            'cpu': {
-                'percent': cpu_percent,
-                'count': psutil.cpu_count()
-            },
-            'memory': {
-                'total': memory.total,
-                'used': memory.used,
-                'percent': memory.percent
-            },
-            'disk': {
-                'total': disk.total,
-                'used': disk.used,
-                'percent': disk.percent
-            },
-            'timestamp': datetime.now().isoformat()
-        }
+            def rate(key):
+                if counters[key] is None or previous is None or previous[key] is None:
+                    return None
+                return self._rate(counters[key], previous[key], elapsed)
+
+            sample = {
+                'cpu': {
+                    'percent': cpu_percent,
+                    'count': psutil.cpu_count()
+                },
+                'memory': {
+                    'total': memory.total,
+                    'used': memory.used,
+                    'percent': memory.percent
+                },
+                'disk': {
+                    'total': disk.total,
+                    'used': disk.used,
+                    'percent': disk.percent
+                },
+                'network': {
+                    'bytes_sent': counters['bytes_sent'],
+                    'bytes_recv': counters['bytes_recv'],
+                    'sent_rate': rate('bytes_sent'),
+                    'recv_rate': rate('bytes_recv')
+                },
+                'disk_io': {
+                    'read_bytes': counters['read_bytes'],
+                    'write_bytes': counters['write_bytes'],
+                    'read_rate': rate('read_bytes'),
+                    'write_rate': rate('write_bytes')
+                },
+                'sampled_at': now,
+                'timestamp': datetime.fromtimestamp(now).isoformat()
+            }
+            self._previous_counters = counters
+            self._samples.append(sample)
+        return sample
+
+    def latest(self, max_age=None):
+        """Most recent sample, or None if there is none (or it is older than max_age seconds)."""
+        with self._lock:
+            sample = self._samples[-1] if self._samples else None
+        if sample is None or (max_age is not None and time.time() - sample['sampled_at'] > max_age):
+            return None
+        return sample
+
+    def history(self, seconds):
+        """Compact per-sample series covering the last `seconds`, oldest first."""
+        cutoff = time.time() - seconds
+        with self._lock:
+            samples = [sample for sample in self._samples if sample['sampled_at'] >= cutoff]
+        return [
+            {
+                'time': sample['sampled_at'],
+                'cpu': sample['cpu']['percent'],
+                'memory': sample['memory']['percent'],
+                'disk': sample['disk']['percent'],
+                'net_sent_rate': sample['network']['sent_rate'],
+                'net_recv_rate': sample['network']['recv_rate'],
+                'disk_read_rate': sample['disk_io']['read_rate'],
+                'disk_write_rate': sample['disk_io']['write_rate'],
+            }
+            for sample in samples
+        ]
 
-        return jsonify(data)
+
+_system_sampler = SystemSampler()
+
+
+def build_system_resources(history=0):
+    """
+    Payload for /api/system/resources: the latest background sample, plus
+    `history` seconds of samples from the ring buffer when requested.
+    Without a running sampler job a sample is taken inline (never blocks).
+    """
+    sample = None
+    if _scheduler.running:
+        sample = _system_sampler.latest(max_age=SYSTEM_SAMPLE_INTERVAL * 3)
+    if sample is None:
+        sample = _system_sampler.sample()
+    if not history:
+        return sample
+    return {**sample, 'history': _system_sampler.history(history)}
+
+@app.route('/api/system/resources')
+def system_resources():
+    """Get system resource usage (`?history=<seconds>` adds recent samples)"""
+    try:
+        history = max(0, min(request.args.get('history', 0, type=int),
+                             int(SYSTEM_HISTORY_SIZE * SYSTEM_SAMPLE_INTERVAL)))
+        return jsonify(build_system_resources(history=history))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/health')
-def health():
-    """Health check endpoint"""
+def build_health():
+    """Payload for /api/health"""
     palladium_ok = palladium_rpc_call('getblockchaininfo') is not None
     stats = get_electrumx_stats_cached(include_addnode_probes=False)
-    if not stats or stats.get('server_version') in (None, '', 'Unknown'):
+    if not _scheduler.running and (not stats or stats.get('server_version') in (None, '', 'Unknown')):
         stats = get_electrumx_stats_cached(force_refresh=True, include_addnode_probes=False)
     electrumx_ok = bool(stats and (stats.get('server_version') not in (None, '', 'Unknown')))
 
-    return jsonify({
+    return {
         'status': 'healthy' if (palladium_ok and electrumx_ok) else 'degraded',
         'services': {
             'palladium': 'up' if palladium_ok else 'down',
             'electrumx': 'up' if electrumx_ok else 'down'
         },
+        'rpc_pool': get_rpc_pool_stats(),
+        'caches': get_cache_stats(),
+        'jobs': _scheduler.status(),
+        'peer_probes': _peer_probes.stats(),
         'timestamp': datetime.now().isoformat()
-    })
+    }
+
+@app.route('/api/health')
+def health():
+    """Health check endpoint"""
+    return jsonify(build_health())
+
+
+_process_started_at = time.time()
+
+
+@app.route('/api/health/live')
+def health_live():
+    """Liveness: the process is up and serving requests"""
+    return jsonify({'status': 'alive', 'uptime': round(time.time() - _process_started_at, 1)})
+
+
+def build_readiness():
+    """
+    Readiness from background-maintained state only; never calls the node,
+    ElectrumX or Docker. Each check reports the age of its data in seconds
+    and fails once that age exceeds its scheduled refresh interval plus
+    HEALTH_READY_GRACE, or as soon as the latest refresh failed.
+    """
+    tip = _node_state['tip']
+    node_age = time.time() - tip['timestamp'] if tip['timestamp'] else None
+    # The node_tip job refetches every NODE_TIP_TTL even while ZMQ is live
+    node_max_age = NODE_TIP_TTL + HEALTH_READY_GRACE
+
+    stats = _electrumx_stats_cache.peek()
+    electrumx_age, electrumx_failed = _electrumx_stats_cache.age()
+    electrumx_max_age = ELECTRUMX_STATS_TTL + HEALTH_READY_GRACE
+
+    checks = {
+        'palladium': {
+            'ok': node_age is not None and node_age <= node_max_age and not tip['failed'],
+            'age': round(node_age, 1) if node_age is not None else None,
+            'max_age': node_max_age,
+        },
+        'electrumx': {
+            'ok': bool(
+                stats and stats.get('server_version') not in (None, '', 'Unknown')
+                and not electrumx_failed
+                and electrumx_age is not None and electrumx_age <= electrumx_max_age
+            ),
+            'age': round(electrumx_age, 1) if electrumx_age is not None else None,
+            'max_age': electrumx_max_age,
+        },
+    }
+    return {
+        'status': 'ready' if all(check['ok'] for check in checks.values()) else 'not_ready',
+        'checks': checks,
+    }
+
+
+@app.route('/api/health/ready')
+def health_ready():
+    """Readiness: node and ElectrumX state maintained in the background is fresh"""
+    readiness = build_readiness()
+    return jsonify(readiness), 200 if readiness['status'] == 'ready' else 503
+
+
+def build_health_summary():
+    """
+    Health card payload for the live stream, built from the same cached
+    state as /api/health/ready (no node or ElectrumX calls). It leaves out
+    counters and timestamps, so it only changes, and is only pushed, when a
+    service goes up or down.
+    """
+    checks = build_readiness()['checks']
+    return {
+        'status': 'healthy' if all(check['ok'] for check in checks.values()) else 'degraded',
+        'services': {name: 'up' if check['ok'] else 'down' for name, check in checks.items()},
+    }
+
+
+def collect_runtime_metrics():
+    """Scrape-time view of cache, scheduler and node RPC pool counters."""
+    caches = get_cache_stats()
+    jobs = _scheduler.status()
+    pool = get_rpc_pool_stats() or {}
+    yield ('dashboard_cache_requests_total', 'counter', 'Cache lookups by result',
+           [({'cache': name, 'result': result}, stats[result])
+            for name, stats in caches.items() for result in ('hits', 'stale_hits', 'misses')])
+    yield ('dashboard_cache_refresh_failures_total', 'counter', 'Cache loads that failed',
+           [({'cache': name}, stats['failures']) for name, stats in caches.items()])
+    yield ('dashboard_cache_entries', 'gauge', 'Entries held per cache',
+           [({'cache': name}, stats['entries']) for name, stats in caches.items()])
+    yield ('dashboard_job_consecutive_failures', 'gauge', 'Consecutive failures per scheduled job',
+           [({'job': name}, job['failures']) for name, job in jobs.items()])
+    yield ('dashboard_job_timeouts_total', 'counter', 'Scheduled job runs that overran their timeout',
+           [({'job': name}, job['timeouts']) for name, job in jobs.items()])
+    yield ('dashboard_job_stalled', 'gauge', 'Scheduled jobs still running past their timeout',
+           [({'job': name}, int(job['stalled'])) for name, job in jobs.items()])
+    yield ('dashboard_probe_tls_sessions', 'gauge', 'Cached TLS sessions for Electrum SSL probes',
+           [({}, len(_tls_sessions))])
+    yield ('dashboard_rpc_pool_connections', 'gauge', 'Node RPC connections by state',
+           [({'state': 'idle'}, pool.get('idle'))])
+    yield ('dashboard_rpc_pool_requests_total', 'counter', 'Node RPC requests by connection reuse',
+           [({'reused': 'true'}, pool.get('hits')), ({'reused': 'false'}, pool.get('misses'))])
+
+
+_metric_collectors.append(collect_runtime_metrics)
+
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+
+class StackProfiler:
+    """
+    Wall-clock sampling profiler over every thread in the process.
+
+    Nothing is hooked into the interpreter: while a profile runs, the calling
+    thread reads sys._current_frames() `hz` times per second and counts each
+    distinct stack, so there is no cost at all between profiles. Only one
+    profile runs at a time. Output is the collapsed-stack format read by
+    flamegraph.pl and speedscope: `thread;outer;...;inner count` per line.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _frame_label(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _collapse(self, frame):
+        labels = []
+        while frame is not None:
+            labels.append(self._frame_label(frame))
+            frame = frame.f_back
+        return ';'.join(reversed(labels))
+
+    def profile(self, seconds, hz):
+        """Sample for `seconds`; returns (counts by stack, samples taken) or None if busy."""
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            own_ident = threading.get_ident()
+            interval = 1.0 / hz
+            counts = {}
+            samples = 0
+            deadline = time.monotonic() + seconds
+            next_sample = time.monotonic()
+            while next_sample < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident == own_ident:
+                        continue
+                    stack = f"{names.get(ident, ident)};{self._collapse(frame)}"
+                    counts[stack] = counts.get(stack, 0) + 1
+                samples += 1
+                next_sample += interval
+                time.sleep(max(0.0, next_sample - time.monotonic()))
+            return counts, samples
+        finally:
+            self._lock.release()
+
+
+_profiler = StackProfiler()
+
+
+@app.route('/api/debug/profile')
+def debug_profile():
+    """Sample all thread stacks for `?seconds=` at `?hz=`; collapsed-stack text"""
+    seconds = request.args.get('seconds', 10, type=float)
+    hz = request.args.get('hz', PROFILE_DEFAULT_HZ, type=int)
+    if not 0 < seconds <= PROFILE_MAX_SECONDS or not 1 <= hz <= 1000:
+        return jsonify({'error': f'seconds must be in (0, {PROFILE_MAX_SECONDS}] and hz in [1, 1000]'}), 400
+    result = _profiler.profile(seconds, hz)
+    if result is None:
+        return jsonify({'error': 'A profile is already running'}), 409
+    counts, samples = result
+    lines = [f"{stack} {count}" for stack, count in sorted(counts.items(), key=lambda item: -item[1])]
+    response = Response('\n'.join(lines) + '\n', mimetype='text/plain')
+    response.headers['X-Profile-Samples'] = str(samples)
+    return response
+
+class StreamHub:
+    """
+    Fan-out of dashboard snapshots to Server-Sent Events clients.
+
+    A single producer thread rebuilds every topic that at least one client
+    subscribed to, once per `interval`, no matter how many clients are
+    connected. When a topic changed it pre-encodes two events: the full
+    snapshot (for new clients or clients that fell behind) and a patch with
+    only the top-level keys that changed. Client generators just copy those
+    shared bytes out. The producer exits when the last client leaves.
+    """
+
+    def __init__(self, builders, interval=STREAM_INTERVAL, keepalive=STREAM_KEEPALIVE):
+        self.builders = builders
+        self.interval = interval
+        self.keepalive = keepalive
+        self._cond = threading.Condition()
+        self._topics = {}      # topic -> {'seq', 'payload', 'snapshot', 'patch'}
+        self._wanted = {}      # topic -> number of subscribed clients
+        self._producer = None
+        self.clients = 0
+
+    @staticmethod
+    def _encode(topic, seq, message):
+        data = json.dumps(message, separators=(',', ':'), default=_json_default)
+        return f"event: {topic}\nid: {seq}\ndata: {data}\n\n".encode()
+
+    def publish(self, topic, payload):
+        """Record a new payload (dict or Snapshot) for `topic`; returns False if nothing changed."""
+        snapshot_event = None
+        if isinstance(payload, Snapshot):
+            snapshot_event = b'{"snapshot":' + payload.body + b'}'
+            payload = payload.data
+        previous = self._topics.get(topic)
+        previous_payload = previous['payload'] if previous else None
+        changed = {
+            key: value for key, value in payload.items()
+            if previous_payload is None or previous_payload.get(key) != value
+        }
+        if previous_payload is not None and set(changed) <= {'timestamp'}:
+            return False
+
+        seq = previous['seq'] + 1 if previous else 1
+        patch = None
+        if previous_payload is not None and set(previous_payload) <= set(payload):
+            patch = self._encode(topic, seq, {'patch': changed})
+        entry = {
+            'seq': seq,
+            'payload': payload,
+            'snapshot': (
+                f"event: {topic}\nid: {seq}\ndata: ".encode() + snapshot_event + b"\n\n"
+                if snapshot_event is not None
+                else self._encode(topic, seq, {'snapshot': payload})
+            ),
+            'patch': patch,
+        }
+        with self._cond:
+            self._topics[topic] = entry
+            self._cond.notify_all()
+        return True
+
+    def _produce(self):
+        while True:
+            with self._cond:
+                topics = [topic for topic, count in self._wanted.items() if count > 0]
+                if not topics:
+                    self._producer = None
+                    return
+            for topic in topics:
+                try:
+                    payload = self.builders[topic]()
+                except Exception as e:
+                    print(f"Stream {topic} build error: {e}")
+                    continue
+                if payload is not None:
+                    self.publish(topic, payload)
+            time.sleep(self.interval)
+
+    def _pending(self, topics, seen):
+        return [
+            topic for topic in topics
+            if topic in self._topics and self._topics[topic]['seq'] != seen.get(topic)
+        ]
+
+    def stream(self, topics):
+        """Generator of SSE bytes for one client subscribed to `topics`."""
+        with self._cond:
+            for topic in topics:
+                self._wanted[topic] = self._wanted.get(topic, 0) + 1
+            self.clients += 1
+            if self._producer is None:
+                self._producer = threading.Thread(target=self._produce, name='stream-producer', daemon=True)
+                self._producer.start()
+
+        seen = {}
+        try:
+            yield f"retry: {int(self.keepalive * 1000)}\n\n".encode()
+            while True:
+                chunks = []
+                with self._cond:
+                    self._cond.wait_for(lambda: self._pending(topics, seen), timeout=self.keepalive)
+                    for topic in self._pending(topics, seen):
+                        entry = self._topics[topic]
+                        if entry['patch'] is not None and seen.get(topic) == entry['seq'] - 1:
+                            chunks.append(entry['patch'])
+                        else:
+                            chunks.append(entry['snapshot'])
+                        seen[topic] = entry['seq']
+                yield b''.join(chunks) if chunks else b': keepalive\n\n'
+        finally:
+            with self._cond:
+                for topic in topics:
+                    self._wanted[topic] -= 1
+                self.clients -= 1
+
+
+STREAM_TOPICS = {
+    'health': build_health_summary,
+    'system': build_system_resources,
+    'node': build_palladium_info,
+    'blocks': build_recent_blocks,
+    'electrumx': build_electrumx_stats,
+    'peers': build_palladium_peers,
+    'servers': build_electrumx_servers,
+}
+_stream_hub = StreamHub(STREAM_TOPICS)
+
+
+@app.route('/api/stream')
+def live_stream():
+    """Server-Sent Events feed of dashboard snapshots (`?topics=node,blocks,...`)"""
+    requested = [t.strip() for t in request.args.get('topics', '').split(',') if t.strip()]
+    topics = list(dict.fromkeys(requested)) or list(STREAM_TOPICS)
+    unknown = [topic for topic in topics if topic not in STREAM_TOPICS]
+    if unknown:
+        return jsonify({'error': f"Unknown topics: {', '.join(unknown)}"}), 400
+
+    response = Response(stream_with_context(_stream_hub.stream(topics)), mimetype='text/event-stream')
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+# Cards on the main dashboard page, the default for /api/dashboard
+DASHBOARD_SECTIONS = ('health', 'system', 'node', 'blocks', 'electrumx')
+
+
+def build_dashboard(sections):
+    """
+    (JSON body, ETag) for /api/dashboard: each section built from the same
+    builders (and caches) as its stream topic, in one pass; `health` is the
+    cached summary, not the live /api/health check. Sections that are
+    already Snapshots are spliced in as their pre-encoded bytes, so only the
+    small uncached sections are serialized per request. A failing section
+    carries its own `error` instead of failing the whole response.
+
+    The ETag combines the Snapshot versions with a digest of the other
+    sections' bytes, leaving out the top-level timestamp, so it changes
+    exactly when some section does.
+    """
+    parts = []
+    digest = hashlib.blake2b(digest_size=12)
+    for name in sections:
+        try:
+            payload = STREAM_TOPICS[name]()
+            if payload is None:
+                payload = {'error': f'{name} is unavailable'}
+        except Exception as e:
+            payload = {'error': str(e)}
+        if isinstance(payload, Snapshot):
+            part = json.dumps(name).encode() + b':' + payload.body
+            digest.update(f'{name}@{payload.etag},'.encode())
+        else:
+            part = json.dumps(name).encode() + b':' + json.dumps(
+                payload, separators=(',', ':'), default=_json_default).encode()
+            digest.update(part + b',')
+        parts.append(part)
+    parts.append(b'"timestamp":' + json.dumps(datetime.now().isoformat()).encode())
+    return b'{' + b','.join(parts) + b'}', f"{_SNAPSHOT_BOOT_ID}-{digest.hexdigest()}"
+
+
+@app.route('/api/dashboard')
+def dashboard_snapshot():
+    """All dashboard cards in one response (`?fields=health,system,...`)"""
+    requested = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip()]
+    sections = list(dict.fromkeys(requested)) or list(DASHBOARD_SECTIONS)
+    unknown = [name for name in sections if name not in STREAM_TOPICS]
+    if unknown:
+        return jsonify({'error': f"Unknown fields: {', '.join(unknown)}"}), 400
+    return conditional_json_response(*build_dashboard(sections))
+
+class TimeSeriesStore:
+    """
+    Embedded metric history in SQLite with automatic downsampling.
+
+    Every recorded point is written to each tier at once: the raw tier
+    stores it as is, and coarser tiers fold it into their time bucket as
+    sum/count/min/max. Each tier prunes itself to its own retention, so
+    old data survives only in downsampled form and the file stays bounded.
+    Range queries read from the finest tier that still covers the
+    requested start.
+    """
+
+    # (bucket seconds, retention seconds); 0 = raw points
+    TIERS = ((0, 3600), (60, 86400), (3600, 365 * 86400))
+
+    def __init__(self, path=HISTORY_DB_PATH, tiers=TIERS):
+        self.path = path
+        self.tiers = tiers
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            if self.path != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS points ('
+                ' metric TEXT NOT NULL, resolution INTEGER NOT NULL, ts INTEGER NOT NULL,'
+                ' sum REAL NOT NULL, count INTEGER NOT NULL, min REAL NOT NULL, max REAL NOT NULL,'
+                ' PRIMARY KEY (metric, resolution, ts)) WITHOUT ROWID'
+            )
+            self._conn = conn
+        return self._conn
+
+    def record(self, values, timestamp=None):
+        """Store {metric: number} observed at `timestamp` (epoch seconds) in every tier."""
+        timestamp = int(time.time() if timestamp is None else timestamp)
+        rows = []
+        prunes = []
+        for metric, value in values.items():
+            if value is None:
+                continue
+            value = float(value)
+            for resolution, retention in self.tiers:
+                bucket = timestamp - timestamp % resolution if resolution else timestamp
+                rows.append((metric, resolution, bucket, value, value, value))
+                prunes.append((metric, resolution, timestamp - retention))
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    'INSERT INTO points (metric, resolution, ts, sum, count, min, max)'
+                    ' VALUES (?, ?, ?, ?, 1, ?, ?)'
+                    ' ON CONFLICT (metric, resolution, ts) DO UPDATE SET'
+                    ' sum = sum + excluded.sum, count = count + 1,'
+                    ' min = MIN(min, excluded.min), max = MAX(max, excluded.max)',
+                    rows
+                )
+                conn.executemany(
+                    'DELETE FROM points WHERE metric = ? AND resolution = ? AND ts < ?', prunes)
+
+    def _pick_resolution(self, start, step, now):
+        """Finest tier still covering `start`, or a coarser one if `step` allows it."""
+        chosen = self.tiers[-1][0]
+        for resolution, retention in self.tiers:
+            if start >= now - retention:
+                chosen = resolution
+                break
+        for resolution, retention in self.tiers:
+            if chosen < resolution <= (step or 0) and start >= now - retention:
+                chosen = resolution
+        return chosen
+
+    def query(self, metric, start, end, step=None, now=None):
+        """
+        Points of `metric` in [start, end] as [[ts, avg, min, max], ...].
+        With `step` (seconds), points are averaged into buckets of that size;
+        the bucket holding `start` is included whole. `now` is the clock the
+        caller derived a default range from, so the tier choice agrees with it.
+        """
+        resolution = self._pick_resolution(start, step, time.time() if now is None else now)
+        bucket = max(int(step or 0), resolution, 1)
+        start = int(start) - int(start) % bucket
+        with self._lock:
+            rows = self._connection().execute(
+                'SELECT (ts / ?) * ?, SUM(sum) / SUM(count), MIN(min), MAX(max) FROM points'
+                ' WHERE metric = ? AND resolution = ? AND ts BETWEEN ? AND ?'
+                ' GROUP BY 1 ORDER BY 1',
+                (bucket, bucket, metric, resolution, int(start), int(end))
+            ).fetchall()
+        return resolution, [[ts, round(avg, 6), low, high] for ts, avg, low, high in rows]
+
+
+_history = TimeSeriesStore()
+
+
+def _node_metric(method, key):
+    def read(node):
+        return (node.get(method) or {}).get(key)
+    return read
+
+
+# metric name -> reader of the values the recorder collects
+HISTORY_METRICS = {
+    'block_height': _node_metric('getblockchaininfo', 'blocks'),
+    'difficulty': _node_metric('getblockchaininfo', 'difficulty'),
+    'hashrate': _node_metric('getmininginfo', 'networkhashps'),
+    'mempool_size': _node_metric('getmempoolinfo', 'size'),
+    'mempool_bytes': _node_metric('getmempoolinfo', 'bytes'),
+    'peer_count': _node_metric('getnetworkinfo', 'connections'),
+    'electrumx_sessions': lambda node: (_electrumx_stats_cache.peek() or {}).get('sessions'),
+    'cpu_percent': lambda node: ((_system_sampler.latest() or {}).get('cpu') or {}).get('percent'),
+    'memory_percent': lambda node: ((_system_sampler.latest() or {}).get('memory') or {}).get('percent'),
+    'disk_percent': lambda node: ((_system_sampler.latest() or {}).get('disk') or {}).get('percent'),
+}
+
+
+def record_history():
+    """Scheduled job: append the current value of every history metric."""
+    node = get_node_state()
+    values = {}
+    for metric, read in HISTORY_METRICS.items():
+        try:
+            values[metric] = read(node)
+        except Exception as e:
+            print(f"History metric {metric} error: {e}")
+    _history.record(values)
+
+
+@app.route('/api/history/<metric>')
+def metric_history(metric):
+    """Range query over a recorded metric (`?from=&to=` epoch seconds, optional `&step=`)"""
+    if metric not in HISTORY_METRICS:
+        return jsonify({'error': f'Unknown metric: {metric}', 'metrics': sorted(HISTORY_METRICS)}), 404
+    try:
+        now = time.time()
+        end = request.args.get('to', type=float) or now
+        start = request.args.get('from', type=float) or end - 3600
+        step = request.args.get('step', type=int)
+        if start > end or (step is not None and step <= 0):
+            return jsonify({'error': 'Invalid range'}), 400
+        resolution, points = _history.query(metric, start, end, step, now=now)
+        return jsonify({
+            'metric': metric,
+            'from': int(start),
+            'to': int(end),
+            'resolution': resolution,
+            'step': max(step or 0, resolution) or None,
+            'points': points
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def start_scheduler():
+    """Register every periodic refresh job and start the scheduler."""
+    _scheduler.schedule_cache(_peers_cache, timeout=15)
+    _scheduler.add_job('node_tip', lambda: refresh_node_state('tip'), NODE_TIP_TTL, timeout=15)
+    # With a live ZMQ feed, mempool state is only refetched once a tx notification invalidated it
+    _scheduler.add_job('node_mempool', lambda: refresh_node_state('mempool', stale_only=is_zmq_feed_live()),
+                       NODE_TIP_TTL, timeout=15)
+    _scheduler.add_job('node_network', lambda: refresh_node_state('network'), NODE_NETWORK_TTL, timeout=15)
+    _scheduler.add_job('recent_blocks', refresh_recent_blocks, NODE_TIP_TTL, timeout=60)
+    _scheduler.schedule_cache(_electrumx_stats_cache, timeout=30)
+    _scheduler.schedule_cache(_electrumx_servers_cache, timeout=ELECTRUM_PROBE_DEADLINE * 3 + 15)
+    _scheduler.schedule_cache(_container_info_cache, key=ELECTRUMX_CONTAINER, timeout=15)
+    _scheduler.add_job('system_resources', _system_sampler.sample, SYSTEM_SAMPLE_INTERVAL, timeout=5)
+    _scheduler.add_job('server_identity', lambda: resolve_server_identity(allow_network=True) is not None,
+                       SERVER_IDENTITY_REFRESH, timeout=15)
+    _scheduler.add_job('peer_probe_prune', _peer_probes.prune, PEER_PROBE_PRUNE_INTERVAL, timeout=30,
+                       initial_delay=PEER_PROBE_PRUNE_INTERVAL)
+    _scheduler.add_job('history', record_history, HISTORY_INTERVAL, timeout=20, initial_delay=HISTORY_INTERVAL)
+    if os.path.isdir(_db_size_tracker.path):
+        _scheduler.add_job('db_size', _db_size_tracker.sample, DB_SIZE_INTERVAL, timeout=120)
+    else:
+        print(f"{_db_size_tracker.path} not mounted; DB size falls back to du in the container")
+    return _scheduler.start()
+
 
 if __name__ == '__main__':
-    warm_electrumx_caches_async()
-    warm_peers_cache_async()
+    start_node_event_listener()
+    start_scheduler()
     app.run(host='0.0.0.0', port=8080, debug=False)
@@ -0,0 +1,110 @@
+"""
+Newline-framed JSON-RPC stream for Electrum protocol connections
+"""
+
+import json
+import socket
+import ssl
+import time
+
+# Largest accepted message; server.peers.subscribe on a big network runs to
+# a few hundred KB, so this only stops a peer that never sends a newline.
+MAX_LINE_BYTES = 4 * 1024 * 1024
+RECV_SIZE = 65536
+
+
+class LineTooLong(ValueError):
+    """A peer sent more than `max_line` bytes without a newline."""
+
+
+class ElectrumStream:
+    """
+    Reader/writer for newline-delimited JSON over one socket.
+
+    Incoming bytes collect in a bytearray. Each newline search starts where
+    the previous one stopped, and complete lines are cut off the front, so
+    reading a message costs time linear in its size however many chunks it
+    arrives in. `timeout` bounds each read_line() as a whole, not each
+    recv(), so a peer dribbling bytes cannot hold a reader indefinitely.
+    """
+
+    def __init__(self, sock, timeout=None, max_line=MAX_LINE_BYTES):
+        self.sock = sock
+        self.timeout = timeout
+        self.max_line = max_line
+        self._buffer = bytearray()
+        self._scanned = 0  # bytes at the front of _buffer known to hold no newline
+        self._next_id = 0
+
+    @classmethod
+    def connect(cls, host, port, timeout=None, ssl_context=None, max_line=MAX_LINE_BYTES):
+        """Open a TCP (or, with `ssl_context`, TLS) connection to host:port."""
+        sock = socket.create_connection((host, port), timeout=timeout)
+        if ssl_context is not None:
+            try:
+                sock = ssl_context.wrap_socket(sock, server_hostname=host)
+            except (OSError, ssl.SSLError):
+                sock.close()
+                raise
+        return cls(sock, timeout=timeout, max_line=max_line)
+
+    def send(self, *messages):
+        """Write one or more JSON messages in a single send (pipelined)."""
+        self.sock.sendall(b''.join(json.dumps(message).encode() + b'\n' for message in messages))
+
+    def read_line(self):
+        """Next line without its newline; raises ConnectionError at EOF, TimeoutError, LineTooLong."""
+        deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+        while True:
+            index = self._buffer.find(b'\n', self._scanned)
+            if index >= 0:
+                line = bytes(self._buffer[:index])
+                del self._buffer[:index + 1]
+                self._scanned = 0
+                return line
+            self._scanned = len(self._buffer)
+            if self._scanned > self.max_line:
+                raise LineTooLong(f'no newline within {self.max_line} bytes')
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError('timed out waiting for a complete line')
+                self.sock.settimeout(remaining)
+            chunk = self.sock.recv(RECV_SIZE)
+            if not chunk:
+                raise ConnectionError('connection closed by peer')
+            self._buffer += chunk
+
+    def read_message(self):
+        """Next JSON message, skipping blank keep-alive lines."""
+        while True:
+            line = self.read_line()
+            if line.strip():
+                return json.loads(line)
+
+    def request(self, method, params=None):
+        """
+        Send one request and return the reply carrying its id (the whole
+        reply object, with `result` or `error`). Notifications and replies
+        to other ids that arrive first are skipped.
+        """
+        self._next_id += 1
+        request_id = self._next_id
+        self.send({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params or []})
+        while True:
+            message = self.read_message()
+            if isinstance(message, dict) and message.get('id') == request_id:
+                return message
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
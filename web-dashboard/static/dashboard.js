@@ -1,15 +1,5 @@
 // Dashboard JavaScript
 
-// API fetch helper with optional API key injected from template
-async function apiFetch(url, options = {}) {
-    const apiKey = (window.DASHBOARD_API_KEY || "").trim();
-    const headers = { ...(options.headers || {}) };
-    if (apiKey) {
-        headers["X-API-Key"] = apiKey;
-    }
-    return fetch(url, { ...options, headers });
-}
-
 // Format numbers
 function formatNumber(num) {
     if (num >= 1000000000) return (num / 1000000000).toFixed(2) + 'B';
@@ -93,191 +83,133 @@ function updateHealthStatus(data) {
     }
 }
 
-// Update system resources
-async function updateSystemResources() {
-    try {
-        const response = await apiFetch('/api/system/resources');
-        const data = await response.json();
-
-        if (data.error) {
-            console.error('System resources error:', data.error);
-            return;
-        }
-
-        // Update CPU
-        const cpuPercent = data.cpu.percent.toFixed(1);
-        document.getElementById('cpuValue').textContent = cpuPercent + '%';
-        document.getElementById('cpuProgress').style.width = cpuPercent + '%';
-
-        // Update Memory
-        const memPercent = data.memory.percent.toFixed(1);
-        document.getElementById('memoryValue').textContent = memPercent + '%';
-        document.getElementById('memoryProgress').style.width = memPercent + '%';
+// Render system resources
+function renderSystemResources(data) {
+    // Update CPU
+    const cpuPercent = data.cpu.percent.toFixed(1);
+    document.getElementById('cpuValue').textContent = cpuPercent + '%';
+    document.getElementById('cpuProgress').style.width = cpuPercent + '%';
+
+    // Update Memory
+    const memPercent = data.memory.percent.toFixed(1);
+    document.getElementById('memoryValue').textContent = memPercent + '%';
+    document.getElementById('memoryProgress').style.width = memPercent + '%';
+
+    // Update Disk
+    const diskPercent = data.disk.percent.toFixed(1);
+    document.getElementById('diskValue').textContent = diskPercent + '%';
+    document.getElementById('diskProgress').style.width = diskPercent + '%';
+}
 
-        // Update Disk
-        const diskPercent = data.disk.percent.toFixed(1);
-        document.getElementById('diskValue').textContent = diskPercent + '%';
-        document.getElementById('diskProgress').style.width = diskPercent + '%';
+// Render Palladium info
+async function renderPalladiumInfo(data) {
+    // Update blockchain info
+    if (data.blockchain) {
+        document.getElementById('blockHeight').textContent = formatBlockHeight(data.blockchain.blocks || 0);
+        document.getElementById('difficulty').textContent = formatDifficulty(data.blockchain.difficulty || 0);
+        document.getElementById('network').textContent = (data.blockchain.chain || 'unknown').toUpperCase();
 
-    } catch (error) {
-        console.error('Error fetching system resources:', error);
+        const progress = ((data.blockchain.verificationprogress || 0) * 100).toFixed(2);
+        document.getElementById('syncProgress').textContent = progress + '%';
     }
-}
-
-// Update Palladium info
-async function updatePalladiumInfo() {
-    try {
-        const response = await apiFetch('/api/palladium/info');
-        const data = await response.json();
 
-        if (data.error) {
-            console.error('Palladium info error:', data.error);
-            return;
+    // Update network info
+    if (data.network) {
+        let version = data.network.subversion || 'Unknown';
+        // Extract version number from /Palladium:2.0.0/ format
+        const match = version.match(/:([\d.]+)/);
+        if (match) {
+            version = 'v' + match[1];
         }
+        document.getElementById('nodeVersion').textContent = version;
+    }
 
-        // Update blockchain info
-        if (data.blockchain) {
-            document.getElementById('blockHeight').textContent = formatBlockHeight(data.blockchain.blocks || 0);
-            document.getElementById('difficulty').textContent = formatDifficulty(data.blockchain.difficulty || 0);
-            document.getElementById('network').textContent = (data.blockchain.chain || 'unknown').toUpperCase();
-
-            const progress = ((data.blockchain.verificationprogress || 0) * 100).toFixed(2);
-            document.getElementById('syncProgress').textContent = progress + '%';
-        }
+    // Update connections
+    document.getElementById('connections').textContent = data.peers || 0;
 
-        // Update network info
-        if (data.network) {
-            let version = data.network.subversion || 'Unknown';
-            // Extract version number from /Palladium:2.0.0/ format
-            const match = version.match(/:([\d.]+)/);
-            if (match) {
-                version = 'v' + match[1];
-            }
-            document.getElementById('nodeVersion').textContent = version;
-        }
+    // Update mempool info
+    if (data.mempool) {
+        document.getElementById('mempoolSize').textContent = data.mempool.size || 0;
+        document.getElementById('mempoolBytes').textContent = formatBytes(data.mempool.bytes || 0);
+        document.getElementById('mempoolMax').textContent = formatBytes(data.mempool.maxmempool || 0);
 
-        // Update connections
-        document.getElementById('connections').textContent = data.peers || 0;
-
-        // Update mempool info
-        if (data.mempool) {
-            document.getElementById('mempoolSize').textContent = data.mempool.size || 0;
-            document.getElementById('mempoolBytes').textContent = formatBytes(data.mempool.bytes || 0);
-            document.getElementById('mempoolMax').textContent = formatBytes(data.mempool.maxmempool || 0);
-
-            // Calculate usage percentage
-            if (data.mempool.maxmempool && data.mempool.bytes) {
-                const usage = ((data.mempool.bytes / data.mempool.maxmempool) * 100).toFixed(1);
-                document.getElementById('mempoolUsage').textContent = usage + '%';
-            } else {
-                document.getElementById('mempoolUsage').textContent = '0%';
-            }
+        // Calculate usage percentage
+        if (data.mempool.maxmempool && data.mempool.bytes) {
+            const usage = ((data.mempool.bytes / data.mempool.maxmempool) * 100).toFixed(1);
+            document.getElementById('mempoolUsage').textContent = usage + '%';
+        } else {
+            document.getElementById('mempoolUsage').textContent = '0%';
         }
+    }
 
-        // Update network hashrate
+    // Update network hashrate (getmininginfo already carries it; only
+    // fall back to the dedicated endpoint when it is missing)
+    if (data.mining && data.mining.networkhashps !== undefined) {
+        document.getElementById("networkHashrate").textContent = formatHashrate(data.mining.networkhashps);
+    } else {
         const hashrateResponse = await apiFetch("/api/palladium/network-hashrate");
         const hashrateData = await hashrateResponse.json();
         if (!hashrateData.error) {
             document.getElementById("networkHashrate").textContent = formatHashrate(hashrateData.network_hashrate);
         }
-
-    } catch (error) {
-        console.error('Error fetching Palladium info:', error);
     }
 }
 
-// Update recent blocks
-async function updateRecentBlocks() {
-    try {
-        const response = await apiFetch('/api/palladium/blocks/recent');
-        const data = await response.json();
-
-        if (data.error) {
-            console.error('Recent blocks error:', data.error);
-            return;
-        }
-
-        const tbody = document.getElementById('recentBlocksTable');
-        tbody.innerHTML = '';
-
-        if (data.blocks && data.blocks.length > 0) {
-            data.blocks.forEach(block => {
-                const row = document.createElement('tr');
-                row.innerHTML = `
-                    <td><strong>${block.height}</strong></td>
-                    <td class="hash-cell" title="${block.hash}">${block.hash.substring(0, 20)}...</td>
-                    <td>${formatTime(block.time)}</td>
-                    <td>${formatBytes(block.size)}</td>
-                    <td>${block.tx_count}</td>
-                `;
-                tbody.appendChild(row);
-            });
-        } else {
-            tbody.innerHTML = '<tr><td colspan="5" class="loading">No blocks available</td></tr>';
-        }
-
-    } catch (error) {
-        console.error('Error fetching recent blocks:', error);
+// Render recent blocks
+function renderRecentBlocks(data) {
+    const tbody = document.getElementById('recentBlocksTable');
+    tbody.innerHTML = '';
+
+    if (data.blocks && data.blocks.length > 0) {
+        data.blocks.forEach(block => {
+            const row = document.createElement('tr');
+            row.innerHTML = `
+                <td><strong>${block.height}</strong></td>
+                <td class="hash-cell" title="${block.hash}">${block.hash.substring(0, 20)}...</td>
+                <td>${formatTime(block.time)}</td>
+                <td>${formatBytes(block.size)}</td>
+                <td>${block.tx_count}</td>
+            `;
+            tbody.appendChild(row);
+        });
+    } else {
+        tbody.innerHTML = '<tr><td colspan="5" class="loading">No blocks available</td></tr>';
     }
 }
 
 // Peers are now on a separate page, no update needed here
 
-// Update ElectrumX stats
-async function updateElectrumXStats() {
-    try {
-        const response = await apiFetch('/api/electrumx/stats');
-        const data = await response.json();
-
-        if (data.error) {
-            console.error('ElectrumX stats error:', data.error);
-            return;
+// Render ElectrumX stats
+function renderElectrumXStats(data) {
+    if (data.stats) {
+        // Server version (extract version number like we do for node)
+        let serverVersion = data.stats.server_version || 'Unknown';
+        const versionMatch = serverVersion.match(/([\d.]+)/);
+        if (versionMatch) {
+            serverVersion = 'v' + versionMatch[1];
         }
+        document.getElementById('serverVersion').textContent = serverVersion;
 
-        if (data.stats) {
-            // Server version (extract version number like we do for node)
-            let serverVersion = data.stats.server_version || 'Unknown';
-            const versionMatch = serverVersion.match(/([\d.]+)/);
-            if (versionMatch) {
-                serverVersion = 'v' + versionMatch[1];
-            }
-            document.getElementById('serverVersion').textContent = serverVersion;
-
-            // Database size
-            const dbSize = data.stats.db_size > 0 ? formatBytes(data.stats.db_size) : '--';
-            document.getElementById('dbSize').textContent = dbSize;
+        // Database size
+        const dbSize = data.stats.db_size > 0 ? formatBytes(data.stats.db_size) : '--';
+        document.getElementById('dbSize').textContent = dbSize;
 
-            // Uptime
-            const uptime = data.stats.uptime > 0 ? formatDuration(data.stats.uptime) : '--';
-            document.getElementById('uptime').textContent = uptime;
+        // Uptime
+        const uptime = data.stats.uptime > 0 ? formatDuration(data.stats.uptime) : '--';
+        document.getElementById('uptime').textContent = uptime;
 
-            // Server IP
-            document.getElementById('serverIP').textContent = data.stats.server_ip || '--';
+        // Server IP
+        document.getElementById('serverIP').textContent = data.stats.server_ip || '--';
 
-            // TCP Port
-            document.getElementById('tcpPort').textContent = data.stats.tcp_port || '--';
+        // TCP Port
+        document.getElementById('tcpPort').textContent = data.stats.tcp_port || '--';
 
-            // SSL Port
-            document.getElementById('sslPort').textContent = data.stats.ssl_port || '--';
+        // SSL Port
+        document.getElementById('sslPort').textContent = data.stats.ssl_port || '--';
 
-            // Active servers from peer discovery
-            const activeServers = Array.isArray(data.stats.active_servers) ? data.stats.active_servers : [];
-            document.getElementById('activeServersCount').textContent = data.stats.active_servers_count ?? activeServers.length;
-        }
-
-    } catch (error) {
-        console.error('Error fetching ElectrumX stats:', error);
-    }
-}
-
-// Update health check
-async function updateHealth() {
-    try {
-        const response = await apiFetch('/api/health');
-        const data = await response.json();
-        updateHealthStatus(data);
-    } catch (error) {
-        console.error('Error fetching health:', error);
+        // Active servers from peer discovery
+        const activeServers = Array.isArray(data.stats.active_servers) ? data.stats.active_servers : [];
+        document.getElementById('activeServersCount').textContent = data.stats.active_servers_count ?? activeServers.length;
     }
 }
 
@@ -287,16 +219,32 @@ function updateLastUpdateTime() {
     document.getElementById('lastUpdate').textContent = now;
 }
 
-// Update all data
+// Cards on this page; the same names select /api/dashboard fields and stream topics
+const DASHBOARD_TOPICS = ['health', 'system', 'node', 'blocks', 'electrumx'];
+
+// Update all data with one aggregated request
 async function updateAll() {
-    updateLastUpdateTime();
-    await Promise.all([
-        updateHealth(),
-        updateSystemResources(),
-        updatePalladiumInfo(),
-        updateRecentBlocks(),
-        updateElectrumXStats()
-    ]);
+    try {
+        const response = await apiFetch('/api/dashboard?fields=' + DASHBOARD_TOPICS.join(','));
+        const data = await response.json();
+
+        if (data.error) {
+            console.error('Dashboard error:', data.error);
+            return;
+        }
+
+        DASHBOARD_TOPICS.forEach(topic => {
+            const section = data[topic] || {};
+            if (section.error && topic !== 'health') {
+                console.error(`Dashboard ${topic} error:`, section.error);
+                return;
+            }
+            handleStreamUpdate(topic, section);
+        });
+
+    } catch (error) {
+        console.error('Error fetching dashboard:', error);
+    }
 }
 
 // Tab navigation
@@ -364,6 +312,18 @@ function initTabs() {
     });
 }
 
+// Apply a live stream update to the matching card
+function handleStreamUpdate(topic, data) {
+    updateLastUpdateTime();
+    switch (topic) {
+        case 'health': updateHealthStatus(data); break;
+        case 'system': renderSystemResources(data); break;
+        case 'node': renderPalladiumInfo(data); break;
+        case 'blocks': renderRecentBlocks(data); break;
+        case 'electrumx': renderElectrumXStats(data); break;
+    }
+}
+
 // Initialize dashboard
 document.addEventListener('DOMContentLoaded', async () => {
     initTabs();
@@ -371,6 +331,16 @@ document.addEventListener('DOMContentLoaded', async () => {
     // Initial update
     await updateAll();
 
-    // Auto-refresh every 10 seconds
-    setInterval(updateAll, 10000);
+    // Live updates are pushed by the server; poll every 10 seconds only
+    // while the stream is disconnected
+    let pollTimer = null;
+    openLiveStream(DASHBOARD_TOPICS, handleStreamUpdate, {
+        onConnect: () => {
+            clearInterval(pollTimer);
+            pollTimer = null;
+        },
+        onDisconnect: () => {
+            if (!pollTimer) pollTimer = setInterval(updateAll, 10000);
+        }
+    });
 });
@@ -1,16 +1,53 @@
 // Electrum Active Servers Page JavaScript
 
-async function apiFetch(url) {
-    const apiKey = (window.DASHBOARD_API_KEY || '').trim();
-    const headers = apiKey ? { 'X-API-Key': apiKey } : {};
-    return fetch(url, { headers });
-}
-
 function updateLastUpdateTime() {
     const now = new Date().toLocaleString();
     document.getElementById('lastUpdate').textContent = now;
 }
 
+// Protocol range as "min – max", or the single version when they match
+function formatProtocolRange(min, max) {
+    if (!min && !max) return '--';
+    if (!min || !max || min === max) return min || max;
+    return `${min} – ${max}`;
+}
+
+function renderElectrumServers(data) {
+    const servers = Array.isArray(data.servers) ? data.servers : [];
+    const tbody = document.getElementById('electrumServersTable');
+    tbody.innerHTML = '';
+
+    if (servers.length === 0) {
+        tbody.innerHTML = '<tr><td colspan="8" class="loading">No active servers found</td></tr>';
+        document.getElementById('totalServers').textContent = '0';
+        return;
+    }
+
+    // Every field comes from an arbitrary internet peer: set cells as text, never HTML
+    servers.forEach(server => {
+        const row = document.createElement('tr');
+        const cells = [
+            server.host || '--',
+            server.tcp_port || '--',
+            server.ssl_port || '--',
+            server.tcp_reachable === true ? 'Yes' : 'No',
+            server.ssl_reachable === true ? 'Yes' : 'No',
+            server.server_version || '--',
+            formatProtocolRange(server.protocol_min, server.protocol_max),
+            typeof server.rtt_ms === 'number' ? server.rtt_ms.toFixed(0) + ' ms' : '--'
+        ];
+        cells.forEach((value, index) => {
+            const cell = document.createElement('td');
+            if (index === 0) cell.className = 'peer-addr';
+            cell.textContent = String(value);
+            row.appendChild(cell);
+        });
+        tbody.appendChild(row);
+    });
+
+    document.getElementById('totalServers').textContent = String(servers.length);
+}
+
 async function updateElectrumServers() {
     try {
         const response = await apiFetch('/api/electrumx/servers');
@@ -21,33 +58,11 @@ async function updateElectrumServers() {
             return;
         }
 
-        const servers = Array.isArray(data.servers) ? data.servers : [];
-        const tbody = document.getElementById('electrumServersTable');
-        tbody.innerHTML = '';
-
-        if (servers.length === 0) {
-            tbody.innerHTML = '<tr><td colspan="5" class="loading">No active servers found</td></tr>';
-            document.getElementById('totalServers').textContent = '0';
-            return;
-        }
-
-        servers.forEach(server => {
-            const row = document.createElement('tr');
-            row.innerHTML = `
-                <td class="peer-addr">${server.host || '--'}</td>
-                <td>${server.tcp_port || '--'}</td>
-                <td>${server.ssl_port || '--'}</td>
-                <td>${server.tcp_reachable === true ? 'Yes' : 'No'}</td>
-                <td>${server.ssl_reachable === true ? 'Yes' : 'No'}</td>
-            `;
-            tbody.appendChild(row);
-        });
-
-        document.getElementById('totalServers').textContent = String(servers.length);
+        renderElectrumServers(data);
     } catch (error) {
         console.error('Error fetching Electrum servers:', error);
         document.getElementById('electrumServersTable').innerHTML =
-            '<tr><td colspan="5" class="loading">Error loading servers</td></tr>';
+            '<tr><td colspan="8" class="loading">Error loading servers</td></tr>';
     }
 }
 
@@ -58,5 +73,19 @@ async function updateAll() {
 
 document.addEventListener('DOMContentLoaded', async () => {
     await updateAll();
-    setInterval(updateAll, 10000);
+
+    // Server pushes updates; fall back to 10 s polling while disconnected
+    let pollTimer = null;
+    openLiveStream(['servers'], (topic, data) => {
+        updateLastUpdateTime();
+        renderElectrumServers(data);
+    }, {
+        onConnect: () => {
+            clearInterval(pollTimer);
+            pollTimer = null;
+        },
+        onDisconnect: () => {
+            if (!pollTimer) pollTimer = setInterval(updateAll, 10000);
+        }
+    });
 });
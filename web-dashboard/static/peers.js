@@ -1,11 +1,5 @@
 // Peers Page JavaScript
 
-async function apiFetch(url) {
-    const apiKey = (window.DASHBOARD_API_KEY || '').trim();
-    const headers = apiKey ? { 'X-API-Key': apiKey } : {};
-    return fetch(url, { headers });
-}
-
 // Format bytes
 function formatBytes(bytes) {
     if (bytes === 0) return '0 B';
@@ -26,6 +20,73 @@ function formatDuration(seconds) {
     return `${minutes}m`;
 }
 
+// Render peers table and statistics
+function renderPeers(data) {
+    const tbody = document.getElementById('peersTableBody');
+    tbody.innerHTML = '';
+
+    if (data.peers && data.peers.length > 0) {
+        let inboundCount = 0;
+        let outboundCount = 0;
+        let totalSent = 0;
+        let totalReceived = 0;
+
+        data.peers.forEach(peer => {
+            const row = document.createElement('tr');
+            const direction = peer.inbound ? 'Inbound' : 'Outbound';
+            const directionClass = peer.inbound ? 'peer-inbound' : 'peer-outbound';
+
+            // Count inbound/outbound
+            if (peer.inbound) {
+                inboundCount++;
+            } else {
+                outboundCount++;
+            }
+
+            // Sum traffic
+            totalSent += peer.bytessent || 0;
+            totalReceived += peer.bytesrecv || 0;
+
+            // Extract version number
+            let version = peer.version || 'Unknown';
+            const versionMatch = version.match(/([\d.]+)/);
+            if (versionMatch) {
+                version = 'v' + versionMatch[1];
+            }
+
+            // Format connection time
+            const connTime = peer.conntime ? formatDuration(Math.floor(Date.now() / 1000) - peer.conntime) : '--';
+
+            // Calculate total traffic for this peer
+            const peerTotal = (peer.bytessent || 0) + (peer.bytesrecv || 0);
+
+            row.innerHTML = `
+                <td class="peer-addr">${peer.addr}</td>
+                <td><span class="${directionClass}">${direction}</span></td>
+                <td>${version}</td>
+                <td>${connTime}</td>
+                <td>${formatBytes(peer.bytessent || 0)}</td>
+                <td>${formatBytes(peer.bytesrecv || 0)}</td>
+                <td><strong>${formatBytes(peerTotal)}</strong></td>
+            `;
+            tbody.appendChild(row);
+        });
+
+        // Update statistics
+        document.getElementById('totalPeers').textContent = data.peers.length;
+        document.getElementById('inboundPeers').textContent = inboundCount;
+        document.getElementById('outboundPeers').textContent = outboundCount;
+        document.getElementById('totalTraffic').textContent = formatBytes(totalSent + totalReceived);
+
+    } else {
+        tbody.innerHTML = '<tr><td colspan="7" class="loading">No peers connected</td></tr>';
+        document.getElementById('totalPeers').textContent = '0';
+        document.getElementById('inboundPeers').textContent = '0';
+        document.getElementById('outboundPeers').textContent = '0';
+        document.getElementById('totalTraffic').textContent = '0 B';
+    }
+}
+
 // Update peers table and statistics
 async function updatePeers() {
     try {
@@ -37,69 +98,7 @@ async function updatePeers() {
             return;
         }
 
-        const tbody = document.getElementById('peersTableBody');
-        tbody.innerHTML = '';
-
-        if (data.peers && data.peers.length > 0) {
-            let inboundCount = 0;
-            let outboundCount = 0;
-            let totalSent = 0;
-            let totalReceived = 0;
-
-            data.peers.forEach(peer => {
-                const row = document.createElement('tr');
-                const direction = peer.inbound ? 'Inbound' : 'Outbound';
-                const directionClass = peer.inbound ? 'peer-inbound' : 'peer-outbound';
-
-                // Count inbound/outbound
-                if (peer.inbound) {
-                    inboundCount++;
-                } else {
-                    outboundCount++;
-                }
-
-                // Sum traffic
-                totalSent += peer.bytessent || 0;
-                totalReceived += peer.bytesrecv || 0;
-
-                // Extract version number
-                let version = peer.version || 'Unknown';
-                const versionMatch = version.match(/([\d.]+)/);
-                if (versionMatch) {
-                    version = 'v' + versionMatch[1];
-                }
-
-                // Format connection time
-                const connTime = peer.conntime ? formatDuration(Math.floor(Date.now() / 1000) - peer.conntime) : '--';
-
-                // Calculate total traffic for this peer
-                const peerTotal = (peer.bytessent || 0) + (peer.bytesrecv || 0);
-
-                row.innerHTML = `
-                    <td class="peer-addr">${peer.addr}</td>
-                    <td><span class="${directionClass}">${direction}</span></td>
-                    <td>${version}</td>
-                    <td>${connTime}</td>
-                    <td>${formatBytes(peer.bytessent || 0)}</td>
-                    <td>${formatBytes(peer.bytesrecv || 0)}</td>
-                    <td><strong>${formatBytes(peerTotal)}</strong></td>
-                `;
-                tbody.appendChild(row);
-            });
-
-            // Update statistics
-            document.getElementById('totalPeers').textContent = data.peers.length;
-            document.getElementById('inboundPeers').textContent = inboundCount;
-            document.getElementById('outboundPeers').textContent = outboundCount;
-            document.getElementById('totalTraffic').textContent = formatBytes(totalSent + totalReceived);
-
-        } else {
-            tbody.innerHTML = '<tr><td colspan="7" class="loading">No peers connected</td></tr>';
-            document.getElementById('totalPeers').textContent = '0';
-            document.getElementById('inboundPeers').textContent = '0';
-            document.getElementById('outboundPeers').textContent = '0';
-            document.getElementById('totalTraffic').textContent = '0 B';
-        }
+        renderPeers(data);
 
     } catch (error) {
         console.error('Error fetching peers:', error);
@@ -124,6 +123,19 @@ document.addEventListener('DOMContentLoaded', async () => {
     // Initial update
     await updateAll();
 
-    // Auto-refresh every 10 seconds
-    setInterval(updateAll, 10000);
+    // Live updates are pushed by the server; poll every 10 seconds only
+    // while the stream is disconnected
+    let pollTimer = null;
+    openLiveStream(['peers'], (topic, data) => {
+        updateLastUpdateTime();
+        renderPeers(data);
+    }, {
+        onConnect: () => {
+            clearInterval(pollTimer);
+            pollTimer = null;
+        },
+        onDisconnect: () => {
+            if (!pollTimer) pollTimer = setInterval(updateAll, 10000);
+        }
+    });
 });
@@ -0,0 +1,98 @@
+// Shared by all dashboard pages: the live update stream and apiFetch()
+
+// Last body and ETag per URL, for conditional requests
+const apiResponseCache = new Map();
+
+// API fetch helper with optional API key injected from template.
+// Revalidates with If-None-Match and replays the kept body on 304, so
+// unchanged payloads are neither re-sent nor re-encoded by the server.
+async function apiFetch(url, options = {}) {
+    const apiKey = (window.DASHBOARD_API_KEY || '').trim();
+    const headers = { ...(options.headers || {}) };
+    if (apiKey) {
+        headers['X-API-Key'] = apiKey;
+    }
+    const cached = apiResponseCache.get(url);
+    if (cached) {
+        headers['If-None-Match'] = cached.etag;
+    }
+    const response = await fetch(url, { ...options, headers });
+    if (response.status === 304 && cached) {
+        return new Response(cached.body, { status: 200, headers: { 'Content-Type': 'application/json' } });
+    }
+    const etag = response.headers.get('ETag');
+    if (response.ok && etag) {
+        apiResponseCache.set(url, { etag, body: await response.clone().text() });
+    }
+    return response;
+}
+
+// Live update stream
+//
+// Reads the Server-Sent Events feed at /api/stream through fetch() rather
+// than EventSource so the API key header can be sent for external clients.
+// The server sends a full snapshot per topic first, then patches holding
+// only the top-level keys that changed; this helper merges them and hands
+// the current state of a topic to onUpdate(topic, data).
+
+function openLiveStream(topics, onUpdate, { onConnect, onDisconnect } = {}) {
+    const apiKey = (window.DASHBOARD_API_KEY || '').trim();
+    const headers = apiKey ? { 'X-API-Key': apiKey } : {};
+    const url = '/api/stream?topics=' + encodeURIComponent(topics.join(','));
+    const state = {};
+    let retryDelay = 1000;
+
+    function handleEvent(rawEvent) {
+        let topic = null;
+        const dataLines = [];
+        rawEvent.split('\n').forEach(line => {
+            if (line.startsWith('event:')) topic = line.slice(6).trim();
+            else if (line.startsWith('data:')) dataLines.push(line.slice(5).trimStart());
+        });
+        if (!topic || dataLines.length === 0) return;
+
+        const message = JSON.parse(dataLines.join('\n'));
+        if (message.snapshot !== undefined) {
+            state[topic] = message.snapshot;
+        } else if (message.patch !== undefined && state[topic]) {
+            Object.assign(state[topic], message.patch);
+        } else {
+            return;
+        }
+        onUpdate(topic, state[topic]);
+    }
+
+    async function connect() {
+        try {
+            const response = await fetch(url, { headers, cache: 'no-store' });
+            if (!response.ok || !response.body) {
+                throw new Error('HTTP ' + response.status);
+            }
+            if (onConnect) onConnect();
+            retryDelay = 1000;
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                let boundary;
+                while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                    handleEvent(buffer.slice(0, boundary));
+                    buffer = buffer.slice(boundary + 2);
+                }
+            }
+        } catch (error) {
+            console.error('Live stream error:', error);
+        }
+
+        // Connection lost: let the page poll meanwhile and reconnect with backoff
+        if (onDisconnect) onDisconnect();
+        setTimeout(connect, retryDelay);
+        retryDelay = Math.min(retryDelay * 2, 30000);
+    }
+
+    connect();
+}